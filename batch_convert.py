@@ -6,9 +6,17 @@ PDF 배치 변환 스크립트
 
 import os
 import sys
+import time
 import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
+from batch_manifest import BatchManifest
+from image_encoding import DEFAULT_PROFILE, ENCODER_PROFILES, supported_formats
+from memory_budget import OVERSIZE_POLICIES, MemoryBudget
+from output_sinks import ArchiveSink, MemorySink
 from pdf_converter import PDFConverter
+from render_backends import BACKENDS, BILEVEL_THRESHOLD, COLOR_MODES, get_backend
 import logging
 
 def setup_logging(verbose=False):
@@ -48,9 +56,33 @@ def batch_convert(
     first_page=None,
     last_page=None,
     single_image=False,
-    verbose=False
+    verbose=False,
+    jobs=1,
+    backend="poppler",
+    archive=None,
+    resume=False,
+    memory_budget=None,
+    encoder_profile=DEFAULT_PROFILE,
+    lossless=False,
+    color_mode="rgb",
+    threshold=BILEVEL_THRESHOLD,
+    dither=False
 ):
-    """여러 PDF 파일을 배치로 변환합니다."""
+    """여러 PDF 파일을 배치로 변환합니다.
+
+    jobs가 2 이상이면 페이지 단위 작업을 프로세스 풀에서 병렬로 처리합니다.
+    archive에 아카이브 경로(.zip, .tar, .tar.gz)를 주면 모든 이미지를 개별 파일 대신
+    그 아카이브 하나에 변환되는 대로 기록합니다.
+
+    디렉토리에 저장할 때는 끝난 페이지를 출력 디렉토리의 매니페스트에 기록하며,
+    resume이 True이면 원본과 옵션이 같고 파일이 남아 있는 페이지를 건너뜁니다.
+
+    memory_budget(MemoryBudget)을 주면 페이지당 래스터 크기를 제한합니다.
+    encoder_profile은 인코더 설정 묶음(fast, balanced, archival)이며, lossless이면 WebP를 무손실로 저장합니다.
+    color_mode가 "gray"이면 그레이스케일, "bilevel"이면 threshold(또는 dither)로 1비트 흑백으로 변환합니다.
+    """
+    if resume and archive:
+        raise ValueError("이어서 변환(resume)은 아카이브가 아닌 디렉토리 출력에서만 사용할 수 있습니다.")
     
     setup_logging(verbose)
     logger = logging.getLogger(__name__)
@@ -60,6 +92,16 @@ def batch_convert(
     logger.info(f"출력 형식: {output_format}")
     logger.info(f"DPI: {dpi}")
     logger.info(f"재귀 검색: {recursive}")
+    logger.info(f"병렬 작업 수: {jobs}")
+    logger.info(f"렌더링 백엔드: {backend}")
+    if archive:
+        logger.info(f"아카이브: {archive}")
+    logger.info(f"이어서 변환: {resume}")
+    if memory_budget is not None:
+        logger.info(f"메모리 예산: {memory_budget}")
+    logger.info(f"인코더 프로필: {encoder_profile}" + (" (무손실)" if lossless else ""))
+    if color_mode != "rgb":
+        logger.info(f"색상 모드: {color_mode}")
     
     # PDF 파일 찾기
     pdf_files = find_pdf_files(input_dir, recursive)
@@ -71,48 +113,430 @@ def batch_convert(
     logger.info(f"발견된 PDF 파일 수: {len(pdf_files)}")
     
     # 변환기 초기화
-    converter = PDFConverter(output_dir)
+    converter = PDFConverter(
+        output_dir, backend=backend, memory_budget=memory_budget,
+        encoder_profile=encoder_profile, lossless=lossless,
+        color_mode=color_mode, threshold=threshold, dither=dither
+    )
+    
+    # 아카이브에 기록하는 경우 모든 파일의 이미지를 하나의 sink로 모음
+    sink = ArchiveSink(archive) if archive else None
+    # 디렉토리에 저장하는 경우 끝난 페이지를 매니페스트에 기록
+    manifest = BatchManifest(output_dir) if sink is None else None
+    plan = _DocumentPlanner(
+        converter, manifest, output_format, dpi, first_page, last_page, single_image, resume
+    )
+    
+    # 파일별 처리 결과: 파일 경로 -> {'pages', 'skipped', 'elapsed', 'error'}
+    try:
+        if jobs and jobs > 1:
+            file_stats = _convert_parallel(
+                converter, pdf_files, output_format, dpi, single_image, jobs, logger, plan, sink
+            )
+        else:
+            file_stats = _convert_serial(
+                converter, pdf_files, output_format, dpi, single_image, logger, plan, sink
+            )
+    finally:
+        if sink is not None:
+            sink.close()
+        if manifest is not None:
+            manifest.close()
     
     # 변환 결과 통계
     success_count = 0
     error_count = 0
     error_files = []
     
+    for pdf_file, stats in file_stats.items():
+        if stats['error'] is None:
+            success_count += 1
+        else:
+            error_count += 1
+            error_files.append((pdf_file.name, stats['error']))
+    
+    # 결과 요약
+    logger.info("=" * 50)
+    logger.info("🎯 배치 변환 완료!")
+    logger.info(f"✅ 성공: {success_count}개 파일")
+    logger.info(f"❌ 실패: {error_count}개 파일")
+    if resume:
+        unchanged_count = sum(
+            1 for stats in file_stats.values()
+            if stats['error'] is None and stats['pages'] == 0 and stats['skipped'] > 0
+        )
+        skipped_pages = sum(stats['skipped'] for stats in file_stats.values())
+        logger.info(f"⏭️ 건너뜀: {unchanged_count}개 파일 (이미 변환된 {skipped_pages}개 이미지)")
+    
+    logger.info("파일별 처리 시간:")
+    for pdf_file, stats in file_stats.items():
+        elapsed = stats['elapsed']
+        pages_per_sec = stats['pages'] / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"  - {pdf_file.name}: {stats['pages']}페이지, "
+            f"{elapsed:.2f}초, {pages_per_sec:.2f} 페이지/초"
+        )
+    
+    if error_files:
+        logger.info("실패한 파일들:")
+        for file_name, error_msg in error_files:
+            logger.info(f"  - {file_name}: {error_msg}")
+    
+    return success_count, error_count, error_files
+
+class _DocumentPlanner:
+    """
+    문서마다 변환할 페이지를 정하고, 끝난 페이지를 매니페스트에 기록합니다.
+    
+    단일 이미지 변환은 문서 전체가 페이지 번호 None인 작업 하나입니다.
+    """
+    
+    def __init__(
+        self, converter, manifest, output_format, dpi,
+        first_page, last_page, single_image, resume
+    ):
+        self.converter = converter
+        self.manifest = manifest
+        self.output_format = output_format
+        self.first_page = first_page
+        self.last_page = last_page
+        self.single_image = single_image
+        self.resume = resume
+        # 결과 이미지에 영향을 주는 옵션 (같아야 이전 결과를 재사용)
+        self.params = {'format': output_format.upper(), 'dpi': dpi}
+        if converter.memory_budget is not None:
+            self.params['memory_budget'] = repr(converter.memory_budget)
+        if converter.encoder_profile != DEFAULT_PROFILE:
+            self.params['profile'] = converter.encoder_profile
+        if converter.lossless:
+            self.params['lossless'] = True
+        if converter.color_mode != "rgb":
+            self.params['color'] = converter.color_mode
+        if converter.color_mode == "bilevel":
+            self.params['threshold'] = converter.threshold
+            self.params['dither'] = converter.dither
+        # 파일 -> 매니페스트 문서 정보
+        self._documents = {}
+    
+    def plan(self, pdf_file):
+        """
+        Returns:
+            (문서 페이지 수, 변환할 페이지 목록, 이미 변환되어 건너뛴 페이지 수)
+        """
+        document = self.manifest.identify(pdf_file) if self.manifest is not None else None
+        if document is not None and document['page_count'] is not None:
+            # 바뀌지 않은 문서는 PDF를 열지 않고 기록된 페이지 수 사용
+            total_pages = document['page_count']
+        else:
+            total_pages = self.converter.get_page_count(pdf_file)
+            if document is not None:
+                document['page_count'] = total_pages
+        self._documents[pdf_file] = document
+        
+        if self.single_image:
+            pages = [None]
+        else:
+            start = max(1, self.first_page or 1)
+            end = min(total_pages, self.last_page or total_pages)
+            pages = list(range(start, end + 1))
+        
+        if not self.resume or document is None:
+            return total_pages, pages, 0
+        
+        completed = self.manifest.completed_pages(document, self.params)
+        remaining = [page_num for page_num in pages if page_num not in completed]
+        return total_pages, remaining, len(pages) - len(remaining)
+    
+    def done(self, pdf_file, page_num):
+        """페이지(단일 이미지는 None) 하나의 변환이 끝났음을 기록합니다."""
+        if self.manifest is None:
+            return
+        if page_num is None:
+            filename = f"{pdf_file.stem}_combined.{self.output_format.lower()}"
+        else:
+            filename = self.converter._page_filename(pdf_file.stem, page_num, self.output_format)
+        self.manifest.record(self._documents[pdf_file], self.params, page_num, filename)
+
+def _page_runs(page_nums):
+    """정렬된 페이지 번호를 연속 구간 (시작, 끝) 목록으로 묶습니다."""
+    runs = []
+    for page_num in page_nums:
+        if runs and runs[-1][1] == page_num - 1:
+            runs[-1][1] = page_num
+        else:
+            runs.append([page_num, page_num])
+    return [tuple(run) for run in runs]
+
+def _convert_serial(
+    converter, pdf_files, output_format, dpi, single_image, logger, plan, sink=None
+):
+    """파일을 하나씩 순서대로 변환합니다. sink가 있으면 파일 대신 sink에 기록합니다."""
+    file_stats = {}
+    
     # 각 PDF 파일 변환
     for i, pdf_file in enumerate(pdf_files, 1):
         logger.info(f"[{i}/{len(pdf_files)}] 변환 중: {pdf_file.name}")
+        stats = {'pages': 0, 'skipped': 0, 'elapsed': 0.0, 'error': None}
+        file_stats[pdf_file] = stats
+        started = time.perf_counter()
         
         try:
-            if single_image:
+            total_pages, pages, stats['skipped'] = plan.plan(pdf_file)
+            
+            if not pages:
+                if stats['skipped']:
+                    logger.info(f"⏭️ {pdf_file.name} 건너뜀: 이미 변환됨 ({stats['skipped']}개 이미지)")
+                else:
+                    logger.warning(f"⚠️ {pdf_file.name}: 지정한 범위에 변환할 페이지가 없습니다.")
+            elif sink is not None:
+                names = converter.convert_to_sink(
+                    pdf_file, sink, output_format, dpi, pages[0], pages[-1],
+                    single_image=single_image,
+                    streaming=(output_format.upper() == "PNG")
+                )
+                stats['pages'] = total_pages if single_image else len(names)
+                logger.info(f"✅ {pdf_file.name} 변환 완료: {len(names)}개 이미지")
+            elif single_image:
                 output_file = converter.convert_pdf_to_single_image(
-                    str(pdf_file), output_format, dpi
+                    str(pdf_file), output_format, dpi,
+                    streaming=(output_format.upper() == "PNG")
                 )
+                plan.done(pdf_file, None)
+                stats['pages'] = total_pages
                 logger.info(f"✅ {pdf_file.name} 변환 완료: {output_file}")
             else:
-                output_files = converter.convert_pdf_to_images(
-                    str(pdf_file), output_format, dpi, first_page, last_page
+                # 이어서 변환하는 경우 남은 페이지의 연속 구간만 변환
+                for run_first, run_last in _page_runs(pages):
+                    output_files = converter.convert_pdf_to_images(
+                        str(pdf_file), output_format, dpi, run_first, run_last,
+                        progress=lambda page_num, completed, total: plan.done(pdf_file, page_num)
+                    )
+                    stats['pages'] += len(output_files)
+                logger.info(
+                    f"✅ {pdf_file.name} 변환 완료: {stats['pages']}개 파일"
+                    + (f" (이미 변환된 {stats['skipped']}개 건너뜀)" if stats['skipped'] else "")
                 )
-                logger.info(f"✅ {pdf_file.name} 변환 완료: {len(output_files)}개 파일")
-            
-            success_count += 1
             
         except Exception as e:
             logger.error(f"❌ {pdf_file.name} 변환 실패: {e}")
-            error_count += 1
-            error_files.append((pdf_file.name, str(e)))
+            stats['error'] = str(e)
+        
+        stats['elapsed'] = time.perf_counter() - started
     
-    # 결과 요약
-    logger.info("=" * 50)
-    logger.info("🎯 배치 변환 완료!")
-    logger.info(f"✅ 성공: {success_count}개 파일")
-    logger.info(f"❌ 실패: {error_count}개 파일")
+    return file_stats
+
+def _convert_parallel(
+    converter, pdf_files, output_format, dpi, single_image, jobs, logger, plan, sink=None
+):
+    """
+    페이지 단위 작업을 프로세스 풀에서 처리합니다.
     
-    if error_files:
-        logger.info("실패한 파일들:")
-        for file_name, error_msg in error_files:
-            logger.info(f"  - {file_name}: {error_msg}")
+    여러 문서의 페이지를 번갈아 제출하므로 큰 문서 하나가 작은 문서들을
+    막지 않습니다. 실행 중인 작업 수를 제한하고 작업이 끝날 때마다 다음
+    작업을 채워 넣어, 먼저 끝난 워커가 남은 작업을 바로 가져갑니다.
     
-    return success_count, error_count, error_files
+    sink가 있으면 워커는 인코딩된 이미지를 돌려주고 메인 프로세스가 끝난 순서대로
+    sink에 기록합니다. 실행 중인 작업 수가 제한되므로 메모리에는 그만큼의 페이지만 있습니다.
+    """
+    file_stats = {}
+    # 파일 -> 워커가 사용할 백엔드 이름 (auto는 여기서 한 번만 측정하여 결정)
+    backends = {}
+    # 파일 -> 아직 끝나지 않은 작업 수
+    pending = {}
+    # 파일 -> 워커가 측정한 (최초 시작 시각, 마지막 종료 시각)
+    spans = {}
+    
+    def _mark_error(pdf_file, error):
+        stats = file_stats[pdf_file]
+        if stats['error'] is None:
+            stats['error'] = error
+            logger.error(f"❌ {pdf_file.name} 변환 실패: {error}")
+    
+    def _finish(pdf_file):
+        stats = file_stats[pdf_file]
+        if pdf_file in spans:
+            started, finished = spans[pdf_file]
+            stats['elapsed'] = finished - started
+        if stats['error'] is not None:
+            return
+        if stats['pages'] == 0 and stats['skipped']:
+            logger.info(f"⏭️ {pdf_file.name} 건너뜀: 이미 변환됨 ({stats['skipped']}개 이미지)")
+        else:
+            logger.info(f"✅ {pdf_file.name} 변환 완료: {stats['pages']}페이지")
+    
+    def _plan_pages(pdf_file):
+        """파일 하나의 작업 목록을 만듭니다. 단일 이미지는 파일 전체가 한 작업입니다."""
+        stats = {'pages': 0, 'skipped': 0, 'elapsed': 0.0, 'error': None}
+        file_stats[pdf_file] = stats
+        
+        try:
+            _, pages, stats['skipped'] = plan.plan(pdf_file)
+            if pages:
+                # 메모리 예산을 넘어 거부할 페이지가 있으면 작업을 나누기 전에 실패 처리
+                budget_pages = None if single_image else pages
+                backends[pdf_file] = converter._resolve_backend(pdf_file, dpi, budget_pages).name
+        except Exception as e:
+            _mark_error(pdf_file, str(e))
+            return []
+        
+        if not pages:
+            _finish(pdf_file)
+        return pages
+    
+    def _iter_tasks():
+        """활성 문서들의 페이지를 라운드 로빈으로 내보냅니다."""
+        remaining = deque(pdf_files)
+        active = deque()
+        
+        while remaining or active:
+            # 워커 수만큼 문서를 활성 상태로 유지
+            while remaining and len(active) < jobs:
+                pdf_file = remaining.popleft()
+                pages = _plan_pages(pdf_file)
+                if pages:
+                    pending[pdf_file] = len(pages)
+                    active.append((pdf_file, deque(pages)))
+            
+            if not active:
+                continue
+            
+            pdf_file, pages = active.popleft()
+            yield pdf_file, pages.popleft()
+            if pages:
+                active.append((pdf_file, pages))
+    
+    tasks = _iter_tasks()
+    in_flight = {}
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        
+        def _submit_next():
+            task = next(tasks, None)
+            if task is None:
+                return False
+            pdf_file, page_num = task
+            if sink is not None:
+                future = executor.submit(
+                    _encode_job, str(pdf_file), page_num, output_format, dpi, backends[pdf_file],
+                    converter.memory_budget, converter.encoder_profile, converter.lossless,
+                    converter.color_mode, converter.threshold, converter.dither
+                )
+            else:
+                future = executor.submit(
+                    _convert_job, str(pdf_file), page_num,
+                    str(converter.output_dir), output_format, dpi, backends[pdf_file],
+                    converter.memory_budget, converter.encoder_profile, converter.lossless,
+                    converter.color_mode, converter.threshold, converter.dither
+                )
+            in_flight[future] = (pdf_file, page_num)
+            return True
+        
+        # 큐에는 워커 수의 두 배까지만 작업을 넣어 메모리를 제한
+        while len(in_flight) < jobs * 2 and _submit_next():
+            pass
+        
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                pdf_file, page_num = in_flight.pop(future)
+                
+                try:
+                    pages, started, finished, *encoded = future.result()
+                    if sink is not None:
+                        for name, data in encoded[0]:
+                            sink.write(name, data)
+                    else:
+                        plan.done(pdf_file, page_num)
+                    file_stats[pdf_file]['pages'] += pages
+                    first, last = spans.get(pdf_file, (started, finished))
+                    spans[pdf_file] = (min(first, started), max(last, finished))
+                except Exception as e:
+                    _mark_error(pdf_file, str(e))
+                
+                pending[pdf_file] -= 1
+                if pending[pdf_file] == 0:
+                    _finish(pdf_file)
+                
+                _submit_next()
+    
+    return file_stats
+
+# 워커 프로세스마다 재사용하는 변환기:
+# (출력 디렉토리, 백엔드, 메모리 예산, 인코더 프로필, 무손실, 색상 모드, 기준 밝기, 디더링) -> PDFConverter
+_worker_converters = {}
+
+def _worker_converter_for(
+    output_dir, backend, memory_budget, encoder_profile, lossless, color_mode, threshold, dither
+):
+    key = (output_dir, backend, memory_budget, encoder_profile, lossless, color_mode, threshold, dither)
+    if key not in _worker_converters:
+        kwargs = {
+            'backend': get_backend(backend), 'memory_budget': memory_budget,
+            'encoder_profile': encoder_profile, 'lossless': lossless,
+            'color_mode': color_mode, 'threshold': threshold, 'dither': dither
+        }
+        if output_dir is not None:
+            kwargs['output_dir'] = output_dir
+        _worker_converters[key] = PDFConverter(**kwargs)
+    return _worker_converters[key]
+
+def _convert_job(
+    pdf_path, page_num, output_dir, output_format, dpi, backend, memory_budget=None,
+    encoder_profile=DEFAULT_PROFILE, lossless=False, color_mode="rgb", threshold=BILEVEL_THRESHOLD,
+    dither=False
+):
+    """
+    프로세스 풀 워커: 한 페이지(또는 page_num이 None이면 단일 이미지)를 변환합니다.
+    
+    Returns:
+        (변환한 페이지 수, 시작 시각, 종료 시각)
+    """
+    _worker_converter = _worker_converter_for(
+        output_dir, backend, memory_budget, encoder_profile, lossless, color_mode, threshold, dither
+    )
+    
+    started = time.time()
+    if page_num is None:
+        _worker_converter.convert_pdf_to_single_image(
+            pdf_path, output_format, dpi,
+            streaming=(output_format.upper() == "PNG")
+        )
+        pages = _worker_converter.get_page_count(pdf_path)
+    else:
+        _worker_converter.convert_page(pdf_path, page_num, output_format, dpi)
+        pages = 1
+    return pages, started, time.time()
+
+def _encode_job(
+    pdf_path, page_num, output_format, dpi, backend, memory_budget=None,
+    encoder_profile=DEFAULT_PROFILE, lossless=False, color_mode="rgb", threshold=BILEVEL_THRESHOLD,
+    dither=False
+):
+    """
+    프로세스 풀 워커: _convert_job과 같지만 파일을 쓰지 않고 인코딩된 이미지를 돌려줍니다.
+    
+    Returns:
+        (변환한 페이지 수, 시작 시각, 종료 시각, [(파일명, 이미지 바이트)])
+    """
+    _worker_converter = _worker_converter_for(
+        None, backend, memory_budget, encoder_profile, lossless, color_mode, threshold, dither
+    )
+    
+    started = time.time()
+    sink = MemorySink()
+    if page_num is None:
+        _worker_converter.convert_to_sink(
+            pdf_path, sink, output_format, dpi, single_image=True,
+            streaming=(output_format.upper() == "PNG")
+        )
+        pages = _worker_converter.get_page_count(pdf_path)
+    else:
+        _worker_converter.convert_to_sink(pdf_path, sink, output_format, dpi, page_num, page_num)
+        pages = 1
+    # memoryview는 프로세스 간에 전달할 수 없으므로 bytes로 변환
+    items = [(name, bytes(data)) for name, data in sink.items]
+    return pages, started, time.time(), items
 
 def main():
     """메인 함수"""
@@ -122,7 +546,7 @@ def main():
     parser.add_argument("-o", "--output-dir", default="converted_images",
                        help="출력 디렉토리 (기본값: converted_images)")
     parser.add_argument("-f", "--format", default="PNG",
-                       choices=["PNG", "JPEG", "TIFF", "BMP", "GIF"],
+                       choices=supported_formats(),
                        help="출력 이미지 형식 (기본값: PNG)")
     parser.add_argument("-d", "--dpi", type=int, default=200,
                        help="이미지 해상도 (기본값: 200)")
@@ -132,6 +556,34 @@ def main():
     parser.add_argument("--last-page", type=int, help="마지막 페이지 번호")
     parser.add_argument("--single-image", action="store_true",
                        help="모든 페이지를 하나의 이미지로 변환")
+    parser.add_argument("-b", "--backend", default="poppler",
+                       choices=list(BACKENDS) + ["auto"],
+                       help="렌더링 백엔드, auto는 문서마다 더 빠른 백엔드 선택 (기본값: poppler)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                       help="병렬 작업 프로세스 수, 2 이상이면 페이지 단위로 분산 (기본값: 1)")
+    parser.add_argument("--archive",
+                       help="모든 이미지를 개별 파일 대신 하나의 아카이브에 저장 (.zip, .tar, .tar.gz)")
+    parser.add_argument("--resume", "--incremental", dest="resume", action="store_true",
+                       help="출력 디렉토리의 매니페스트를 보고 이미 변환했고 원본이 바뀌지 않은 페이지는 건너뜀")
+    parser.add_argument("--max-megapixels", type=float,
+                       help="페이지당 최대 래스터 크기 (백만 픽셀), 넘으면 --oversize에 따라 처리")
+    parser.add_argument("--max-page-mb", type=float,
+                       help="페이지당 최대 래스터 메모리 (MB, RGB는 픽셀당 3바이트, gray/bilevel은 1바이트)")
+    parser.add_argument("--oversize", default="downscale", choices=OVERSIZE_POLICIES,
+                       help="한도를 넘는 페이지 처리: downscale은 DPI를 낮춤, tile은 PNG/TIFF를 타일로 렌더링, "
+                            "error는 그 파일을 실패 처리 (기본값: downscale)")
+    parser.add_argument("--tile-workers", type=int, default=1,
+                       help="--oversize tile에서 타일을 렌더링할 프로세스 수 (기본값: 1)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(ENCODER_PROFILES),
+                       help="인코더 프로필: fast는 크기보다 속도, archival은 속도보다 크기/화질 (기본값: balanced)")
+    parser.add_argument("--lossless", action="store_true",
+                       help="WebP를 무손실로 저장 (텍스트 페이지는 PNG보다 작음)")
+    parser.add_argument("--color", default="rgb", choices=COLOR_MODES,
+                       help="색상 모드: gray는 8비트 그레이스케일, bilevel은 1비트 흑백 (기본값: rgb)")
+    parser.add_argument("--threshold", type=int, default=BILEVEL_THRESHOLD,
+                       help=f"bilevel에서 흰색으로 볼 최소 밝기 0~255 (기본값: {BILEVEL_THRESHOLD})")
+    parser.add_argument("--dither", action="store_true",
+                       help="bilevel에서 기준 밝기 대신 디더링 사용")
     parser.add_argument("-v", "--verbose", action="store_true",
                        help="상세한 로그 출력")
     
@@ -143,6 +595,15 @@ def main():
         sys.exit(1)
     
     try:
+        memory_budget = None
+        if args.max_megapixels or args.max_page_mb:
+            memory_budget = MemoryBudget(
+                max_pixels=int(args.max_megapixels * 1_000_000) if args.max_megapixels else None,
+                max_bytes=int(args.max_page_mb * 1024 * 1024) if args.max_page_mb else None,
+                policy=args.oversize,
+                tile_workers=args.tile_workers
+            )
+        
         # 배치 변환 실행
         success, errors, error_files = batch_convert(
             input_dir=args.input_dir,
@@ -153,7 +614,17 @@ def main():
             first_page=args.first_page,
             last_page=args.last_page,
             single_image=args.single_image,
-            verbose=args.verbose
+            verbose=args.verbose,
+            jobs=args.jobs,
+            backend=args.backend,
+            archive=args.archive,
+            resume=args.resume,
+            memory_budget=memory_budget,
+            encoder_profile=args.profile,
+            lossless=args.lossless,
+            color_mode=args.color,
+            threshold=args.threshold,
+            dither=args.dither
         )
         
         if errors > 0:
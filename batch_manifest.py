@@ -0,0 +1,181 @@
+"""
+배치 변환 매니페스트
+
+출력 디렉토리의 JSON-lines 파일에 변환 결과를 한 줄씩 추가합니다. 각 줄에는 원본 PDF의
+경로, 크기, 수정 시각, 내용 해시, 변환 옵션, 페이지 번호, 생성한 파일명이 기록됩니다.
+배치를 다시 실행할 때 이 기록으로 이미 끝났고 원본이 바뀌지 않은 페이지를 건너뜁니다.
+줄마다 바로 flush하므로 프로세스가 중간에 죽어도 그때까지 끝난 페이지는 남습니다.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from render_cache import RenderCache
+
+MANIFEST_NAME = ".batch_manifest.jsonl"
+
+
+class BatchManifest:
+    """
+    출력 디렉토리별 변환 기록
+
+    원본 파일의 크기와 수정 시각이 기록과 같으면 해시를 다시 계산하지 않습니다.
+    둘 중 하나라도 다르면 내용 해시를 비교하여, 내용이 바뀐 문서의 이전 결과는 무효로 봅니다.
+    """
+
+    def __init__(self, output_dir: Union[str, Path]):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self.logger = logging.getLogger(__name__)
+        # 원본 경로 -> 최신 문서 정보 {'source', 'size', 'mtime_ns', 'sha256', 'page_count'}
+        self._documents: Dict[str, dict] = {}
+        # 원본 경로 -> {(옵션 키, 페이지 번호): 파일명}, 단일 이미지는 페이지 번호가 None
+        self._outputs: Dict[str, Dict[tuple, str]] = {}
+        self._line_count = 0
+        self._file = None
+        self._load()
+
+    def identify(self, pdf_path: Union[str, Path]) -> dict:
+        """
+        원본 문서 정보를 반환합니다.
+
+        Returns:
+            {'source', 'size', 'mtime_ns', 'sha256', 'page_count'} 딕셔너리.
+            처음 보거나 내용이 바뀐 문서는 page_count가 None입니다.
+        """
+        pdf_path = Path(pdf_path)
+        stat = pdf_path.stat()
+        source = str(pdf_path.resolve())
+        known = self._documents.get(source)
+
+        if known is not None and (known['size'], known['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            return dict(known)
+
+        sha256 = RenderCache.hash_file(pdf_path)
+        page_count = known['page_count'] if known is not None and known['sha256'] == sha256 else None
+        document = {
+            'source': source,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256,
+            'page_count': page_count
+        }
+        if page_count is not None:
+            # 내용은 같고 수정 시각만 바뀐 경우: 다음 실행에서 해시를 다시 계산하지 않도록 기록
+            self._append(dict(document, params=None, page=None, file=None))
+        return document
+
+    def completed_pages(self, document: dict, params: dict) -> Dict[Optional[int], str]:
+        """
+        같은 내용과 옵션으로 이미 만든 결과 중 파일이 남아 있는 것을 반환합니다.
+
+        Returns:
+            {페이지 번호: 파일명} 딕셔너리 (단일 이미지는 키가 None)
+        """
+        known = self._documents.get(document['source'])
+        if known is None or known['sha256'] != document['sha256']:
+            return {}
+
+        params_key = self._params_key(params)
+        return {
+            page_num: filename
+            for (key, page_num), filename in self._outputs.get(document['source'], {}).items()
+            if key == params_key and (self.output_dir / filename).exists()
+        }
+
+    def record(self, document: dict, params: dict, page_num: Optional[int], filename: str):
+        """
+        결과 하나를 기록합니다.
+
+        Args:
+            document: identify가 반환한 문서 정보 (page_count를 채워서 전달)
+            params: 결과에 영향을 주는 변환 옵션
+            page_num: 페이지 번호 (단일 이미지는 None)
+            filename: 출력 디렉토리 기준 파일명
+        """
+        self._append(dict(document, params=params, page=page_num, file=Path(filename).name))
+
+    def close(self):
+        """기록 파일을 닫습니다. 무효가 된 줄이 절반을 넘으면 유효한 줄만 남겨 다시 씁니다."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        live_count = sum(len(outputs) for outputs in self._outputs.values())
+        if self._line_count > 2 * max(live_count, len(self._documents)):
+            self._compact()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @staticmethod
+    def _params_key(params: Optional[dict]) -> str:
+        return json.dumps(params, sort_keys=True)
+
+    def _load(self):
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line_num, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError) as e:
+                    # 기록 도중 중단되어 마지막 줄이 잘린 경우 등
+                    self.logger.warning(f"매니페스트 {line_num}번째 줄을 읽을 수 없어 무시합니다: {e}")
+                self._line_count += 1
+
+    def _apply(self, record: dict):
+        source = record['source']
+        known = self._documents.get(source)
+        if known is None or known['sha256'] != record['sha256']:
+            # 원본 내용이 바뀌면 이전 결과는 모두 무효
+            self._outputs[source] = {}
+
+        self._documents[source] = {
+            'source': source,
+            'size': record['size'],
+            'mtime_ns': record['mtime_ns'],
+            'sha256': record['sha256'],
+            'page_count': record['page_count']
+        }
+        if record.get('file'):
+            key = (self._params_key(record['params']), record['page'])
+            self._outputs[source][key] = record['file']
+
+    def _append(self, record: dict):
+        self._apply(record)
+        if self._file is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._line_count += 1
+
+    def _compact(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        line_count = 0
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            for source, document in self._documents.items():
+                outputs = self._outputs.get(source, {})
+                records = [
+                    dict(document, params=json.loads(key), page=page_num, file=filename)
+                    for (key, page_num), filename in outputs.items()
+                ]
+                if not records:
+                    records = [dict(document, params=None, page=None, file=None)]
+                for record in records:
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    line_count += 1
+        os.replace(tmp_path, self.path)
+        self._line_count = line_count
+        self.logger.debug(f"매니페스트 정리 완료: {line_count}줄")
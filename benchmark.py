@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+PDF 변환 성능 벤치마크
+
+합성 PDF(텍스트, 벡터, 스캔 이미지)를 직접 생성하여 변환기/DPI/형식 조합별로
+실행 시간, CPU 시간, 초당 페이지 수, 최대 메모리(RSS)를 측정하고 JSON으로 저장합니다.
+기준 결과 파일을 주면 비교하여 성능 저하를 표시합니다.
+--tiled를 주면 A0 도면 한 페이지를 약 10억 픽셀로 렌더링하는 타일 렌더링 조합도 측정합니다.
+--encode-profiles를 주면 변환 대신, 렌더링해 둔 페이지를 인코더 프로필/형식별로 인코딩하는
+시간과 출력 크기만 측정합니다.
+
+각 측정은 새 프로세스에서 실행하므로 최대 메모리가 측정 간에 섞이지 않습니다. 조합마다 --repeats번
+측정하며(측정마다 새 프로세스에서 글꼴 로딩, 문서 풀 등을 한 번 워밍업한 뒤 실행), 중앙값과
+편차(최댓값-최솟값)를 기록하고 기준 결과와는 중앙값으로 비교합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import statistics
+import argparse
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import fitz  # PyMuPDF
+    from PIL import Image, ImageDraw
+except ImportError as e:
+    print(f"필요한 라이브러리가 설치되지 않았습니다: {e}")
+    print("pip install -r requirements.txt를 실행해주세요.")
+    sys.exit(1)
+
+from image_encoding import ENCODER_PROFILES, encode_image
+from render_backends import BACKENDS, available_backends, get_backend
+
+SHAPES = ["text", "vector", "scan"]
+# 기본 목록에는 없고 --tiled 조합에서 사용하는 큰 페이지 형태
+LARGE_SHAPES = ["drawing"]
+PAGE_COUNTS = [1, 50, 500]
+CONVERTERS = ["PDFConverter", "PDFConverterWeb"]
+
+# 변환기 이름 -> 사용하는 백엔드
+_CONVERTER_BACKENDS = {"PDFConverter": "poppler", "PDFConverterWeb": "pymupdf"}
+
+# 인코딩 측정에 사용할 문서 형태별 페이지 수
+ENCODE_PAGES = 3
+
+# 조합마다 측정에서 빼는 워밍업 실행 수와 기본 반복 측정 수
+WARMUP_RUNS = 1
+DEFAULT_REPEATS = 5
+
+# --tiled 조합: A0(2384x3370pt)를 800 DPI로 렌더링하면 약 26490x37445px (약 10억 픽셀)
+TILED_DPI = 800
+TILED_MAX_MEGAPIXELS = 64
+
+
+def create_synthetic_pdf(path, shape, page_count, seed=0):
+    """
+    벤치마크용 합성 PDF를 만듭니다.
+
+    Args:
+        path: 저장할 PDF 경로
+        shape: "text"(텍스트만), "vector"(선/도형이 많은 도면), "scan"(페이지 전체 이미지),
+            "drawing"(A0 크기의 벡터 도면)
+        page_count: 페이지 수
+        seed: 난수 시드 (같은 시드면 같은 문서)
+    """
+    rng = random.Random(seed)
+    pdf_document = fitz.open()
+    scan_xref = 0
+
+    for page_index in range(page_count):
+        if shape == "drawing":
+            page = pdf_document.new_page(width=2384, height=3370)  # A0
+        else:
+            page = pdf_document.new_page(width=595, height=842)  # A4
+
+        if shape == "text":
+            for line in range(45):
+                words = " ".join(
+                    "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+                    for _ in range(9)
+                )
+                page.insert_text((40, 50 + line * 17), words, fontsize=10)
+
+        elif shape == "vector":
+            shape_drawer = page.new_shape()
+            for _ in range(400):
+                start = fitz.Point(rng.uniform(20, 575), rng.uniform(20, 822))
+                end = fitz.Point(rng.uniform(20, 575), rng.uniform(20, 822))
+                shape_drawer.draw_line(start, end)
+            shape_drawer.finish(color=(0, 0, 0), width=0.4)
+            for _ in range(80):
+                center = fitz.Point(rng.uniform(40, 555), rng.uniform(40, 802))
+                shape_drawer.draw_circle(center, rng.uniform(3, 30))
+                shape_drawer.finish(color=(0, 0, 0.6), fill=(rng.random(), rng.random(), rng.random()), width=0.6)
+            shape_drawer.commit()
+
+        elif shape == "drawing":
+            # 격자와 긴 선이 많은 도면: 타일마다 보이는 도형이 고르게 분포
+            shape_drawer = page.new_shape()
+            for offset in range(0, 3370, 50):
+                shape_drawer.draw_line(fitz.Point(0, offset), fitz.Point(2384, offset))
+            for offset in range(0, 2384, 50):
+                shape_drawer.draw_line(fitz.Point(offset, 0), fitz.Point(offset, 3370))
+            shape_drawer.finish(color=(0.7, 0.7, 0.9), width=0.3)
+            for _ in range(3000):
+                start = fitz.Point(rng.uniform(20, 2364), rng.uniform(20, 3350))
+                end = fitz.Point(rng.uniform(20, 2364), rng.uniform(20, 3350))
+                shape_drawer.draw_line(start, end)
+            shape_drawer.finish(color=(0, 0, 0), width=0.5)
+            for _ in range(600):
+                center = fitz.Point(rng.uniform(40, 2344), rng.uniform(40, 3330))
+                shape_drawer.draw_circle(center, rng.uniform(5, 80))
+                shape_drawer.finish(color=(0, 0, 0.6), fill=(rng.random(), rng.random(), rng.random()), width=0.8)
+            shape_drawer.commit()
+
+        elif shape == "scan":
+            if scan_xref == 0:
+                scan_xref = page.insert_image(page.rect, stream=_scan_image_bytes(rng))
+            else:
+                # 같은 이미지 객체를 재사용하여 파일 크기를 줄임
+                page.insert_image(page.rect, xref=scan_xref)
+
+        else:
+            raise ValueError(f"알 수 없는 문서 형태입니다: {shape}")
+
+    pdf_document.save(path, garbage=1)
+    pdf_document.close()
+    return path
+
+
+def _scan_image_bytes(rng):
+    """300 DPI A4 스캔을 흉내 낸 그레이스케일 JPEG"""
+    image = Image.new("L", (2480, 3508), 245)
+    draw = ImageDraw.Draw(image)
+    for line in range(120):
+        y = 150 + line * 27
+        x = 150
+        while x < 2300:
+            word = rng.randint(30, 160)
+            draw.rectangle((x, y, x + word, y + 14), fill=rng.randint(20, 60))
+            x += word + rng.randint(15, 30)
+
+    buffer = tempfile.SpooledTemporaryFile()
+    image.save(buffer, "JPEG", quality=85)
+    buffer.seek(0)
+    return buffer.read()
+
+
+def _peak_rss_bytes():
+    """현재 프로세스와 자식 프로세스(pdftoppm 등)의 최대 RSS"""
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # Linux는 KB 단위
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(self_rss, children_rss) * scale
+
+
+def _run_case_in_process(case, pdf_path, output_dir, queue):
+    """새 프로세스에서 한 조합을 워밍업 후 한 번 측정하고 결과를 큐에 넣습니다."""
+    try:
+        import logging
+        from memory_budget import MemoryBudget
+        from pdf_converter import PDFConverter
+        from pdf_converter_web import PDFConverterWeb
+
+        converter_class = {"PDFConverter": PDFConverter, "PDFConverterWeb": PDFConverterWeb}[case["converter"]]
+        memory_budget = MemoryBudget(**case["budget"]) if case.get("budget") else None
+        converter = converter_class(
+            output_dir, memory_budget=memory_budget, encode_workers=case.get("encode_workers")
+        )
+        # 페이지별 로그 출력이 측정값에 섞이지 않도록 함
+        logging.getLogger().setLevel(logging.WARNING)
+
+        # 워밍업 실행은 측정하지 않고 마지막 실행만 측정
+        for _ in range(WARMUP_RUNS + 1):
+            for old_file in Path(output_dir).glob("*"):
+                old_file.unlink()
+
+            cpu_started = os.times()
+            wall_started = time.perf_counter()
+
+            output_files = converter.convert_pdf_to_images(
+                pdf_path, output_format=case["format"], dpi=case["dpi"], **case.get("options", {})
+            )
+
+            wall_seconds = time.perf_counter() - wall_started
+            cpu_finished = os.times()
+
+        cpu_seconds = sum(
+            finished - started
+            for started, finished in zip(cpu_started[:4], cpu_finished[:4])
+        )
+        output_bytes = sum(os.path.getsize(path) for path in output_files)
+        queue.put({
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+            "pages": len(output_files),
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "output_bytes": output_bytes
+        })
+    except Exception as e:
+        queue.put({"error": str(e)})
+
+
+def run_case(case, pdf_path, work_dir, repeats=DEFAULT_REPEATS):
+    """
+    한 조합을 repeats번 측정하고 결과 딕셔너리를 반환합니다.
+
+    측정마다 새 프로세스에서 워밍업 후 한 번 실행하므로, 프로세스마다 달라지는 잡음(메모리 배치,
+    CPU 클럭 등)도 편차에 반영됩니다. 실행 시간/CPU 시간/초당 페이지 수는 중앙값, 최대 RSS는 최댓값입니다.
+    """
+    if repeats < 1:
+        raise ValueError(f"반복 횟수는 1 이상이어야 합니다: {repeats}")
+    output_dir = Path(work_dir) / "output"
+    output_dir.mkdir(exist_ok=True)
+
+    # fork된 프로세스는 부모의 메모리 사용량을 물려받으므로 spawn 사용
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeats):
+        queue = context.Queue()
+        process = context.Process(
+            target=_run_case_in_process, args=(case, str(pdf_path), str(output_dir), queue)
+        )
+        process.start()
+        run = queue.get()
+        process.join()
+        if "error" in run:
+            return dict(case, **run)
+        runs.append(run)
+
+    wall_runs = [run["wall_seconds"] for run in runs]
+    wall_seconds = statistics.median(wall_runs)
+    peak_rss = [run["peak_rss_bytes"] for run in runs if run["peak_rss_bytes"] is not None]
+    return dict(
+        case,
+        repeats=repeats,
+        wall_seconds=wall_seconds,
+        wall_seconds_runs=wall_runs,
+        # 반복 측정의 (최댓값 - 최솟값) / 중앙값
+        wall_seconds_spread=(max(wall_runs) - min(wall_runs)) / wall_seconds if wall_seconds > 0 else 0.0,
+        cpu_seconds=statistics.median(run["cpu_seconds"] for run in runs),
+        pages=runs[-1]["pages"],
+        pages_per_second=runs[-1]["pages"] / wall_seconds if wall_seconds > 0 else 0.0,
+        peak_rss_bytes=max(peak_rss) if peak_rss else None,
+        output_bytes=runs[-1]["output_bytes"]
+    )
+
+
+def case_id(case):
+    """기준 결과와 비교할 때 사용하는 조합 식별자"""
+    parts = [case["converter"], case["shape"], f"{case['page_count']}p", f"{case['dpi']}dpi", case["format"]]
+    if case.get("options"):
+        parts.append(",".join(f"{key}={value}" for key, value in sorted(case["options"].items())))
+    if case.get("budget"):
+        parts.append(",".join(f"{key}={value}" for key, value in sorted(case["budget"].items())))
+    if case.get("encode_workers") is not None:
+        parts.append(f"encode={case['encode_workers']}")
+    return "/".join(parts)
+
+
+def build_cases(converters, shapes, page_counts, dpis, formats, encode_workers=(None,)):
+    """
+    측정할 조합 목록을 만듭니다. 백엔드가 없는 변환기는 건너뜁니다.
+    encode_workers는 인코딩 스레드 수 목록이며 None은 변환기 기본값입니다.
+    """
+    cases = []
+    for converter in converters:
+        backend = _CONVERTER_BACKENDS[converter]
+        if not BACKENDS[backend].is_available():
+            print(f"⚠️ {converter}: {backend} 백엔드를 사용할 수 없어 건너뜁니다.")
+            continue
+        for shape in shapes:
+            for page_count in page_counts:
+                for dpi in dpis:
+                    for output_format in formats:
+                        for workers in encode_workers:
+                            case = {
+                                "converter": converter,
+                                "shape": shape,
+                                "page_count": page_count,
+                                "dpi": dpi,
+                                "format": output_format
+                            }
+                            if workers is not None:
+                                case["encode_workers"] = workers
+                            cases.append(case)
+    return cases
+
+
+def build_tiled_cases(formats, dpi=TILED_DPI, tile_workers=1):
+    """
+    A0 도면 한 페이지를 페이지당 한도보다 훨씬 크게 렌더링하는 타일 렌더링 조합을 만듭니다.
+
+    타일 렌더러는 PyMuPDF를 사용하므로 PDFConverterWeb으로만 측정합니다.
+    """
+    if not BACKENDS[_CONVERTER_BACKENDS["PDFConverterWeb"]].is_available():
+        print("⚠️ PyMuPDF를 사용할 수 없어 타일 렌더링 조합을 건너뜁니다.")
+        return []
+    return [
+        {
+            "converter": "PDFConverterWeb",
+            "shape": "drawing",
+            "page_count": 1,
+            "dpi": dpi,
+            "format": output_format,
+            "budget": {
+                "max_pixels": TILED_MAX_MEGAPIXELS * 1_000_000,
+                "policy": "tile",
+                "tile_workers": tile_workers
+            }
+        }
+        for output_format in formats
+    ]
+
+
+def run_encode_benchmark(shapes, dpis, formats, profiles, work_dir, page_count=ENCODE_PAGES):
+    """
+    합성 문서 페이지를 한 번 렌더링해 두고 형식/인코더 프로필별 페이지당 인코딩 시간과 출력 크기를 잽니다.
+    렌더링 시간은 포함하지 않습니다.
+    """
+    backend = get_backend(available_backends()[0])
+    pdf_dir = Path(work_dir) / "pdfs"
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for shape in shapes:
+        pdf_path = pdf_dir / f"{shape}_{page_count}.pdf"
+        if not pdf_path.exists():
+            create_synthetic_pdf(pdf_path, shape, page_count)
+        for dpi in dpis:
+            images = [image for _, image in backend.iter_pages(pdf_path, range(1, page_count + 1), dpi)]
+            for output_format in formats:
+                for profile in profiles:
+                    started = time.perf_counter()
+                    sizes = [len(encode_image(image, output_format, profile)) for image in images]
+                    seconds = (time.perf_counter() - started) / len(images)
+                    result = {
+                        "shape": shape,
+                        "dpi": dpi,
+                        "format": output_format,
+                        "profile": profile,
+                        "encode_seconds_per_page": seconds,
+                        "bytes_per_page": sum(sizes) / len(sizes)
+                    }
+                    results.append(result)
+                    print(
+                        f"{shape}/{dpi}dpi/{output_format}/{profile}: "
+                        f"페이지당 {seconds * 1000:.0f}ms, {result['bytes_per_page'] / 1024:.0f} KB"
+                    )
+    return results
+
+
+def run_benchmarks(cases, work_dir, repeats=DEFAULT_REPEATS):
+    """조합별로 합성 PDF를 준비하고 워밍업 후 repeats번 측정합니다."""
+    work_dir = Path(work_dir)
+    pdf_dir = work_dir / "pdfs"
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for index, case in enumerate(cases, 1):
+        pdf_path = pdf_dir / f"{case['shape']}_{case['page_count']}.pdf"
+        if not pdf_path.exists():
+            create_synthetic_pdf(pdf_path, case["shape"], case["page_count"])
+
+        result = run_case(case, pdf_path, work_dir, repeats)
+        results.append(result)
+
+        if "error" in result:
+            print(f"[{index}/{len(cases)}] ❌ {case_id(case)}: {result['error']}")
+        else:
+            peak = result["peak_rss_bytes"]
+            peak_text = f"{peak / 1024 / 1024:.0f} MB" if peak else "측정 불가"
+            print(
+                f"[{index}/{len(cases)}] {case_id(case)}: "
+                f"{result['wall_seconds']:.2f}초(중앙값, 편차 {result['wall_seconds_spread']:.0%}), "
+                f"CPU {result['cpu_seconds']:.2f}초, "
+                f"{result['pages_per_second']:.1f} 페이지/초, 최대 RSS {peak_text}"
+            )
+    return results
+
+
+def compare_results(results, baseline, threshold=0.10):
+    """
+    기준 결과와 비교하여 성능 저하 목록을 반환합니다.
+
+    초당 페이지 수(반복 측정의 중앙값)가 threshold 비율 이상 줄거나 최대 RSS가 threshold 비율 이상
+    늘면 저하로 봅니다. 초당 페이지 수는 기준/현재 결과의 반복 측정 편차(wall_seconds_spread)보다 작은
+    변화를 잡음으로 보아 threshold 대신 그 편차를 기준으로 삼습니다.
+
+    Returns:
+        (조합 식별자, 지표 이름, 기준 값, 현재 값, 변화율) 목록
+    """
+    baseline_by_id = {case_id(item): item for item in baseline.get("results", [])}
+    regressions = []
+
+    for result in results:
+        base = baseline_by_id.get(case_id(result))
+        if base is None or "error" in result or "error" in base:
+            continue
+
+        if base["pages_per_second"] > 0:
+            # 반복 측정 편차가 없는 이전 형식의 결과는 threshold만 적용
+            tolerance = max(
+                threshold, base.get("wall_seconds_spread", 0.0), result.get("wall_seconds_spread", 0.0)
+            )
+            change = result["pages_per_second"] / base["pages_per_second"] - 1
+            if change < -tolerance:
+                regressions.append((case_id(result), "pages_per_second", base["pages_per_second"], result["pages_per_second"], change))
+
+        if base.get("peak_rss_bytes") and result.get("peak_rss_bytes"):
+            change = result["peak_rss_bytes"] / base["peak_rss_bytes"] - 1
+            if change > threshold:
+                regressions.append((case_id(result), "peak_rss_bytes", base["peak_rss_bytes"], result["peak_rss_bytes"], change))
+
+    return regressions
+
+
+def _parse_list(value, cast=str):
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="PDF 변환 성능 벤치마크")
+    parser.add_argument("--converters", default=",".join(CONVERTERS),
+                       help=f"측정할 변환기 (기본값: {','.join(CONVERTERS)})")
+    parser.add_argument("--shapes", default=",".join(SHAPES),
+                       help=f"합성 문서 형태 (기본값: {','.join(SHAPES)})")
+    parser.add_argument("--pages",
+                       help="문서 페이지 수 목록 (기본값: 1,50,500)")
+    parser.add_argument("--dpi",
+                       help="DPI 목록 (기본값: 150,300)")
+    parser.add_argument("--formats",
+                       help="출력 형식 목록 (기본값: PNG,JPEG)")
+    parser.add_argument("--encode-workers",
+                       help="비교할 인코딩 스레드 수 목록, 예: 1,4 (기본값: 변환기 기본값)")
+    parser.add_argument("--encode-profiles", nargs="?", const=",".join(ENCODER_PROFILES),
+                       help="변환 대신 인코더 프로필별 인코딩 시간/출력 크기만 측정 "
+                            f"(값을 생략하면 {','.join(ENCODER_PROFILES)})")
+    parser.add_argument("--tiled", action="store_true",
+                       help=f"A0 도면을 {TILED_DPI} DPI(약 10억 픽셀)로 타일 렌더링하는 PNG/TIFF 조합 추가")
+    parser.add_argument("--tiled-dpi", type=int, default=TILED_DPI,
+                       help=f"--tiled 조합의 DPI (기본값: {TILED_DPI})")
+    parser.add_argument("--tile-workers", type=int, default=1,
+                       help="--tiled 조합에서 타일을 렌더링할 프로세스 수 (기본값: 1)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                       help=f"조합마다 워밍업 {WARMUP_RUNS}회 뒤 반복 측정할 횟수, 중앙값을 기록 (기본값: {DEFAULT_REPEATS})")
+    parser.add_argument("--quick", action="store_true",
+                       help="빠른 확인용 기본값 사용 (1/50페이지, 150 DPI, PNG)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json",
+                       help="결과 JSON 파일 (기본값: benchmark_results.json)")
+    parser.add_argument("--baseline",
+                       help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                       help="성능 저하로 판단할 변화율 %% (기본값: 10)")
+    parser.add_argument("--work-dir",
+                       help="합성 PDF와 출력 파일을 둘 디렉토리 (기본값: 임시 디렉토리)")
+
+    args = parser.parse_args()
+
+    # 직접 지정하지 않은 항목만 기본값(또는 --quick 기본값)으로 채움
+    defaults = ("1,50", "150", "PNG") if args.quick else ("1,50,500", "150,300", "PNG,JPEG")
+    args.pages = args.pages or defaults[0]
+    args.dpi = args.dpi or defaults[1]
+    args.formats = args.formats or defaults[2]
+
+    if args.encode_profiles:
+        profiles = _parse_list(args.encode_profiles)
+        unknown = [profile for profile in profiles if profile not in ENCODER_PROFILES]
+        if unknown:
+            print(f"❌ 알 수 없는 인코더 프로필: {', '.join(unknown)}")
+            sys.exit(1)
+        print(f"🚀 인코딩 벤치마크 시작: 프로필 {', '.join(profiles)}")
+        with tempfile.TemporaryDirectory() as work_dir:
+            encode_results = run_encode_benchmark(
+                _parse_list(args.shapes), _parse_list(args.dpi, int), _parse_list(args.formats),
+                profiles, args.work_dir or work_dir
+            )
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"encode_results": encode_results}, file, ensure_ascii=False, indent=2)
+        print(f"📄 결과 저장: {args.output}")
+        return
+
+    cases = build_cases(
+        _parse_list(args.converters),
+        _parse_list(args.shapes),
+        _parse_list(args.pages, int),
+        _parse_list(args.dpi, int),
+        _parse_list(args.formats),
+        _parse_list(args.encode_workers, int) if args.encode_workers else (None,)
+    )
+    if args.tiled:
+        cases += build_tiled_cases(["PNG", "TIFF"], args.tiled_dpi, args.tile_workers)
+    if not cases:
+        print("❌ 측정할 조합이 없습니다.")
+        sys.exit(1)
+    if args.repeats < 1:
+        print("❌ --repeats는 1 이상이어야 합니다.")
+        sys.exit(1)
+
+    print(f"🚀 벤치마크 시작: {len(cases)}개 조합, 워밍업 {WARMUP_RUNS}회 + 반복 {args.repeats}회")
+
+    if args.work_dir:
+        results = run_benchmarks(cases, args.work_dir, args.repeats)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            results = run_benchmarks(cases, work_dir, args.repeats)
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pymupdf": getattr(fitz, "VersionBind", None)
+        },
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"📄 결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+        regressions = compare_results(results, baseline, args.threshold / 100)
+        if regressions:
+            print(f"❌ 성능 저하 {len(regressions)}건 (기준: {args.threshold:.0f}%):")
+            for identifier, metric, before, after, change in regressions:
+                print(f"  - {identifier} {metric}: {before:.1f} -> {after:.1f} ({change:+.1%})")
+            sys.exit(1)
+        print("✅ 기준 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,614 @@
+"""
+비동기 PDF 변환 서비스
+
+변환 요청을 작업 대기열에 넣고 워커가 순서대로 처리합니다. 요청한 쪽은 작업 ID로
+진행 상황(페이지 단위 이벤트)을 조회하거나 취소할 수 있으므로, 긴 문서를 변환하는 동안
+Streamlit 세션이 멈추지 않고 여러 사용자의 요청도 정해진 워커 수 안에서 처리됩니다.
+업로드된 PDF 바이트는 디스크에 쓰지 않고 변환하며, 결과도 기본적으로 메모리에 보관합니다.
+
+변환은 작업 프로세스 풀에서 실행합니다. PyMuPDF(MuPDF)는 스레드 안전하지 않고 렌더링 중 GIL을
+대부분 잡고 있으므로, 스레드에서 여러 작업을 동시에 렌더링하면 충돌할 수 있고 빨라지지도 않습니다.
+작업 프로세스는 진행 이벤트와 메모리/아카이브 결과를 큐로 보내고, 취소 플래그는 페이지마다 확인합니다.
+작업 프로세스가 비정상 종료되면 그 작업만 실패로 처리하고 풀을 새로 만듭니다.
+
+ConversionService는 asyncio 코드에서 직접 사용하고, LocalConversionService는 백그라운드
+스레드에서 이벤트 루프를 돌려 Streamlit 같은 동기 코드에서 사용할 수 있게 합니다.
+외부 서비스(메시지 큐 등) 없이 표준 라이브러리의 multiprocessing만 사용합니다.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+from memory_budget import MemoryBudget
+from output_sinks import ArchiveSink, DirectorySink, ImageData, MemorySink, OutputSink
+from pdf_converter import PDFConverter
+from pdf_converter_web import PDFConverterWeb
+from render_backends import BILEVEL_THRESHOLD
+from render_cache import RenderCache
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# 작업 프로세스의 이벤트 큐를 확인하는 간격 (초)
+EVENT_POLL_INTERVAL = 0.1
+
+
+class QueueFullError(RuntimeError):
+    """대기열이 가득 차서 작업을 받을 수 없을 때 발생합니다."""
+
+
+class JobCancelled(Exception):
+    """실행 중인 작업이 취소되었을 때 변환을 중단하기 위해 사용합니다."""
+
+
+class ConversionJob:
+    """변환 작업 하나의 설정과 진행 상태"""
+
+    def __init__(
+        self,
+        job_id: str,
+        source: Union[Path, bytes],
+        name: str,
+        sink: OutputSink,
+        options: dict,
+        cancel_requested=None
+    ):
+        self.job_id = job_id
+        self.source = source
+        self.name = name
+        self.sink = sink
+        self.options = options
+
+        self.status = QUEUED
+        self.completed_pages = 0
+        self.total_pages = 0
+        self.output_files: List[str] = []
+        # 아카이브로 받은 경우 완성된 아카이브 바이트
+        self.archive_data: Optional[bytes] = None
+        # 메모리 예산 때문에 DPI를 낮춘 페이지의 처리 결과
+        self.downscaled_pages: List[dict] = []
+        # 렌더링하지 않고 내장 이미지를 그대로 추출한 페이지 번호
+        self.extracted_pages: List[int] = []
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        # 진행 이벤트 목록과 새 이벤트 알림 (이벤트 루프 스레드에서만 변경)
+        self.events: List[dict] = []
+        self.changed = asyncio.Event()
+        # 작업 프로세스가 페이지마다 확인하는 취소 플래그 (서비스는 프로세스 간 Event를 넘김)
+        self.cancel_requested = cancel_requested if cancel_requested is not None else threading.Event()
+
+    def snapshot(self) -> dict:
+        """현재 상태를 딕셔너리로 반환합니다."""
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'filename': self.name,
+            'options': dict(self.options),
+            'completed_pages': self.completed_pages,
+            'total_pages': self.total_pages,
+            'output_files': list(self.output_files),
+            'downscaled_pages': list(self.downscaled_pages),
+            'extracted_pages': list(self.extracted_pages),
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class ConversionService:
+    """
+    제한된 크기의 대기열과 워커 풀로 PDF 변환 작업을 처리하는 asyncio 서비스
+
+    변환 자체는 작업 프로세스 풀에서 실행하며, 페이지가 변환될 때마다 진행 이벤트를 기록합니다.
+    결과는 작업별 MemorySink에 보관하거나(get_outputs로 조회), 메모리 아카이브 하나로 묶거나
+    (get_archive로 조회), 지정한 디렉토리에 저장합니다.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 16,
+        max_finished_jobs: int = 100,
+        cache: Optional[RenderCache] = None,
+        converter_factory: Callable[..., PDFConverter] = PDFConverterWeb,
+        memory_budget: Optional[MemoryBudget] = None
+    ):
+        """
+        Args:
+            workers: 동시에 실행할 변환 작업 수 (작업 프로세스 수)
+            max_queue: 대기할 수 있는 최대 작업 수 (넘으면 QueueFullError)
+            max_finished_jobs: 보관할 완료 작업 수 (넘으면 오래된 작업부터 결과와 함께 삭제)
+            cache: 변환기에 넘길 렌더 캐시
+            converter_factory: (cache=, backend=, memory_budget=, passthrough=, encoder_profile=, lossless=,
+                color_mode=, threshold=, dither=)로 변환기를 만드는 함수. 작업 프로세스로 넘기므로 모듈 최상위의 클래스나 함수여야 합니다.
+            memory_budget: 모든 작업에 적용할 페이지당 래스터 크기 상한
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_finished_jobs = max_finished_jobs
+        self.cache = cache
+        self.converter_factory = converter_factory
+        self.memory_budget = memory_budget
+
+        self.jobs: Dict[str, ConversionJob] = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # 작업 프로세스의 이벤트를 받아 처리하는 스레드 (작업마다 하나)
+        self._receivers: Optional[ThreadPoolExecutor] = None
+        # 작업 프로세스와 주고받는 이벤트 큐/취소 플래그를 만드는 관리자 프로세스
+        self._manager = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self):
+        """워커를 시작합니다."""
+        if self._worker_tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        # 이벤트 루프/Streamlit 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._receivers = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="conversion")
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        self.logger.info(f"변환 서비스 시작: 워커 {self.workers}개, 대기열 {self.max_queue}개")
+
+    async def stop(self):
+        """실행 중인 작업을 취소하고 워커를 종료합니다."""
+        for job in self.jobs.values():
+            if job.status not in FINISHED_STATES:
+                self.cancel(job.job_id)
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        for job in list(self.jobs.values()):
+            if job.status == RUNNING:
+                self._finish(job, CANCELLED)
+
+        if self._executor is not None:
+            # 실행 중인 변환은 다음 페이지에서 취소 플래그를 보고 멈춤
+            await self._loop.run_in_executor(None, self._executor.shutdown)
+            await self._loop.run_in_executor(None, self._receivers.shutdown)
+            self._executor = None
+            self._receivers = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+        self.logger.info("변환 서비스 종료")
+
+    async def submit(
+        self,
+        source: Union[str, Path, bytes],
+        filename: Optional[str] = None,
+        output_format: str = "PNG",
+        dpi: int = 200,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        single_image: bool = False,
+        streaming: bool = False,
+        backend: Optional[str] = None,
+        output_dir: Union[str, Path, None] = None,
+        archive: Optional[str] = None,
+        passthrough: bool = False,
+        encoder_profile: Optional[str] = None,
+        lossless: bool = False,
+        color_mode: str = "rgb",
+        threshold: int = BILEVEL_THRESHOLD,
+        dither: bool = False
+    ) -> str:
+        """
+        변환 작업을 대기열에 추가합니다.
+
+        Args:
+            source: PDF 파일 경로 또는 PDF 바이트 (바이트는 메모리에서 바로 변환)
+            filename: 결과 파일명의 기준이 되는 문서 이름 (기본값: 파일 이름)
+            output_format, dpi, first_page, last_page: 변환 옵션
+            single_image: 모든 페이지를 하나의 이미지로 결합
+            streaming: 단일 이미지를 한 페이지씩 기록 (PNG 전용)
+            backend: 렌더링 백엔드 이름 (기본값: 변환기 기본값)
+            output_dir: 결과 이미지를 저장할 디렉토리 (기본값: 메모리에 보관)
+            archive: "zip", "tar", "tar.gz"이면 결과를 메모리의 아카이브 하나에 기록
+                (페이지별 이미지를 따로 보관하지 않음)
+            passthrough: 스캔 이미지 한 장뿐인 페이지는 내장 이미지를 그대로 추출
+            encoder_profile: 인코더 프로필 이름 (기본값: 변환기 기본값)
+            lossless: WebP를 무손실로 저장
+            color_mode: "rgb", 8비트 그레이스케일 "gray" 또는 1비트 흑백 "bilevel"
+            threshold: bilevel에서 흰색으로 볼 최소 밝기 (0~255)
+            dither: bilevel에서 기준 밝기 대신 Floyd-Steinberg 디더링 사용
+
+        Returns:
+            작업 ID
+        """
+        if self._queue is None:
+            raise RuntimeError("변환 서비스가 시작되지 않았습니다.")
+        if self._queue.full():
+            raise QueueFullError("대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+
+        job_id = uuid.uuid4().hex
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = bytes(source)
+            name = Path(filename or "document.pdf").name
+        else:
+            source = Path(source)
+            name = Path(filename or source.name).name
+        if output_dir:
+            sink = DirectorySink(output_dir)
+        elif archive:
+            sink = ArchiveSink(io.BytesIO(), archive)
+        else:
+            sink = MemorySink()
+
+        options = {
+            'output_format': output_format,
+            'dpi': dpi,
+            'first_page': first_page,
+            'last_page': last_page,
+            'single_image': single_image,
+            'streaming': streaming,
+            'backend': backend,
+            'archive': archive,
+            'passthrough': passthrough,
+            'encoder_profile': encoder_profile,
+            'lossless': lossless,
+            'color_mode': color_mode,
+            'threshold': threshold,
+            'dither': dither
+        }
+        job = ConversionJob(job_id, source, name, sink, options, self._manager.Event())
+        self.jobs[job_id] = job
+        self._publish(job, {'type': 'status', 'status': QUEUED})
+        self._queue.put_nowait(job)
+
+        self.logger.info(f"작업 등록: {job_id} ({name})")
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """작업 상태를 반환합니다. 없는 작업이면 None"""
+        job = self.jobs.get(job_id)
+        return job.snapshot() if job is not None else None
+
+    def get_outputs(self, job_id: str) -> List[Tuple[str, ImageData]]:
+        """메모리에 보관한 결과를 (파일명, 이미지 바이트) 목록으로 반환합니다. 디렉토리에 저장한 작업은 빈 목록"""
+        job = self.jobs.get(job_id)
+        if job is None or not isinstance(job.sink, MemorySink):
+            return []
+        return list(job.sink.items)
+
+    def get_archive(self, job_id: str) -> Optional[bytes]:
+        """archive 옵션으로 완료한 작업의 아카이브 바이트를 반환합니다. 없으면 None"""
+        job = self.jobs.get(job_id)
+        return job.archive_data if job is not None else None
+
+    def list_jobs(self) -> List[dict]:
+        """등록된 모든 작업의 상태를 등록 순으로 반환합니다."""
+        return [job.snapshot() for job in self.jobs.values()]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        작업을 취소합니다. 대기 중이면 바로 취소되고, 실행 중이면 현재 페이지를 마친 뒤 멈춥니다.
+
+        Returns:
+            취소 요청을 받아들였으면 True, 없거나 이미 끝난 작업이면 False
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return False
+
+        job.cancel_requested.set()
+        if job.status == QUEUED:
+            # 워커가 꺼낼 때 건너뜀
+            self._finish(job, CANCELLED)
+        self.logger.info(f"작업 취소 요청: {job_id}")
+        return True
+
+    def remove_job(self, job_id: str) -> bool:
+        """끝난 작업과 메모리에 보관한 결과를 지웁니다. (output_dir에 저장한 파일은 남김)"""
+        job = self.jobs.get(job_id)
+        if job is None or job.status not in FINISHED_STATES:
+            return False
+        del self.jobs[job_id]
+        return True
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> dict:
+        """작업이 끝날 때까지 기다린 뒤 상태를 반환합니다."""
+        async def _wait_finished():
+            async for _ in self.events(job_id):
+                pass
+
+        await asyncio.wait_for(_wait_finished(), timeout)
+        return self.get_job(job_id)
+
+    async def events(self, job_id: str) -> AsyncIterator[dict]:
+        """
+        작업의 진행 이벤트를 처음부터 차례로 반환하고, 작업이 끝나면 멈춥니다.
+
+        이벤트는 {'type': 'status', 'status': ...} 또는
+        {'type': 'page', 'page': 페이지 번호, 'completed': 완료 수, 'total': 전체 수} 형태입니다.
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"작업을 찾을 수 없습니다: {job_id}")
+
+        index = 0
+        while True:
+            changed = job.changed
+            while index < len(job.events):
+                yield job.events[index]
+                index += 1
+            if job.status in FINISHED_STATES:
+                return
+            await changed.wait()
+
+    async def _worker(self):
+        """대기열에서 작업을 꺼내 작업 프로세스에서 변환합니다."""
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status != QUEUED:
+                    continue  # 대기 중에 취소됨
+
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._publish(job, {'type': 'status', 'status': RUNNING})
+
+                try:
+                    output_files = await self._loop.run_in_executor(
+                        self._receivers, self._run_job, job
+                    )
+                except JobCancelled:
+                    self._finish(job, CANCELLED)
+                except Exception as e:
+                    job.error = str(e)
+                    self._finish(job, FAILED)
+                else:
+                    job.output_files = output_files
+                    self._finish(job, DONE)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job: ConversionJob) -> List[str]:
+        """
+        이벤트 루프 밖의 스레드에서 실행: 작업 프로세스에 변환을 맡기고, 작업 프로세스가 보내는
+        진행 이벤트와 결과 이미지를 받아 처리합니다.
+        """
+        options = job.options
+        converter_kwargs = {'cache': self.cache}
+        if options['backend']:
+            converter_kwargs['backend'] = options['backend']
+        if self.memory_budget is not None:
+            converter_kwargs['memory_budget'] = self.memory_budget
+        if options['passthrough']:
+            converter_kwargs['passthrough'] = True
+        if options['encoder_profile']:
+            converter_kwargs['encoder_profile'] = options['encoder_profile']
+        if options['lossless']:
+            converter_kwargs['lossless'] = True
+        if options['color_mode'] != "rgb":
+            converter_kwargs['color_mode'] = options['color_mode']
+            converter_kwargs['threshold'] = options['threshold']
+            converter_kwargs['dither'] = options['dither']
+
+        if job.cancel_requested.is_set():
+            raise JobCancelled("작업이 취소되었습니다.")
+
+        # 디렉토리 출력은 작업 프로세스가 직접 쓰고, 메모리/아카이브 결과는 큐로 받아 여기서 기록
+        output_dir = str(job.sink.output_dir) if isinstance(job.sink, DirectorySink) else None
+        events = self._manager.Queue()
+        executor = self._executor
+        try:
+            future = executor.submit(
+                _convert_job, self.converter_factory, converter_kwargs, job.source, output_dir,
+                options, job.name, events, job.cancel_requested
+            )
+            while True:
+                finished = future.done()
+                try:
+                    message = events.get(timeout=EVENT_POLL_INTERVAL)
+                except queue.Empty:
+                    # 작업 프로세스는 끝나기 전에 모든 이벤트를 보내므로, 끝난 뒤 큐가 비면 종료
+                    if finished:
+                        break
+                    continue
+                if message[0] == 'page':
+                    self._loop.call_soon_threadsafe(self._on_page, job, *message[1:])
+                else:
+                    _, name, data = message
+                    job.sink.write(name, data)
+            output_files, job.downscaled_pages, job.extracted_pages = future.result()
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise RuntimeError("변환 프로세스가 비정상 종료되었습니다.")
+        finally:
+            job.sink.close()
+
+        if isinstance(job.sink, ArchiveSink):
+            job.archive_data = job.sink.output.getvalue()
+            job.sink.output.close()
+        return output_files
+
+    def _replace_executor(self, broken: ProcessPoolExecutor):
+        """비정상 종료된 작업 프로세스 풀을 새 풀로 바꿉니다. (같은 풀의 다른 작업이 이미 바꿨으면 그대로 둠)"""
+        with self._executor_lock:
+            if self._executor is broken:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self.logger.warning("변환 프로세스 풀을 다시 시작합니다.")
+        broken.shutdown(wait=False)
+
+    def _on_page(self, job: ConversionJob, page_num: int, completed: int, total: int):
+        job.completed_pages = completed
+        job.total_pages = total
+        self._publish(job, {'type': 'page', 'page': page_num, 'completed': completed, 'total': total})
+
+    def _finish(self, job: ConversionJob, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        event = {'type': 'status', 'status': status}
+        if job.error:
+            event['error'] = job.error
+        self._publish(job, event)
+
+        elapsed = job.finished_at - (job.started_at or job.created_at)
+        self.logger.info(f"작업 {status}: {job.job_id} ({job.completed_pages}페이지, {elapsed:.2f}초)")
+        self._prune_finished_jobs()
+
+    def _publish(self, job: ConversionJob, event: dict):
+        """이벤트를 기록하고 기다리는 구독자를 깨웁니다. (이벤트 루프 스레드에서 호출)"""
+        job.events.append(event)
+        changed, job.changed = job.changed, asyncio.Event()
+        changed.set()
+
+    def _prune_finished_jobs(self):
+        """보관 한도를 넘은 오래된 완료 작업을 삭제합니다."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            self.remove_job(job_id)
+
+
+class _QueueSink(OutputSink):
+    """작업 프로세스에서 결과 이미지를 이벤트 큐로 보내는 sink (서비스 쪽에서 실제 sink에 기록)"""
+
+    def __init__(self, events):
+        self.events = events
+
+    def write(self, name: str, data: ImageData) -> str:
+        # memoryview는 피클할 수 없으므로 bytes로 보냄
+        self.events.put(('output', name, bytes(data)))
+        return name
+
+
+def _convert_job(
+    converter_factory: Callable[..., PDFConverter],
+    converter_kwargs: dict,
+    source: Union[Path, bytes],
+    output_dir: Optional[str],
+    options: dict,
+    name: str,
+    events,
+    cancel_requested
+) -> Tuple[List[str], List[dict], List[int]]:
+    """
+    작업 프로세스에서 실행: 변환하면서 페이지마다 진행 이벤트를 보내고 취소 여부를 확인합니다.
+
+    Returns:
+        (출력 파일명 목록, DPI를 낮춘 페이지의 처리 결과, 내장 이미지를 그대로 쓴 페이지 번호)
+    """
+    converter = converter_factory(**converter_kwargs)
+    sink = DirectorySink(output_dir) if output_dir is not None else _QueueSink(events)
+
+    def on_progress(page_num: int, completed: int, total: int):
+        events.put(('page', page_num, completed, total))
+        if cancel_requested.is_set():
+            raise JobCancelled("작업이 취소되었습니다.")
+
+    try:
+        output_files = converter.convert_to_sink(
+            source, sink, options['output_format'], options['dpi'],
+            options['first_page'], options['last_page'],
+            single_image=options['single_image'], streaming=options['streaming'],
+            name=name, progress=on_progress
+        )
+    except JobCancelled:
+        raise
+    except Exception as e:
+        # PyMuPDF 예외처럼 서비스 프로세스로 피클할 수 없는 예외가 있으므로 메시지만 전달
+        raise RuntimeError(str(e)) from None
+    finally:
+        sink.close()
+
+    downscaled_pages = [
+        report for report in converter.budget_reports.values() if report['action'] == "downscaled"
+    ]
+    return output_files, downscaled_pages, list(converter.extracted_pages)
+
+
+class LocalConversionService:
+    """
+    ConversionService를 백그라운드 스레드의 이벤트 루프에서 실행하는 동기 클라이언트
+
+    Streamlit처럼 요청마다 스크립트가 다시 실행되는 환경에서 작업을 등록하고
+    get_job으로 진행 상황을 조회(폴링)하는 용도입니다.
+    """
+
+    def __init__(self, **service_options):
+        """service_options는 ConversionService에 그대로 전달됩니다."""
+        self.service = ConversionService(**service_options)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="conversion-service", daemon=True
+        )
+        self._thread.start()
+        self._call(self.service.start())
+
+    def _call(self, coroutine, timeout: Optional[float] = None):
+        """이벤트 루프 스레드에서 코루틴을 실행하고 결과를 기다립니다."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    async def _run(self, func, *args):
+        return func(*args)
+
+    def submit(self, source: Union[str, Path, bytes], **options) -> str:
+        """작업을 등록하고 작업 ID를 반환합니다. (옵션은 ConversionService.submit 참고)"""
+        return self._call(self.service.submit(source, **options))
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """작업 상태를 반환합니다. 없는 작업이면 None"""
+        return self._call(self._run(self.service.get_job, job_id))
+
+    def get_outputs(self, job_id: str) -> List[Tuple[str, ImageData]]:
+        """메모리에 보관한 결과를 (파일명, 이미지 바이트) 목록으로 반환합니다."""
+        return self._call(self._run(self.service.get_outputs, job_id))
+
+    def get_archive(self, job_id: str) -> Optional[bytes]:
+        """archive 옵션으로 완료한 작업의 아카이브 바이트를 반환합니다."""
+        return self._call(self._run(self.service.get_archive, job_id))
+
+    def list_jobs(self) -> List[dict]:
+        return self._call(self._run(self.service.list_jobs))
+
+    def cancel(self, job_id: str) -> bool:
+        return self._call(self._run(self.service.cancel, job_id))
+
+    def remove_job(self, job_id: str) -> bool:
+        return self._call(self._run(self.service.remove_job, job_id))
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> dict:
+        """작업이 끝날 때까지 기다린 뒤 상태를 반환합니다."""
+        return self._call(self.service.wait(job_id, timeout))
+
+    def close(self):
+        """서비스를 종료하고 이벤트 루프 스레드를 멈춥니다."""
+        self._call(self.service.stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,226 @@
+"""
+열린 PDF 문서 핸들 풀
+
+PyMuPDF로 문서를 열면 xref와 페이지 트리를 파싱하므로, 같은 문서를 정보 조회, 렌더링,
+썸네일, Streamlit 재실행마다 다시 여는 비용이 큽니다. DocumentPool은 닫지 않은 문서 핸들을
+파일 경로+수정 시각+크기 또는 PDF 바이트의 내용 해시를 키로 보관하여 재사용합니다.
+
+핸들은 빌려 쓰고(checkout) 돌려주며, 사용 중인 핸들은 다른 요청에 주지 않습니다. 같은 문서를
+동시에 요청하면 핸들을 하나 더 엽니다. 쉬고 있는 핸들은 최근 사용 순(LRU)으로 문서 수와
+원본 크기 합계 상한을 넘으면 닫습니다.
+
+풀이 보호하는 것은 풀 자체의 장부(어느 핸들이 사용 중인지)뿐입니다. MuPDF는 전역 컨텍스트와
+저장소를 모든 핸들이 공유하므로, 핸들이 달라도 여러 스레드에서 동시에 MuPDF를 호출하면 안전하지
+않습니다. 스레드 사이의 MuPDF 호출은 mupdf_lock으로 하나씩 실행하고, 동시에 변환하려면 프로세스를
+나누어야 합니다 (변환 서비스와 병렬 렌더링은 프로세스를 사용).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# 쉬고 있는 핸들을 포함해 보관할 최대 문서 수
+MAX_DOCUMENTS = 16
+# 보관할 문서 원본 크기 합계 상한 (바이트 입력은 핸들이 원본을 계속 참조함)
+MAX_SOURCE_BYTES = 512 * 1024 * 1024
+
+# 풀 키: ("path", 절대 경로, 수정 시각, 크기) 또는 ("sha256", 내용 해시, 크기)
+PoolKey = Tuple
+
+
+class DocumentPool:
+    """
+    PyMuPDF 문서 핸들 LRU 풀
+
+    checkout으로 빌린 핸들은 반드시 release로 돌려주어야 하며, 보통은 document 컨텍스트
+    매니저를 사용합니다. 돌려받은 핸들은 상한을 넘지 않는 한 닫지 않고 다음 요청에 재사용합니다.
+    빌려주기/돌려받기는 여러 스레드에서 호출해도 되지만, 빌린 핸들로 MuPDF를 호출하는 것까지
+    스레드 안전해지지는 않습니다 (모듈 설명 참고).
+    """
+
+    def __init__(self, max_documents: int = MAX_DOCUMENTS, max_source_bytes: int = MAX_SOURCE_BYTES):
+        """
+        Args:
+            max_documents: 보관할 최대 문서 핸들 수 (사용 중인 핸들 포함)
+            max_source_bytes: 보관할 문서 원본 크기 합계 상한
+        """
+        self.max_documents = max_documents
+        self.max_source_bytes = max_source_bytes
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # 키 -> 쉬고 있는 핸들 목록, 최근 돌려받은 키가 뒤
+        self._idle: "OrderedDict[PoolKey, List[fitz.Document]]" = OrderedDict()
+        # id(핸들) -> (키, 원본 크기), 사용 중인 핸들
+        self._in_use: Dict[int, Tuple[PoolKey, int]] = {}
+        self._closed = False
+
+    @staticmethod
+    def key_for(source: Union[str, Path, bytes]) -> PoolKey:
+        """문서 원본의 풀 키를 만듭니다. 파일이 바뀌면 키도 바뀝니다."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return ("sha256", hashlib.sha256(source).hexdigest(), len(source))
+
+        pdf_path = Path(source)
+        stat = pdf_path.stat()
+        return ("path", str(pdf_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def checkout(self, source: Union[str, Path, bytes]) -> "fitz.Document":
+        """
+        문서 핸들을 빌립니다. 쉬고 있는 핸들이 없으면 새로 엽니다.
+
+        Raises:
+            FileNotFoundError: 파일이 없는 경우
+        """
+        if fitz is None:
+            raise ImportError("PyMuPDF가 설치되지 않았습니다. pip install PyMuPDF를 실행해주세요.")
+        if not isinstance(source, (bytes, bytearray, memoryview)) and not Path(source).exists():
+            raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {source}")
+
+        key = self.key_for(source)
+        with self._lock:
+            handles = self._idle.get(key)
+            if handles:
+                pdf_document = handles.pop()
+                if not handles:
+                    del self._idle[key]
+                self._in_use[id(pdf_document)] = (key, key[-1])
+                self.hits += 1
+                return pdf_document
+            self.misses += 1
+
+        # 파싱은 잠금 밖에서 (다른 문서 요청을 막지 않도록)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            pdf_document = fitz.open(stream=bytes(source), filetype="pdf")
+        else:
+            pdf_document = fitz.open(str(source))
+
+        with self._lock:
+            self._in_use[id(pdf_document)] = (key, key[-1])
+            evicted = self._evict()
+        self._close_all(evicted)
+        return pdf_document
+
+    def release(self, pdf_document: "fitz.Document"):
+        """빌린 핸들을 돌려줍니다. 풀이 닫혔거나 상한을 넘으면 핸들을 닫습니다."""
+        with self._lock:
+            entry = self._in_use.pop(id(pdf_document), None)
+            if entry is None or self._closed or pdf_document.is_closed:
+                evicted = [] if pdf_document.is_closed else [pdf_document]
+            else:
+                key = entry[0]
+                self._idle.setdefault(key, []).append(pdf_document)
+                self._idle.move_to_end(key)
+                evicted = self._evict()
+        self._close_all(evicted)
+
+    @contextmanager
+    def document(self, source: Union[str, Path, bytes]) -> Iterator["fitz.Document"]:
+        """with 블록 동안 문서 핸들을 빌려 씁니다."""
+        pdf_document = self.checkout(source)
+        try:
+            yield pdf_document
+        finally:
+            self.release(pdf_document)
+
+    def trim(self, max_documents: int = 0):
+        """
+        쉬고 있는 핸들을 max_documents개만 남기고 닫습니다.
+
+        메모리가 부족할 때 호출하면 MuPDF의 전역 저장소(글꼴, 이미지 캐시)도 함께 비웁니다.
+        """
+        with self._lock:
+            evicted = self._evict(max_documents=max_documents)
+        self._close_all(evicted)
+        if max_documents == 0 and fitz is not None:
+            fitz.TOOLS.store_shrink(100)
+
+    def stats(self) -> dict:
+        """적중/미스 횟수와 보관 중인 핸들 수를 반환합니다."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'idle': sum(len(handles) for handles in self._idle.values()),
+                'in_use': len(self._in_use),
+                'source_bytes': self._source_bytes()
+            }
+
+    def close(self):
+        """쉬고 있는 핸들을 모두 닫습니다. 사용 중인 핸들은 돌려받을 때 닫습니다."""
+        with self._lock:
+            self._closed = True
+            evicted = [handle for handles in self._idle.values() for handle in handles]
+            self._idle.clear()
+        self._close_all(evicted)
+
+    def _source_bytes(self) -> int:
+        idle_bytes = sum(key[-1] * len(handles) for key, handles in self._idle.items())
+        return idle_bytes + sum(size for _, size in self._in_use.values())
+
+    def _evict(self, max_documents: int = None) -> List["fitz.Document"]:
+        """상한을 넘으면 가장 오래 쉰 핸들부터 풀에서 빼서 반환합니다. (잠금 안에서 호출)"""
+        if max_documents is None:
+            max_documents = self.max_documents
+        evicted = []
+        count = sum(len(handles) for handles in self._idle.values()) + len(self._in_use)
+        source_bytes = self._source_bytes()
+        while self._idle and (count > max_documents or source_bytes > self.max_source_bytes):
+            key, handles = next(iter(self._idle.items()))
+            evicted.append(handles.pop(0))
+            if not handles:
+                del self._idle[key]
+            count -= 1
+            source_bytes -= key[-1]
+        return evicted
+
+    def _reset_after_fork(self):
+        """
+        fork된 자식 프로세스에서 부모의 핸들을 버립니다.
+
+        부모와 파일 위치를 공유하는 핸들을 자식이 쓰면 읽기가 섞일 수 있으므로 닫지도 않고
+        참조만 버립니다 (메모리는 복사되지 않은 채로 남음).
+        """
+        self._lock = threading.Lock()
+        self._idle = OrderedDict()
+        self._in_use = {}
+
+    def _close_all(self, documents: List["fitz.Document"]):
+        # 닫기는 잠금 밖에서
+        for pdf_document in documents:
+            try:
+                pdf_document.close()
+            except Exception as e:
+                self.logger.debug(f"문서 핸들 닫기 실패: {e}")
+
+
+# 변환기, 문서 정보 조회, 썸네일이 함께 쓰는 프로세스 전역 풀
+document_pool = DocumentPool()
+
+# 한 프로세스 안의 여러 스레드가 MuPDF를 쓸 때 호출을 하나씩 실행하는 잠금.
+# MuPDF는 전역 컨텍스트와 저장소를 공유하므로 핸들이 달라도 동시에 호출하면 안전하지 않음.
+# 변환은 프로세스(변환 서비스 작업 프로세스, 병렬 렌더링 워커)에서 스레드 하나로 실행하므로 잠그지 않고,
+# Streamlit 세션 스레드와 썸네일 미리 렌더링 스레드처럼 같은 프로세스에서 동시에 MuPDF를 쓰는 곳만 잠금.
+mupdf_lock = threading.RLock()
+
+
+def _reset_after_fork():
+    # fork 순간 다른 스레드가 잡고 있던 잠금은 자식에서 풀린 상태로 되돌림
+    mupdf_lock._at_fork_reinit()
+    document_pool._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    # 병렬 렌더링 워커(fork)는 부모의 핸들을 물려받지 않고 새로 엶
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,70 @@
+"""
+렌더링 → 인코딩 → 쓰기 파이프라인
+
+300 DPI 페이지 하나를 PNG로 압축하는 시간은 래스터화보다 몇 배 깁니다. 렌더링 루프에서 바로
+저장하면 압축하는 동안 다음 페이지를 렌더링하지 못하므로, pipelined_map은 렌더링한 페이지를
+스레드 풀에 넘겨 인코딩/쓰기하고 호출한 스레드는 바로 다음 페이지를 렌더링합니다.
+Pillow는 압축(zlib, libjpeg) 중에 GIL을 놓으므로 인코딩 스레드가 CPU 코어 수만큼 동시에 돕니다.
+
+동시에 처리 중인 페이지는 max_pending개로 제한되어(백프레셔), 인코딩이 렌더링보다 느리면
+렌더링이 기다리므로 메모리에는 최대 max_pending + 1개 페이지의 래스터만 올라갑니다.
+결과는 항상 입력 순서대로 반환합니다.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+# 기본 인코딩 스레드 수 (코어가 하나면 파이프라인을 쓰지 않음)
+DEFAULT_ENCODE_WORKERS = min(4, os.cpu_count() or 1)
+
+T = TypeVar("T")
+
+
+def pipelined_map(
+    func: Callable[..., T],
+    items: Iterable[tuple],
+    workers: int = DEFAULT_ENCODE_WORKERS,
+    max_pending: Optional[int] = None
+) -> Iterator[T]:
+    """
+    items의 각 튜플을 func(*item)으로 스레드 풀에서 처리하여 입력 순서대로 반환합니다.
+
+    items는 호출한 스레드에서 하나씩 꺼내므로 렌더링 제너레이터를 그대로 넘길 수 있습니다.
+    workers가 1 이하이거나 항목이 하나뿐이면 스레드 없이 차례로 처리합니다.
+
+    Args:
+        func: 인코딩/쓰기 함수 (스레드에서 실행되므로 스레드 안전해야 함)
+        items: func에 넘길 인자 튜플 (예: (페이지 번호, 이미지))
+        workers: 인코딩 스레드 수
+        max_pending: 동시에 처리 중일 수 있는 최대 항목 수 (기본값: workers의 두 배)
+    """
+    items = iter(items)
+    if workers > 1:
+        # 항목이 하나뿐이면(페이지 하나 변환) 스레드 풀을 만들지 않음
+        head = list(islice(items, 2))
+        items = chain(head, items)
+        if len(head) < 2:
+            workers = 1
+    if workers <= 1:
+        for item in items:
+            yield func(*item)
+        return
+
+    max_pending = max_pending or workers * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="encode") as executor:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(func, *item))
+                # 처리 중인 항목이 가득 차면 가장 오래된 결과를 기다림 (그동안 렌더링 중단)
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # 중간에 멈추면(예외, 취소) 아직 시작하지 않은 작업은 버림
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,171 @@
+"""
+페이지 이미지 저장(인코딩) 공통 모듈
+
+인코더 설정은 이름 붙은 프로필(fast, balanced, archival)로 고릅니다. 300 DPI 페이지는 PNG 압축이
+래스터화보다 몇 배 오래 걸리므로, fast는 파일 크기를 조금 포기하고 압축 시간을 줄입니다.
+
+- fast: PNG 압축 레벨 1, JPEG 품질 85, TIFF PackBits, WebP 품질 80/method 0, AVIF 품질 60/speed 10
+- balanced(기본값): PNG 압축 레벨 6, JPEG 품질 95, TIFF Deflate, WebP 품질 85/method 4,
+  AVIF 품질 70/speed 8
+- archival: PNG 압축 레벨 9 + optimize, JPEG 품질 95 + 4:4:4 + progressive + optimize, TIFF Deflate,
+  WebP 품질 90/method 6, AVIF 품질 80/speed 6
+
+WebP의 method(0~6)와 AVIF의 speed(0~10, 클수록 빠름)는 압축에 들이는 노력입니다.
+lossless=True이면 WebP를 무손실로 저장하며, 이때 quality는 화질이 아니라 압축 노력입니다
+(LOSSLESS_PROFILES). 텍스트 페이지는 무손실 WebP가 PNG보다 훨씬 작습니다.
+AVIF 인코더는 페이지 하나를 여러 스레드로 인코딩하고(max_threads, 기본값: CPU 코어 수),
+WebP를 포함한 모든 인코더는 인코딩 중 GIL을 놓으므로 encode_pipeline의 스레드로 페이지를 겹쳐 인코딩합니다.
+WebP와 AVIF는 Pillow가 해당 코덱과 함께 빌드된 경우에만 사용할 수 있습니다 (supported_formats).
+1비트(bilevel) 이미지는 프로필과 관계없이 TIFF를 CCITT Group 4로 압축합니다.
+"""
+
+import io
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from PIL import Image, features
+
+# JPEG 저장 품질 (balanced 프로필)
+JPEG_QUALITY = 95
+
+# 프로필 이름 -> 형식 -> Pillow save 옵션
+ENCODER_PROFILES: Dict[str, Dict[str, dict]] = {
+    "fast": {
+        "PNG": {"compress_level": 1},
+        "JPEG": {"quality": 85},
+        "TIFF": {"compression": "packbits"},
+        "WEBP": {"quality": 80, "method": 0},
+        "AVIF": {"quality": 60, "speed": 10},
+    },
+    "balanced": {
+        "PNG": {"compress_level": 6},
+        "JPEG": {"quality": JPEG_QUALITY},
+        "TIFF": {"compression": "tiff_adobe_deflate"},
+        "WEBP": {"quality": 85, "method": 4},
+        "AVIF": {"quality": 70, "speed": 8},
+    },
+    "archival": {
+        "PNG": {"compress_level": 9, "optimize": True},
+        "JPEG": {"quality": JPEG_QUALITY, "subsampling": 0, "progressive": True, "optimize": True},
+        "TIFF": {"compression": "tiff_adobe_deflate"},
+        "WEBP": {"quality": 90, "method": 6},
+        "AVIF": {"quality": 80, "speed": 6},
+    },
+}
+
+# lossless=True일 때의 설정 (무손실 WebP에서 quality는 압축 노력).
+# quality 100 + method 6은 300 DPI 페이지 하나에 20초 넘게 걸리므로 쓰지 않음
+LOSSLESS_PROFILES: Dict[str, Dict[str, dict]] = {
+    "fast": {"WEBP": {"lossless": True, "quality": 25, "method": 1}},
+    "balanced": {"WEBP": {"lossless": True, "quality": 70, "method": 3}},
+    "archival": {"WEBP": {"lossless": True, "quality": 90, "method": 6}},
+}
+
+DEFAULT_PROFILE = "balanced"
+
+# 1비트 이미지의 TIFF 압축 (팩스용 CCITT Group 4, Deflate보다 훨씬 작음)
+BILEVEL_TIFF_COMPRESSION = "group4"
+
+# 출력할 수 있는 형식 (WEBP, AVIF는 Pillow 빌드에 따라 빠질 수 있음)
+OUTPUT_FORMATS = ["PNG", "JPEG", "TIFF", "BMP", "GIF", "WEBP", "AVIF"]
+
+# Pillow 기능 이름이 필요한 형식
+_FORMAT_FEATURES = {"WEBP": "webp", "AVIF": "avif"}
+
+# 형식별 최대 가로/세로 픽셀 수
+MAX_DIMENSIONS = {"WEBP": 16383}
+
+MIME_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "TIFF": "image/tiff",
+    "BMP": "image/bmp",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+    "AVIF": "image/avif",
+}
+
+
+def normalize_format(output_format: str) -> str:
+    """출력 형식 이름을 Pillow 형식 이름으로 정규화합니다. (JPG -> JPEG)"""
+    output_format = output_format.upper()
+    return "JPEG" if output_format == "JPG" else output_format
+
+
+def supported_formats() -> List[str]:
+    """현재 Pillow 빌드로 출력할 수 있는 형식"""
+    return [
+        output_format for output_format in OUTPUT_FORMATS
+        if output_format not in _FORMAT_FEATURES or features.check(_FORMAT_FEATURES[output_format])
+    ]
+
+
+def mime_type(output_format: str) -> str:
+    """출력 형식의 MIME 타입"""
+    return MIME_TYPES.get(normalize_format(output_format), "application/octet-stream")
+
+
+def max_dimension(output_format: str) -> Optional[int]:
+    """출력 형식이 저장할 수 있는 최대 가로/세로 픽셀 수 (제한이 없으면 None)"""
+    return MAX_DIMENSIONS.get(normalize_format(output_format))
+
+
+def encoder_options(
+    output_format: str,
+    profile: str = DEFAULT_PROFILE,
+    lossless: bool = False,
+    mode: Optional[str] = None
+) -> dict:
+    """
+    프로필에서 출력 형식의 Pillow save 옵션을 반환합니다. 프로필에 없는 형식은 빈 옵션입니다.
+    lossless는 무손실 설정이 있는 형식(WebP)에만 적용되며, 나머지 형식에서는 무시합니다.
+    mode는 저장할 이미지의 모드이며, 1비트("1") TIFF는 CCITT Group 4로 압축합니다.
+
+    Raises:
+        ValueError: 알 수 없는 프로필인 경우
+    """
+    if profile not in ENCODER_PROFILES:
+        raise ValueError(
+            f"알 수 없는 인코더 프로필입니다: {profile} (사용 가능: {', '.join(ENCODER_PROFILES)})"
+        )
+    output_format = normalize_format(output_format)
+    if mode == "1" and output_format == "TIFF":
+        return {"compression": BILEVEL_TIFF_COMPRESSION}
+    if lossless and output_format in LOSSLESS_PROFILES[profile]:
+        return dict(LOSSLESS_PROFILES[profile][output_format])
+    return dict(ENCODER_PROFILES[profile].get(output_format, {}))
+
+
+def save_image(
+    image: Image.Image,
+    output_path: Union[str, Path, BinaryIO],
+    output_format: str,
+    profile: str = DEFAULT_PROFILE,
+    lossless: bool = False
+):
+    """
+    출력 형식과 인코더 프로필에 맞춰 이미지를 저장합니다.
+    output_path는 파일 경로 또는 바이너리 파일 객체입니다.
+    """
+    output_format = normalize_format(output_format)
+    options = encoder_options(output_format, profile, lossless, image.mode)
+
+    if output_format == "JPEG":
+        # JPEG는 RGB 또는 그레이스케일 모드 필요
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGB')
+        elif image.mode == '1':
+            image = image.convert('L')
+    image.save(output_path, output_format, **options)
+
+
+def encode_image(
+    image: Image.Image,
+    output_format: str,
+    profile: str = DEFAULT_PROFILE,
+    lossless: bool = False
+) -> memoryview:
+    """이미지를 출력 형식으로 인코딩한 바이트를 복사 없이 memoryview로 반환합니다."""
+    buffer = io.BytesIO()
+    save_image(image, buffer, output_format, profile, lossless)
+    return buffer.getbuffer()
@@ -0,0 +1,191 @@
+"""
+스캔 페이지의 내장 이미지 그대로 추출하기 (passthrough)
+
+페이지 하나에 스캔 이미지 한 장만 들어 있는 PDF를 요청한 DPI로 렌더링하면 이미 압축된
+JPEG를 다시 리샘플링하고 다시 인코딩합니다. PassthroughBackend는 페이지의 내용이 페이지 전체를
+덮는 이미지 하나뿐이고 그 이미지의 형식이 출력 형식과 같으면, 렌더링하지 않고 PDF 안의 이미지
+스트림을 그대로 꺼내 씁니다 (CPU를 거의 쓰지 않고 화질 손실이 없음). 그 밖의 페이지는 감싼
+백엔드로 렌더링합니다.
+
+추출한 이미지는 요청한 DPI가 아니라 스캔 원본 해상도입니다. 단일 이미지 결합처럼 페이지 픽셀
+크기가 미리 정해져야 하는 경로(iter_pages, page_pixel_sizes)는 항상 렌더링합니다.
+그레이스케일로 렌더링할 때는 그레이스케일 이미지만 꺼내고, 1비트(bilevel)일 때는 항상 렌더링합니다.
+"""
+
+import logging
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from document_pool import document_pool
+from image_encoding import normalize_format
+from render_backends import PDFSource, RenderBackend, fitz
+
+# 이미지가 페이지를 덮는다고 볼 가장자리 오차 (포인트)
+PAGE_TOLERANCE = 1.0
+
+# extract_image의 ext -> 출력 형식
+_EXTRACT_FORMATS = {"jpeg": "JPEG", "jpg": "JPEG", "png": "PNG", "tiff": "TIFF"}
+
+# 렌더링 색 공간 -> 그대로 꺼낼 수 있는 이미지의 색 성분 수
+_EXTRACT_COLORSPACES = {"rgb": (1, 3), "gray": (1,), "bilevel": ()}
+
+
+def page_image_only(page: "fitz.Page") -> Optional[int]:
+    """
+    페이지 내용이 페이지 전체를 덮는 이미지 하나뿐이면 그 이미지의 xref를 반환합니다.
+
+    OCR 결과처럼 보이지 않는 텍스트(렌더링 모드 3)는 렌더링 결과에 영향을 주지 않으므로 허용하고,
+    회전/뒤집기, 마스크, 보이는 텍스트, 벡터 그림, 주석이 있으면 None을 반환합니다.
+    """
+    if page.rotation or page.first_annot is not None:
+        return None
+
+    infos = page.get_image_info(xrefs=True)
+    if len(infos) != 1:
+        return None
+    info = infos[0]
+    # xref 0은 인라인 이미지 (스트림을 따로 꺼낼 수 없음)
+    if not info['xref'] or info['has-mask']:
+        return None
+
+    a, b, c, d, _, _ = info['transform']
+    if b or c or a <= 0 or d <= 0:
+        return None
+    bbox, rect = fitz.Rect(info['bbox']), page.rect
+    if any(abs(edge - page_edge) > PAGE_TOLERANCE for edge, page_edge in zip(bbox, rect)):
+        return None
+
+    if any(span['type'] != 3 for span in page.get_texttrace()):
+        return None
+    if page.get_drawings():
+        return None
+    return info['xref']
+
+
+def extract_page_image(page: "fitz.Page", output_format: str, color_mode: str = "rgb") -> Optional[bytes]:
+    """
+    페이지가 이미지 한 장뿐이고 그 이미지를 output_format으로 그대로 꺼낼 수 있으면 이미지 바이트를,
+    아니면 None을 반환합니다. CMYK 등 화면에 그대로 쓰기 어려운 색 공간이나 렌더링 색 공간(color_mode)과
+    맞지 않는 이미지는 렌더링하도록 None입니다.
+    """
+    if not _EXTRACT_COLORSPACES[color_mode]:
+        return None
+    xref = page_image_only(page)
+    if xref is None:
+        return None
+
+    extracted = page.parent.extract_image(xref)
+    if not extracted or extracted.get('smask'):
+        return None
+    if extracted['colorspace'] not in _EXTRACT_COLORSPACES[color_mode]:
+        return None
+    if _EXTRACT_FORMATS.get(extracted['ext']) != normalize_format(output_format):
+        return None
+    return extracted['image']
+
+
+class PassthroughBackend(RenderBackend):
+    """
+    이미지 한 장뿐인 페이지는 내장 이미지를 그대로 꺼내고, 나머지는 감싼 백엔드로 렌더링하는 백엔드
+
+    save_pages/encode_pages에만 적용되며, 그대로 꺼낸 페이지 번호는 extracted에 남습니다.
+    """
+
+    def __init__(self, backend: RenderBackend):
+        self.backend = backend
+        # 렌더링하지 않고 내장 이미지를 그대로 쓴 페이지 번호
+        self.extracted: List[int] = []
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def name(self) -> str:
+        # 렌더링한 결과와 캐시 항목이 섞이지 않도록 이름을 구분
+        return f"{self.backend.name}+passthrough"
+
+    @property
+    def color_mode(self) -> str:
+        return self.backend.color_mode
+
+    def render_page(self, pdf_path: PDFSource, page_num: int, dpi: int) -> Image.Image:
+        return self.backend.render_page(pdf_path, page_num, dpi)
+
+    def iter_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        return self.backend.iter_pages(pdf_path, page_nums, dpi)
+
+    def save_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str,
+        output_path_for: Callable[[int], Path]
+    ) -> Iterator[Tuple[int, str]]:
+        def write(page_num: int, data: bytes) -> Tuple[int, str]:
+            output_path = output_path_for(page_num)
+            with open(output_path, "wb") as f:
+                f.write(data)
+            return page_num, str(output_path)
+
+        return self._passthrough(
+            pdf_path, page_nums, output_format,
+            lambda run: self.backend.save_pages(pdf_path, run, dpi, output_format, output_path_for),
+            write
+        )
+
+    def encode_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str
+    ) -> Iterator[Tuple[int, Union[bytes, memoryview]]]:
+        return self._passthrough(
+            pdf_path, page_nums, output_format,
+            lambda run: self.backend.encode_pages(pdf_path, run, dpi, output_format),
+            lambda page_num, data: (page_num, data)
+        )
+
+    def effective_dpi(self, pdf_path: PDFSource, page_num: int, dpi: int) -> int:
+        return self.backend.effective_dpi(pdf_path, page_num, dpi)
+
+    def page_pixel_sizes(self, pdf_path: PDFSource, dpi: int) -> List[Tuple[int, int]]:
+        return self.backend.page_pixel_sizes(pdf_path, dpi)
+
+    def _passthrough(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        output_format: str,
+        render: Callable[[List[int]], Iterator[tuple]],
+        write: Callable[[int, bytes], tuple]
+    ) -> Iterator[tuple]:
+        """
+        페이지 순서를 유지하면서 그대로 꺼낼 수 있는 페이지는 write로, 연속된 나머지 페이지는
+        한 번에 render로 처리합니다.
+        """
+        if fitz is None:
+            yield from render(list(page_nums))
+            return
+
+        pending: List[int] = []
+        with document_pool.document(pdf_path) as pdf_document:
+            for page_num in page_nums:
+                data = extract_page_image(pdf_document[page_num - 1], output_format, self.color_mode)
+                if data is None:
+                    pending.append(page_num)
+                    continue
+                if pending:
+                    yield from render(pending)
+                    pending = []
+                self.extracted.append(page_num)
+                self.logger.info(f"페이지 {page_num}: 내장 이미지를 그대로 사용합니다 ({len(data)} bytes)")
+                yield write(page_num, data)
+        if pending:
+            yield from render(pending)
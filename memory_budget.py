@@ -0,0 +1,338 @@
+"""
+페이지 래스터 메모리 예산
+
+렌더링하기 전에 페이지 크기(포인트)와 DPI로 래스터 크기를 예측하고, 상한을 넘는 페이지는
+DPI를 낮추거나(downscale), 원래 해상도로 타일 단위로 렌더링하거나(tile), 렌더링을 거부합니다(error).
+A0 도면을 600 DPI로 렌더링하는 것처럼 수억 픽셀짜리 래스터 하나가 워커 메모리를 모두 쓰는 일을
+막기 위한 것입니다.
+
+BudgetedBackend는 기존 백엔드를 감싸 페이지마다 조정한 DPI로 렌더링하므로
+변환기의 저장/인코딩/결합 경로를 그대로 사용할 수 있습니다.
+"""
+
+import io
+import logging
+import math
+from itertools import groupby
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from document_pool import document_pool
+from image_encoding import DEFAULT_PROFILE, normalize_format
+from pdf_info import get_page_sizes
+from render_backends import PDFSource, RenderBackend
+from tiled_render import DEFAULT_TILE_SIZE, TILED_FORMATS, TiledPageRenderer, tile_compress_level
+
+# 색상 모드 -> 렌더링한 래스터 한 픽셀의 바이트 수 (gray/bilevel은 그레이스케일로 렌더링)
+BYTES_PER_PIXEL = {"rgb": 3, "gray": 1, "bilevel": 1}
+
+# 상한을 넘는 페이지 처리 방식
+OVERSIZE_POLICIES = ("downscale", "tile", "error")
+
+
+class PageTooLargeError(ValueError):
+    """페이지 래스터가 메모리 예산을 넘어 렌더링할 수 없을 때 발생합니다."""
+
+
+class MemoryBudget:
+    """
+    페이지 하나의 래스터 크기 상한
+
+    max_pixels와 max_bytes를 함께 주면 더 작은 쪽이 적용됩니다.
+    max_bytes는 렌더링한 래스터 크기 기준(RGB는 픽셀당 3바이트, gray/bilevel은 그레이스케일로
+    렌더링하므로 1바이트)이며, 인코딩 중 복사본이 생기면 실제 최대 메모리는 이보다 클 수 있습니다.
+    tile 정책은 PNG/TIFF 파일로 저장하거나 인코딩할 때만 사용할 수 있으며
+    (단일 이미지 결합처럼 페이지 전체 이미지가 필요한 경로는 PageTooLargeError),
+    타일 하나가 상한을 넘지 않도록 tile_size를 줄여 적용합니다. 타일은 RGB 또는 8비트
+    그레이스케일로 기록하므로 1비트 흑백(bilevel)은 타일 렌더링할 수 없습니다 (PageTooLargeError).
+    """
+
+    def __init__(
+        self,
+        max_pixels: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = "downscale",
+        tile_size: int = DEFAULT_TILE_SIZE,
+        tile_workers: int = 1
+    ):
+        """
+        Args:
+            max_pixels: 페이지 하나의 최대 픽셀 수 (너비 x 높이)
+            max_bytes: 페이지 하나의 최대 래스터 바이트 수
+            policy: 상한을 넘을 때 "downscale"(DPI를 낮춤), "tile"(타일 렌더링)
+                또는 "error"(렌더링 거부)
+            tile_size: tile 정책의 타일 한 변의 픽셀 수 (16의 배수)
+            tile_workers: tile 정책에서 타일을 렌더링할 프로세스 수
+        """
+        if max_pixels is None and max_bytes is None:
+            raise ValueError("max_pixels 또는 max_bytes 중 하나는 지정해야 합니다.")
+        if policy not in OVERSIZE_POLICIES:
+            raise ValueError(
+                f"알 수 없는 처리 방식입니다: {policy} (사용 가능: {', '.join(OVERSIZE_POLICIES)})"
+            )
+        self.max_pixels = max_pixels
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.tile_size = tile_size
+        self.tile_workers = tile_workers
+
+    def pixel_limit(self, color_mode: str = "rgb") -> int:
+        """color_mode로 렌더링할 때 적용되는 페이지당 최대 픽셀 수"""
+        limits = []
+        if self.max_pixels is not None:
+            limits.append(self.max_pixels)
+        if self.max_bytes is not None:
+            limits.append(self.max_bytes // BYTES_PER_PIXEL[color_mode])
+        return min(limits)
+
+    def plan_page(
+        self,
+        page_num: int,
+        width_pt: float,
+        height_pt: float,
+        dpi: int,
+        color_mode: str = "rgb"
+    ) -> dict:
+        """
+        페이지 하나를 어떤 DPI로 렌더링할지 정합니다.
+
+        Args:
+            page_num: 페이지 번호 (1부터 시작)
+            width_pt, height_pt: 페이지 크기 (포인트, 회전 반영)
+            dpi: 요청한 해상도
+            color_mode: 렌더링 색상 모드 (max_bytes를 픽셀 수로 바꿀 때 사용)
+
+        Returns:
+            {'page', 'requested_dpi', 'dpi', 'width', 'height', 'pixels', 'action'} 딕셔너리.
+            action은 "ok", "downscaled", "tiled" 중 하나이며 width/height/pixels는 실제 렌더링할 크기입니다.
+
+        Raises:
+            PageTooLargeError: policy가 "error"이고 상한을 넘는 경우, 1 DPI로도 넘는 경우,
+                또는 policy가 "tile"인데 1비트 흑백이라 타일로 렌더링할 수 없는 경우
+        """
+        limit = self.pixel_limit(color_mode)
+        bytes_per_pixel = BYTES_PER_PIXEL[color_mode]
+        width, height = _pixel_size(width_pt, height_pt, dpi)
+        requested_pixels = width * height
+        page_dpi = dpi
+        action = "ok"
+
+        if requested_pixels > limit and self.policy == "tile":
+            if color_mode == "bilevel":
+                raise PageTooLargeError(
+                    f"페이지 {page_num}: {dpi} DPI에서 {width}x{height}px로 페이지당 한도 {limit / 1e6:.1f}MP를 "
+                    f"넘지만, 1비트 흑백은 타일로 렌더링할 수 없습니다. 그레이스케일(gray)로 렌더링하거나 "
+                    f"downscale 정책을 사용해주세요."
+                )
+            action = "tiled"
+        elif requested_pixels > limit:
+            action = "downscaled"
+            if self.policy == "error":
+                raise PageTooLargeError(
+                    f"페이지 {page_num}: {dpi} DPI에서 {width}x{height}px "
+                    f"({requested_pixels / 1e6:.1f}MP, 약 {requested_pixels * bytes_per_pixel / 2**20:.0f}MB)로 "
+                    f"페이지당 한도 {limit / 1e6:.1f}MP를 넘습니다. DPI를 낮추거나 한도를 늘려주세요."
+                )
+            # 픽셀 수는 DPI의 제곱에 비례. 올림 때문에 넘으면 1씩 더 낮춤
+            page_dpi = int(dpi * math.sqrt(limit / requested_pixels))
+            while page_dpi >= 1:
+                width, height = _pixel_size(width_pt, height_pt, page_dpi)
+                if width * height <= limit:
+                    break
+                page_dpi -= 1
+            if page_dpi < 1:
+                raise PageTooLargeError(
+                    f"페이지 {page_num}: 1 DPI로도 페이지당 한도 {limit / 1e6:.1f}MP를 넘습니다."
+                )
+
+        return {
+            'page': page_num,
+            'requested_dpi': dpi,
+            'dpi': page_dpi,
+            'width': width,
+            'height': height,
+            'pixels': width * height,
+            'action': action
+        }
+
+    def tile_renderer(self, color_mode: str = "rgb", encoder_profile: str = DEFAULT_PROFILE) -> TiledPageRenderer:
+        """
+        tile 정책에 사용할 렌더러
+
+        타일 하나가 상한을 넘지 않도록 tile_size를 줄이고, 동시에 메모리에 있을 수 있는
+        영역(워커 수의 두 배)을 합쳐도 상한 안에 들도록 영역 크기를 정합니다.
+        color_mode가 "gray"이면 그레이스케일로 렌더링하여 기록하고, 압축 레벨은 encoder_profile을 따릅니다.
+        """
+        if color_mode == "bilevel":
+            raise PageTooLargeError("1비트 흑백은 타일로 렌더링할 수 없습니다.")
+        limit = self.pixel_limit(color_mode)
+        tile_size = max(16, min(self.tile_size, int(math.sqrt(limit)) // 16 * 16))
+        in_flight = 1 if self.tile_workers <= 1 else self.tile_workers * 2
+        mode = "RGB" if color_mode == "rgb" else "L"
+        return TiledPageRenderer(
+            tile_size, self.tile_workers, limit // in_flight, mode, tile_compress_level(encoder_profile)
+        )
+
+    def _key(self) -> tuple:
+        return (self.max_pixels, self.max_bytes, self.policy, self.tile_size, self.tile_workers)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MemoryBudget) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        text = f"MemoryBudget(max_pixels={self.max_pixels}, max_bytes={self.max_bytes}, policy={self.policy!r}"
+        if self.policy == "tile":
+            text += f", tile_size={self.tile_size}, tile_workers={self.tile_workers}"
+        return text + ")"
+
+
+def _pixel_size(width_pt: float, height_pt: float, dpi: int) -> Tuple[int, int]:
+    return math.ceil(width_pt * dpi / 72.0), math.ceil(height_pt * dpi / 72.0)
+
+
+class BudgetedBackend(RenderBackend):
+    """
+    다른 백엔드를 감싸 메모리 예산에 맞춘 DPI로 페이지를 렌더링하는 백엔드
+
+    문서 하나에 대해 만들며, 페이지별 처리 결과는 reports에 모입니다.
+    DPI가 같은 연속 페이지는 묶어서 감싼 백엔드에 넘기므로 문서를 여는 횟수는 늘지 않습니다.
+    타일로 처리할 페이지는 감싼 백엔드와 관계없이 PyMuPDF 타일 렌더러로 렌더링합니다.
+    """
+
+    def __init__(self, backend: RenderBackend, budget: MemoryBudget, pdf_source: PDFSource):
+        self.backend = backend
+        self.budget = budget
+        self.pdf_source = pdf_source
+        # 페이지 번호 -> plan_page 결과
+        self.reports: Dict[int, dict] = {}
+        self.logger = logging.getLogger(__name__)
+        self._page_sizes: Optional[List[Tuple[float, float]]] = None
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    @property
+    def color_mode(self) -> str:
+        return self.backend.color_mode
+
+    def plan_pages(self, page_nums: Iterable[int], dpi: int) -> List[dict]:
+        """렌더링하지 않고 페이지별 처리 방식을 정합니다. 거부할 페이지가 있으면 바로 예외가 발생합니다."""
+        return [self._plan(page_num, dpi) for page_num in page_nums]
+
+    def effective_dpi(self, pdf_path: PDFSource, page_num: int, dpi: int) -> int:
+        return self._plan(page_num, dpi)['dpi']
+
+    def render_page(self, pdf_path: PDFSource, page_num: int, dpi: int) -> Image.Image:
+        for _, image in self.iter_pages(pdf_path, [page_num], dpi):
+            return image
+
+    def iter_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        for page_dpi, tiled, run in self._runs(page_nums, dpi):
+            if tiled:
+                report = self.reports[run[0]]
+                raise PageTooLargeError(
+                    f"페이지 {run[0]}: {report['width']}x{report['height']}px는 페이지당 한도를 넘어 "
+                    f"타일로만 렌더링할 수 있습니다. 타일 렌더링은 페이지를 PNG/TIFF로 따로 저장할 때만 "
+                    f"사용할 수 있습니다."
+                )
+            yield from self.backend.iter_pages(pdf_path, run, page_dpi)
+
+    def save_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str,
+        output_path_for: Callable[[int], Path]
+    ) -> Iterator[Tuple[int, str]]:
+        for page_dpi, tiled, run in self._runs(page_nums, dpi):
+            if not tiled:
+                yield from self.backend.save_pages(pdf_path, run, page_dpi, output_format, output_path_for)
+                continue
+            renderer = self._tile_renderer(output_format)
+            for page_num in run:
+                output_path = output_path_for(page_num)
+                renderer.render(pdf_path, page_num, page_dpi, output_path, output_format)
+                yield page_num, str(output_path)
+
+    def encode_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str
+    ) -> Iterator[Tuple[int, Union[bytes, memoryview]]]:
+        for page_dpi, tiled, run in self._runs(page_nums, dpi):
+            if not tiled:
+                yield from self.backend.encode_pages(pdf_path, run, page_dpi, output_format)
+                continue
+            renderer = self._tile_renderer(output_format)
+            for page_num in run:
+                buffer = io.BytesIO()
+                renderer.render(pdf_path, page_num, page_dpi, buffer, output_format)
+                yield page_num, buffer.getbuffer()
+
+    def page_pixel_sizes(self, pdf_path: PDFSource, dpi: int) -> List[Tuple[int, int]]:
+        page_count = len(self._sizes())
+        page_dpis = [self.effective_dpi(pdf_path, page_num, dpi) for page_num in range(1, page_count + 1)]
+        sizes_by_dpi = {
+            page_dpi: self.backend.page_pixel_sizes(pdf_path, page_dpi) for page_dpi in set(page_dpis)
+        }
+        return [sizes_by_dpi[page_dpi][index] for index, page_dpi in enumerate(page_dpis)]
+
+    def _sizes(self) -> List[Tuple[float, float]]:
+        if self._page_sizes is None:
+            self._page_sizes = get_page_sizes(self.pdf_source)
+        return self._page_sizes
+
+    def _plan(self, page_num: int, dpi: int) -> dict:
+        report = self.reports.get(page_num)
+        if report is not None and report['requested_dpi'] == dpi:
+            return report
+
+        width_pt, height_pt = self._sizes()[page_num - 1]
+        report = self.budget.plan_page(page_num, width_pt, height_pt, dpi, self.color_mode)
+        limit = self.budget.pixel_limit(self.color_mode)
+        if report['action'] == "downscaled":
+            self.logger.warning(
+                f"페이지 {page_num}: 예상 래스터가 페이지당 한도 {limit / 1e6:.1f}MP를 넘어 "
+                f"DPI를 {dpi}에서 {report['dpi']}(으)로 낮춥니다 "
+                f"({report['width']}x{report['height']}px)"
+            )
+        elif report['action'] == "tiled":
+            self.logger.warning(
+                f"페이지 {page_num}: 예상 래스터가 페이지당 한도 {limit / 1e6:.1f}MP를 넘어 "
+                f"타일로 나누어 렌더링합니다 ({report['width']}x{report['height']}px)"
+            )
+        self.reports[page_num] = report
+        return report
+
+    def _tile_renderer(self, output_format: str) -> TiledPageRenderer:
+        if normalize_format(output_format) not in TILED_FORMATS:
+            raise PageTooLargeError(
+                f"페이지당 한도를 넘는 페이지는 {', '.join(TILED_FORMATS)} 형식으로만 타일 렌더링할 수 있습니다: "
+                f"{output_format}"
+            )
+        # 한도를 넘는 페이지를 렌더링하기 전에 쉬고 있는 문서 핸들과 MuPDF 저장소를 비움
+        document_pool.trim()
+        return self.budget.tile_renderer(self.color_mode, self.backend.encoder_profile)
+
+    def _runs(self, page_nums: Iterable[int], dpi: int) -> Iterator[Tuple[int, bool, List[int]]]:
+        """연속 페이지를 적용할 DPI와 타일 여부별로 묶어 (DPI, 타일 여부, 페이지 목록)을 반환합니다."""
+        def run_key(page_num):
+            report = self._plan(page_num, dpi)
+            return report['dpi'], report['action'] == "tiled"
+
+        for (page_dpi, tiled), run in groupby(page_nums, key=run_key):
+            yield page_dpi, tiled, list(run)
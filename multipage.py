@@ -0,0 +1,102 @@
+"""
+여러 페이지를 파일 하나에 담는 출력 (멀티페이지 TIFF, 애니메이션 WebP/GIF)
+
+convert_pdf_to_images는 페이지마다 파일을 만들고, convert_pdf_to_single_image는 모든 페이지를
+세로로 이어 붙인 큰 캔버스를 만듭니다. 보관용으로는 페이지 구분을 유지한 채 파일 하나에 담는
+멀티페이지 TIFF가 알맞습니다. write_multipage_tiff는 렌더링한 페이지를 AppendingTiffWriter로
+하나씩 압축하여 이어 쓰므로 메모리에는 페이지 하나만 올라갑니다.
+
+애니메이션 WebP/GIF는 미리보기용입니다. Pillow의 두 인코더는 모든 프레임을 모은 뒤에 파일을 쓰므로
+프레임은 너비 ANIMATION_MAX_WIDTH 이하가 되도록 낮은 DPI로 렌더링하고(animation_dpi),
+첫 페이지 크기의 캔버스에 맞춥니다.
+"""
+
+from pathlib import Path
+from typing import BinaryIO, Iterable, Sequence, Tuple, Union
+
+from PIL import Image, ImageOps, TiffImagePlugin
+
+from image_encoding import DEFAULT_PROFILE, encoder_options, normalize_format
+
+# 파일 하나에 여러 페이지를 담을 수 있는 형식
+CONTAINER_FORMATS = ("TIFF", "WEBP", "GIF")
+# 애니메이션(미리보기)으로 기록하는 형식
+ANIMATION_FORMATS = ("WEBP", "GIF")
+
+# 애니메이션 프레임의 최대 너비 (픽셀)
+ANIMATION_MAX_WIDTH = 800
+# 애니메이션 프레임 하나를 보여 줄 시간 (밀리초)
+FRAME_DURATION = 1000
+
+
+def animation_dpi(page_widths_pt: Sequence[float], dpi: int, max_width: int = ANIMATION_MAX_WIDTH) -> int:
+    """가장 넓은 페이지가 max_width 픽셀을 넘지 않는 DPI (dpi보다 높아지지 않음)"""
+    widest = max(page_widths_pt)
+    return max(1, min(dpi, int(max_width * 72 / widest)))
+
+
+def write_multipage_tiff(
+    pages: Iterable[Tuple[Image.Image, int]],
+    output: Union[str, Path, BinaryIO],
+    profile: str = DEFAULT_PROFILE
+) -> int:
+    """
+    (이미지, DPI)를 차례로 압축하여 멀티페이지 TIFF 하나에 기록합니다.
+
+    페이지는 한 장씩 꺼내 바로 기록하므로 렌더링 제너레이터를 넘기면 메모리에는 페이지 하나만 남습니다.
+    DPI는 페이지마다 해상도 태그로 기록합니다 (메모리 예산으로 DPI를 낮춘 페이지는 다를 수 있음).
+    output에 바이너리 파일 객체를 주면 그 객체에 기록하며, 닫지 않습니다.
+
+    Returns:
+        기록한 페이지 수
+    """
+    count = 0
+    with TiffImagePlugin.AppendingTiffWriter(output, new=True) as writer:
+        for image, dpi in pages:
+            image.save(writer, "TIFF", dpi=(dpi, dpi), **encoder_options("TIFF", profile, mode=image.mode))
+            writer.newFrame()
+            count += 1
+    if count == 0:
+        raise ValueError("멀티페이지 TIFF에 기록할 페이지가 없습니다.")
+    return count
+
+
+def write_animation(
+    frames: Iterable[Image.Image],
+    output: Union[str, Path, BinaryIO],
+    output_format: str,
+    duration: int = FRAME_DURATION,
+    profile: str = DEFAULT_PROFILE,
+    lossless: bool = False
+) -> int:
+    """
+    이미지를 한 프레임씩 보여 주는 애니메이션 WebP/GIF를 기록합니다.
+
+    모든 프레임은 첫 프레임 크기의 캔버스에 비율을 유지하여 맞추고 남는 곳은 흰색으로 채웁니다.
+
+    Returns:
+        기록한 프레임 수
+    """
+    output_format = normalize_format(output_format)
+    if output_format not in ANIMATION_FORMATS:
+        raise ValueError(
+            f"애니메이션은 {', '.join(ANIMATION_FORMATS)} 형식만 지원합니다: {output_format}"
+        )
+
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError("애니메이션에 기록할 페이지가 없습니다.")
+    count = 1
+
+    def fitted():
+        nonlocal count
+        for frame in frames:
+            count += 1
+            yield frame if frame.size == first.size else ImageOps.pad(frame, first.size, color="white")
+
+    first.save(
+        output, output_format, save_all=True, append_images=fitted(),
+        duration=duration, loop=0, **encoder_options(output_format, profile, lossless)
+    )
+    return count
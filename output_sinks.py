@@ -0,0 +1,160 @@
+"""
+변환 결과 출력 대상(sink)
+
+변환기는 페이지를 인코딩된 이미지 바이트로 만들어 sink에 넘기고, 어디에 둘지는 sink가 정합니다.
+MemorySink는 메모리에 모아 두고(웹 응답용), DirectorySink는 디렉토리에 파일로 저장하며,
+ArchiveSink는 ZIP/TAR 아카이브 하나에 차례로 기록합니다.
+"""
+
+import io
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+# 인코딩된 이미지 데이터
+ImageData = Union[bytes, memoryview]
+
+# 이미 압축된 형식: ZIP에서 다시 압축해도 거의 줄지 않으므로 그대로 저장(store)
+_COMPRESSED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif"}
+
+# 확장자 -> 아카이브 형식
+ARCHIVE_FORMATS = {".zip": "zip", ".tar": "tar", ".tar.gz": "tar.gz", ".tgz": "tar.gz"}
+
+
+class OutputSink:
+    """
+    출력 대상 기본 클래스
+
+    하위 클래스는 write를 구현합니다. with 문으로 사용하면 끝날 때 close가 호출됩니다.
+    """
+
+    def write(self, name: str, data: ImageData) -> str:
+        """
+        이미지 하나를 기록합니다.
+
+        Args:
+            name: 파일명 (예: document_page_001.png)
+            data: 인코딩된 이미지 바이트
+
+        Returns:
+            기록한 위치 (파일 경로, 항목 이름 등)
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """기록을 마무리합니다."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class MemorySink(OutputSink):
+    """변환 결과를 (파일명, 바이트) 목록으로 메모리에 보관합니다."""
+
+    def __init__(self):
+        self.items: List[Tuple[str, ImageData]] = []
+
+    def write(self, name: str, data: ImageData) -> str:
+        self.items.append((name, data))
+        return name
+
+    @property
+    def total_bytes(self) -> int:
+        """보관 중인 이미지 바이트 합계"""
+        return sum(len(data) for _, data in self.items)
+
+
+class DirectorySink(OutputSink):
+    """변환 결과를 디렉토리에 파일로 저장합니다."""
+
+    def __init__(self, output_dir: Union[str, Path]):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.files: List[str] = []
+
+    def write(self, name: str, data: ImageData) -> str:
+        output_path = self.output_dir / name
+        with open(output_path, 'wb') as file:
+            file.write(data)
+        self.files.append(str(output_path))
+        return str(output_path)
+
+
+def archive_format_for(path: Union[str, Path]) -> str:
+    """파일 확장자로 아카이브 형식(zip, tar, tar.gz)을 정합니다."""
+    name = Path(path).name.lower()
+    for extension, archive_format in sorted(ARCHIVE_FORMATS.items(), key=lambda item: -len(item[0])):
+        if name.endswith(extension):
+            return archive_format
+    raise ValueError(
+        f"지원하지 않는 아카이브 형식입니다: {path} (사용 가능: {', '.join(ARCHIVE_FORMATS)})"
+    )
+
+
+class ArchiveSink(OutputSink):
+    """
+    변환 결과를 받는 즉시 ZIP 또는 TAR 아카이브에 기록합니다.
+
+    페이지를 모아 두지 않으므로 메모리에는 기록 중인 페이지 하나만 올라갑니다.
+    ZIP은 PNG/JPEG처럼 이미 압축된 형식은 그대로 저장하고 나머지는 deflate로 압축합니다.
+    TAR는 스트림 모드로 기록하므로 탐색할 수 없는 파일 객체(응답 스트림 등)에도 쓸 수 있습니다.
+    close를 호출해야 아카이브가 완성됩니다.
+    """
+
+    def __init__(self, output: Union[str, Path, BinaryIO], archive_format: Optional[str] = None):
+        """
+        Args:
+            output: 아카이브 파일 경로 또는 바이너리 파일 객체 (파일 객체는 닫지 않음)
+            archive_format: "zip", "tar", "tar.gz" (기본값: 파일 경로의 확장자로 결정)
+        """
+        if archive_format is None:
+            if hasattr(output, 'write'):
+                raise ValueError("파일 객체에 기록할 때는 archive_format을 지정해야 합니다.")
+            archive_format = archive_format_for(output)
+        if archive_format not in ARCHIVE_FORMATS.values():
+            raise ValueError(f"지원하지 않는 아카이브 형식입니다: {archive_format}")
+
+        self.output = output
+        self.archive_format = archive_format
+        self.names: List[str] = []
+        self._zip = None
+        self._tar = None
+
+        if archive_format == "zip":
+            self._zip = zipfile.ZipFile(output, "w", allowZip64=True)
+        else:
+            mode = "w|gz" if archive_format == "tar.gz" else "w|"
+            if hasattr(output, 'write'):
+                self._tar = tarfile.open(fileobj=output, mode=mode)
+            else:
+                self._tar = tarfile.open(str(output), mode=mode)
+
+    def write(self, name: str, data: ImageData) -> str:
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            if Path(name).suffix.lower() in _COMPRESSED_EXTENSIONS:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            self._zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._tar.addfile(info, io.BytesIO(data))
+
+        self.names.append(name)
+        return name
+
+    def close(self):
+        """아카이브를 마무리합니다. (ZIP 중앙 디렉토리, TAR 끝 블록 기록)"""
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
@@ -0,0 +1,215 @@
+"""
+빈 페이지와 중복 페이지 필터
+
+스캔 문서에는 빈 구분 페이지나 반복되는 표지가 많습니다. PageFilter는 전체 해상도로
+렌더링하기 전에 페이지마다 낮은 DPI의 그레이스케일 미리보기(probe)를 렌더링하고,
+NumPy로 잉크 비율(어두운 픽셀 비율)과 지각 해시(dHash)를 계산하여
+
+- 잉크 비율이 blank_coverage 이하인 페이지는 빈 페이지로 건너뛰고
+- 앞서 남긴 페이지와 해시 거리가 가깝고 미리보기 픽셀도 거의 같은 페이지는 중복으로 보아
+  앞 페이지의 출력을 하드 링크하거나(link) 출력 없이 참조만 남깁니다(skip).
+
+해시는 후보를 빠르게 찾는 데만 쓰고, 실제 중복 판정은 미리보기 픽셀 비교로 확인하므로
+레이아웃이 비슷한 다른 페이지를 중복으로 잘못 버리지 않습니다.
+"""
+
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from render_backends import PDFSource, RenderBackend
+
+# 미리보기 렌더링 해상도 (A4 약 200x280px)
+PROBE_DPI = 24
+# 이 값보다 어두운 픽셀(0~255)을 잉크로 셈
+INK_LEVEL = 160
+# 잉크 비율이 이 값 이하이면 빈 페이지 (0.05%)
+BLANK_COVERAGE = 0.0005
+# 잉크 비율을 셀 때 제외할 가장자리 비율 (스캐너 테두리 그림자)
+MARGIN = 0.03
+# 중복 후보로 볼 dHash 해밍 거리 (64비트 중)
+HASH_DISTANCE = 6
+# 미리보기에서 밝기가 이 값보다 크게 다른 픽셀을 다른 픽셀로 셈
+PIXEL_TOLERANCE = 48
+# 다른 픽셀 비율이 이 값 이하이면 중복 (0.01%, A4 미리보기에서 약 5픽셀).
+# 미리보기에서 단어 하나 차이는 0.1% 안팎이므로, 높이면 스캔 잡음이 있는 표지도 합치지만
+# 글자 몇 개만 다른 페이지까지 합칠 수 있음
+DUPLICATE_MAX_DIFF = 0.0001
+
+# 중복 페이지 처리 방식: link는 앞 페이지 출력의 하드 링크(안 되면 복사), skip은 출력하지 않음
+DEDUPE_MODES = ("link", "skip")
+
+
+def ink_coverage(gray: "np.ndarray", ink_level: int = INK_LEVEL, margin: float = MARGIN) -> float:
+    """그레이스케일 배열에서 가장자리를 뺀 영역의 잉크 픽셀 비율"""
+    height, width = gray.shape
+    dy, dx = int(height * margin), int(width * margin)
+    inner = gray[dy:height - dy, dx:width - dx]
+    if inner.size == 0:
+        return 0.0
+    return float(np.count_nonzero(inner < ink_level)) / inner.size
+
+
+def dhash(image: Image.Image) -> int:
+    """
+    64비트 차이 해시(dHash). 9x8로 줄인 그레이스케일 이미지에서
+    가로로 이웃한 픽셀의 밝기 증감을 비트로 만듭니다.
+    """
+    small = np.asarray(image.convert("L").resize((9, 8), Image.BOX), dtype=np.int16)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def hamming_distances(hashes: "np.ndarray", value: int) -> "np.ndarray":
+    """uint64 해시 배열의 각 항목과 value의 해밍 거리"""
+    xor = hashes ^ np.uint64(value)
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def link_output(source: Union[str, Path], destination: Union[str, Path]) -> str:
+    """source 파일을 destination에 하드 링크합니다. 링크할 수 없으면 복사합니다."""
+    destination = Path(destination)
+    if destination.exists():
+        destination.unlink()
+    try:
+        os.link(source, destination)
+    except OSError:
+        # 파일 시스템이 하드 링크를 지원하지 않거나 다른 장치인 경우
+        shutil.copyfile(source, destination)
+    return str(destination)
+
+
+class PageFilter:
+    """
+    전체 렌더링 전에 빈 페이지와 중복 페이지를 골라내는 필터
+
+    classify는 페이지마다 다음 결과를 반환합니다.
+    {'page', 'action': "keep" | "blank" | "duplicate", 'ink': 잉크 비율, 'hash': dHash 16진수,
+     'duplicate_of': 원본 페이지 번호 또는 None}
+    """
+
+    def __init__(
+        self,
+        skip_blank: bool = True,
+        dedupe: Optional[str] = "link",
+        probe_dpi: int = PROBE_DPI,
+        blank_coverage: float = BLANK_COVERAGE,
+        ink_level: int = INK_LEVEL,
+        hash_distance: int = HASH_DISTANCE,
+        max_pixel_diff: float = DUPLICATE_MAX_DIFF
+    ):
+        """
+        Args:
+            skip_blank: 빈 페이지를 건너뛸지 여부
+            dedupe: 중복 페이지 처리 방식 ("link", "skip", None이면 중복을 찾지 않음)
+            probe_dpi: 미리보기 렌더링 해상도
+            blank_coverage: 빈 페이지로 볼 최대 잉크 비율 (0~1)
+            ink_level: 잉크로 셀 밝기 기준 (0~255, 이보다 어두운 픽셀)
+            hash_distance: 중복 후보로 볼 최대 dHash 해밍 거리
+            max_pixel_diff: 중복으로 볼 미리보기의 최대 다른 픽셀 비율 (0~1)
+        """
+        if np is None:
+            raise RuntimeError("페이지 필터에는 NumPy가 필요합니다. pip install numpy를 실행해주세요.")
+        if dedupe is not None and dedupe not in DEDUPE_MODES:
+            raise ValueError(
+                f"알 수 없는 중복 처리 방식입니다: {dedupe} (사용 가능: {', '.join(DEDUPE_MODES)})"
+            )
+        if not skip_blank and dedupe is None:
+            raise ValueError("skip_blank 또는 dedupe 중 하나는 사용해야 합니다.")
+        self.skip_blank = skip_blank
+        self.dedupe = dedupe
+        self.probe_dpi = probe_dpi
+        self.blank_coverage = blank_coverage
+        self.ink_level = ink_level
+        self.hash_distance = hash_distance
+        self.max_pixel_diff = max_pixel_diff
+        self.logger = logging.getLogger(__name__)
+
+    def classify(
+        self,
+        backend: RenderBackend,
+        pdf_source: PDFSource,
+        page_nums: Iterable[int]
+    ) -> Dict[int, dict]:
+        """
+        페이지 미리보기를 렌더링하여 페이지마다 남길지, 빈 페이지인지, 중복인지 판정합니다.
+
+        Returns:
+            페이지 번호 -> 판정 결과
+        """
+        reports = {}
+        # 남긴 페이지의 해시와 미리보기 (중복 후보 비교용)
+        kept_pages: List[int] = []
+        kept_hashes: List[int] = []
+        kept_probes: List["np.ndarray"] = []
+
+        for page_num, image in backend.iter_pages(pdf_source, page_nums, self.probe_dpi):
+            gray = np.asarray(image.convert("L"))
+            coverage = ink_coverage(gray, self.ink_level)
+            page_hash = dhash(image)
+            report = {
+                'page': page_num,
+                'action': "keep",
+                'ink': coverage,
+                'hash': f"{page_hash:016x}",
+                'duplicate_of': None
+            }
+
+            if self.skip_blank and coverage <= self.blank_coverage:
+                report['action'] = "blank"
+            elif self.dedupe is not None:
+                original = self._find_duplicate(gray, page_hash, kept_pages, kept_hashes, kept_probes)
+                if original is not None:
+                    report['action'] = "duplicate"
+                    report['duplicate_of'] = original
+                else:
+                    kept_pages.append(page_num)
+                    kept_hashes.append(page_hash)
+                    kept_probes.append(gray)
+
+            if report['action'] == "blank":
+                self.logger.info(f"페이지 {page_num}: 빈 페이지로 건너뜁니다 (잉크 {coverage:.3%})")
+            elif report['action'] == "duplicate":
+                self.logger.info(f"페이지 {page_num}: 페이지 {report['duplicate_of']}와(과) 중복입니다")
+            reports[page_num] = report
+
+        return reports
+
+    def _find_duplicate(
+        self,
+        gray: "np.ndarray",
+        page_hash: int,
+        kept_pages: List[int],
+        kept_hashes: List[int],
+        kept_probes: List["np.ndarray"]
+    ) -> Optional[int]:
+        """해시 거리가 가까운 후보 중 미리보기 픽셀이 거의 같은 가장 앞 페이지를 찾습니다."""
+        if not kept_pages:
+            return None
+        distances = hamming_distances(np.array(kept_hashes, dtype=np.uint64), page_hash)
+        for index in np.flatnonzero(distances <= self.hash_distance):
+            if self._same_probe(gray, kept_probes[index]):
+                return kept_pages[index]
+        return None
+
+    def _same_probe(self, gray: "np.ndarray", other: "np.ndarray") -> bool:
+        if gray.shape != other.shape:
+            return False
+        different = np.abs(gray.astype(np.int16) - other) > PIXEL_TOLERANCE
+        return float(np.count_nonzero(different)) / different.size <= self.max_pixel_diff
+
+
+def summarize(reports: Dict[int, dict]) -> Tuple[int, int]:
+    """필터 결과에서 (빈 페이지 수, 중복 페이지 수)를 셉니다."""
+    blank = sum(1 for report in reports.values() if report['action'] == "blank")
+    duplicate = sum(1 for report in reports.values() if report['action'] == "duplicate")
+    return blank, duplicate
@@ -1,25 +1,120 @@
+import copy
+import io
 import os
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
 # PDF 변환을 위한 라이브러리들
 try:
-    from pdf2image import convert_from_path
     from PIL import Image
-    import PyPDF2
 except ImportError as e:
     print(f"필요한 라이브러리가 설치되지 않았습니다: {e}")
     print("pip install -r requirements.txt를 실행해주세요.")
     sys.exit(1)
 
+from image_encoding import (
+    DEFAULT_PROFILE, ENCODER_PROFILES, encoder_options, max_dimension, save_image, supported_formats
+)
+from image_passthrough import PassthroughBackend
+from memory_budget import OVERSIZE_POLICIES, BudgetedBackend, MemoryBudget
+from multipage import (
+    ANIMATION_FORMATS, CONTAINER_FORMATS, FRAME_DURATION, animation_dpi, write_animation, write_multipage_tiff
+)
+from page_filter import DEDUPE_MODES, PageFilter, link_output, summarize
+from pdf_info import get_document_info, get_page_count, get_page_sizes
+from png_stream import StreamingPNGWriter
+from output_sinks import ArchiveSink, ImageData, MemorySink, OutputSink
+from render_backends import BACKENDS, BILEVEL_THRESHOLD, COLOR_MODES, PDFSource, RenderBackend, get_backend
+from render_cache import RenderCache
+
+# 진행 상황 콜백: (페이지 번호, 완료한 페이지 수, 전체 페이지 수)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+def read_pdf_source(pdf_source: Union[str, Path, bytes, bytearray, memoryview, BinaryIO]) -> PDFSource:
+    """파일 경로는 Path로, PDF 바이트/버퍼/파일 객체는 bytes로 바꿉니다."""
+    if hasattr(pdf_source, 'read'):
+        return pdf_source.read()
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return bytes(pdf_source)
+    return Path(pdf_source)
+
 class PDFConverter:
-    """PDF를 이미지로 변환하는 클래스"""
+    """
+    PDF를 이미지로 변환하는 클래스
     
-    def __init__(self, output_dir: str = "converted_images"):
+    실제 렌더링은 백엔드(poppler, pymupdf 등)가 담당합니다.
+    backend="auto"이면 문서마다 샘플 페이지를 측정하여 더 빠른 백엔드를 고릅니다.
+    memory_budget을 주면 페이지마다 렌더링 전에 래스터 크기를 예측하여 한도를 넘는 페이지는
+    DPI를 낮추거나 PageTooLargeError로 거부하며, 처리 결과는 budget_reports에 남습니다.
+    page_filter를 주면 convert_pdf_to_images와 convert_to_sink가 전체 렌더링 전에 빈 페이지와
+    중복 페이지를 골라내며, 페이지별 판정은 filter_reports에 남습니다.
+    passthrough=True이면 스캔 이미지 한 장뿐인 페이지는 렌더링하지 않고 PDF에 들어 있는 이미지를
+    그대로 꺼내며(출력 형식과 이미지 형식이 같을 때), 그렇게 처리한 페이지는 extracted_pages에 남습니다.
+    페이지 저장/인코딩은 encode_workers개의 스레드에서 다음 페이지 렌더링과 겹쳐 실행합니다
+    (None이면 백엔드 기본값, 1이면 렌더링 스레드에서 차례로 인코딩).
+    encoder_profile은 형식별 인코더 설정 묶음입니다 (fast, balanced, archival, image_encoding 참고).
+    lossless=True이면 WebP를 무손실로 저장합니다 (다른 형식에는 영향 없음).
+    color_mode가 "gray"이면 8비트 그레이스케일로 렌더링하고, "bilevel"이면 threshold 밝기를 기준으로
+    (dither=True이면 Floyd-Steinberg 디더링으로) 1비트 흑백으로 바꿉니다. 1비트 TIFF는 CCITT Group 4로 압축합니다.
+    """
+    
+    def __init__(
+        self,
+        output_dir: str = "converted_images",
+        cache: Optional[RenderCache] = None,
+        backend: Union[str, RenderBackend] = "poppler",
+        memory_budget: Optional[MemoryBudget] = None,
+        page_filter: Optional[PageFilter] = None,
+        passthrough: bool = False,
+        encode_workers: Optional[int] = None,
+        encoder_profile: str = DEFAULT_PROFILE,
+        lossless: bool = False,
+        color_mode: str = "rgb",
+        threshold: int = BILEVEL_THRESHOLD,
+        dither: bool = False
+    ):
+        if encoder_profile not in ENCODER_PROFILES:
+            raise ValueError(
+                f"알 수 없는 인코더 프로필입니다: {encoder_profile} (사용 가능: {', '.join(ENCODER_PROFILES)})"
+            )
+        if color_mode not in COLOR_MODES:
+            raise ValueError(
+                f"알 수 없는 색상 모드입니다: {color_mode} (사용 가능: {', '.join(COLOR_MODES)})"
+            )
+        if not 0 <= threshold <= 255:
+            raise ValueError(f"흑백 기준 밝기는 0~255 사이여야 합니다: {threshold}")
+        # 파일로 저장할 때 만들어짐 (메모리 변환만 하면 디렉토리를 만들지 않음)
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
+        # 설정하면 같은 PDF/옵션으로 이미 렌더링한 페이지는 캐시에서 복사
+        self.cache = cache
+        # 백엔드 이름("auto" 포함) 또는 RenderBackend 인스턴스
+        self.backend = backend
+        # 페이지당 래스터 크기 상한
+        self.memory_budget = memory_budget
+        # 마지막으로 변환한 문서의 페이지 번호 -> 메모리 예산 처리 결과
+        self.budget_reports: Dict[int, dict] = {}
+        # 빈 페이지/중복 페이지 필터
+        self.page_filter = page_filter
+        # 마지막으로 변환한 문서의 페이지 번호 -> 필터 판정
+        self.filter_reports: Dict[int, dict] = {}
+        # 스캔 페이지의 내장 이미지를 그대로 추출할지 여부
+        self.passthrough = passthrough
+        # 마지막으로 변환한 문서에서 내장 이미지를 그대로 쓴 페이지 번호 (직렬 변환만 기록)
+        self.extracted_pages: List[int] = []
+        # 인코딩 스레드 수 (None이면 백엔드 기본값)
+        self.encode_workers = encode_workers
+        # 형식별 인코더 설정 프로필
+        self.encoder_profile = encoder_profile
+        # WebP를 무손실로 저장할지 여부
+        self.lossless = lossless
+        # 렌더링 색상 모드 ("rgb", "gray", "bilevel")와 1비트 변환 설정
+        self.color_mode = color_mode
+        self.threshold = threshold
+        self.dither = dither
         
         # 로깅 설정
         logging.basicConfig(
@@ -28,13 +123,42 @@ class PDFConverter:
         )
         self.logger = logging.getLogger(__name__)
     
+    def iter_pages(
+        self,
+        pdf_path: str,
+        dpi: int = 200,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        """
+        PDF 페이지를 하나씩 렌더링하여 반환하는 제너레이터입니다.
+        
+        페이지 단위로 렌더링하므로 전체 문서를 한 번에 메모리에 올리지 않고,
+        메모리 사용량은 한 페이지 크기로 제한됩니다.
+        
+        Args:
+            pdf_path: PDF 파일 경로
+            dpi: 이미지 해상도
+            first_page: 시작 페이지 (1부터 시작)
+            last_page: 마지막 페이지
+        
+        Yields:
+            (페이지 번호, PIL 이미지) 튜플. 페이지 번호는 1부터 시작
+        """
+        pdf_path = Path(pdf_path)
+        page_nums = self._page_numbers(pdf_path, first_page, last_page)
+        backend = self._resolve_backend(pdf_path, dpi, page_nums)
+        yield from backend.iter_pages(pdf_path, page_nums, dpi)
+    
     def convert_pdf_to_images(
         self, 
         pdf_path: str, 
         output_format: str = "PNG",
         dpi: int = 200,
         first_page: Optional[int] = None,
-        last_page: Optional[int] = None
+        last_page: Optional[int] = None,
+        workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
     ) -> List[str]:
         """
         PDF를 이미지로 변환합니다.
@@ -45,60 +169,64 @@ class PDFConverter:
             dpi: 이미지 해상도
             first_page: 시작 페이지 (1부터 시작)
             last_page: 마지막 페이지
+            workers: 2 이상이면 페이지 범위를 나누어 프로세스 풀에서 병렬로 렌더링
+                (각 워커가 문서를 따로 열며, 파일명과 반환 순서는 직렬 경로와 동일)
+            progress: 페이지가 저장될 때마다 호출할 함수. 예외를 발생시키면
+                남은 페이지를 렌더링하지 않고 변환을 중단합니다
         
         Returns:
-            생성된 이미지 파일 경로 리스트
+            생성된 이미지 파일 경로 리스트. 페이지 필터가 건너뛴 페이지는 포함하지 않으며,
+            중복 페이지는 link 방식일 때만 (원본의 하드 링크로) 포함합니다
         """
         try:
             pdf_path = Path(pdf_path)
-            if not pdf_path.exists():
-                raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
-            
             self.logger.info(f"PDF 변환 시작: {pdf_path.name}")
             
-            # PDF 페이지 수 확인
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                total_pages = len(pdf_reader.pages)
-                self.logger.info(f"총 페이지 수: {total_pages}")
-            
-            # 페이지 범위 설정
-            if first_page is None:
-                first_page = 1
-            if last_page is None:
-                last_page = total_pages
-            
-            # 페이지 번호 조정 (0부터 시작하는 인덱스로 변환)
-            start_idx = max(0, first_page - 1)
-            end_idx = min(total_pages, last_page)
-            
-            # PDF를 이미지로 변환
-            images = convert_from_path(
-                pdf_path,
-                dpi=dpi,
-                first_page=start_idx + 1,
-                last_page=end_idx
+            page_nums = self._page_numbers(pdf_path, first_page, last_page)
+            backend = self._resolve_backend(pdf_path, dpi, page_nums)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            
+            # 빈 페이지와 중복 페이지는 전체 해상도로 렌더링하지 않음
+            keep_nums = self._filter_pages(backend, pdf_path, page_nums)
+            
+            # 캐시에 있는 페이지는 렌더링하지 않고 복사
+            output_files, cache_keys = self._fetch_cached_pages(
+                pdf_path, keep_nums, output_format, dpi, backend
             )
+            render_nums = [num for num in keep_nums if num not in output_files]
             
-            # 이미지 저장
-            saved_files = []
-            for i, image in enumerate(images):
-                page_num = start_idx + i + 1
-                filename = f"{pdf_path.stem}_page_{page_num:03d}.{output_format.lower()}"
-                output_path = self.output_dir / filename
-                
-                # 이미지 형식에 따른 저장
-                if output_format.upper() == "JPEG":
-                    # JPEG는 RGB 모드로 변환 필요
-                    if image.mode in ('RGBA', 'LA', 'P'):
-                        image = image.convert('RGB')
-                    image.save(output_path, 'JPEG', quality=95)
-                else:
-                    image.save(output_path, output_format.upper())
-                
-                saved_files.append(str(output_path))
-                self.logger.info(f"페이지 {page_num} 저장 완료: {filename}")
+            if progress is not None:
+                for completed, page_num in enumerate(output_files, 1):
+                    progress(page_num, completed, len(page_nums))
+            completed = len(output_files)
+            
+            if workers and workers > 1 and len(render_nums) > 1:
+                rendered = self._convert_parallel(
+                    pdf_path, render_nums, output_format, dpi, workers, backend
+                )
+            else:
+                # 페이지를 하나씩 렌더링하고 바로 저장하여 메모리 사용량을 일정하게 유지
+                rendered = self._save_pages(backend, pdf_path, render_nums, output_format, dpi)
             
+            for page_num, output_path in rendered:
+                output_files[page_num] = output_path
+                if self.cache is not None:
+                    self.cache.put(cache_keys[page_num], output_path)
+                self.logger.info(f"페이지 {page_num} 저장 완료: {Path(output_path).name}")
+                completed += 1
+                if progress is not None:
+                    progress(page_num, completed, len(page_nums))
+            
+            kept = set(keep_nums)
+            for page_num in page_nums:
+                if page_num in kept:
+                    continue
+                self._apply_filter_report(pdf_path, page_num, output_format, output_files)
+                completed += 1
+                if progress is not None:
+                    progress(page_num, completed, len(page_nums))
+            
+            saved_files = [output_files[page_num] for page_num in page_nums if page_num in output_files]
             self.logger.info(f"변환 완료! {len(saved_files)}개 파일이 {self.output_dir}에 저장되었습니다.")
             return saved_files
             
@@ -106,60 +234,476 @@ class PDFConverter:
             self.logger.error(f"PDF 변환 중 오류 발생: {e}")
             raise
     
-    def convert_pdf_to_single_image(
-        self, 
-        pdf_path: str, 
+    def get_page_count(self, pdf_path: str) -> int:
+        """PDF 파일의 페이지 수를 반환합니다."""
+        return get_page_count(pdf_path)
+    
+    def get_pdf_info(self, pdf_path: str) -> dict:
+        """
+        PDF 파일 정보(페이지 수, 제목, 작성자 등)를 반환합니다.
+        읽을 수 없는 파일이면 페이지 수 0인 빈 정보를 반환합니다.
+        """
+        try:
+            return get_document_info(pdf_path, include_page_sizes=False)
+        except Exception as e:
+            self.logger.error(f"PDF 정보 가져오기 중 오류 발생: {e}")
+            return {'page_count': 0, 'page_sizes': [], 'title': '', 'author': '', 'subject': '', 'creator': ''}
+    
+    def convert_page(
+        self,
+        pdf_path: str,
+        page_num: int,
         output_format: str = "PNG",
         dpi: int = 200
     ) -> str:
         """
-        PDF의 모든 페이지를 하나의 긴 이미지로 변환합니다.
+        한 페이지만 변환하여 저장합니다. 페이지 수 확인을 생략하므로
+        배치 스케줄러처럼 페이지 단위로 작업을 나누는 호출자에게 적합합니다.
         
         Args:
             pdf_path: PDF 파일 경로
+            page_num: 페이지 번호 (1부터 시작)
             output_format: 출력 이미지 형식
             dpi: 이미지 해상도
         
         Returns:
             생성된 이미지 파일 경로
+        
+        Raises:
+            ValueError: 페이지를 렌더링하지 못해 저장한 파일이 없는 경우
+        """
+        pdf_path = Path(pdf_path)
+        backend = self._resolve_backend(pdf_path, dpi, [page_num])
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for _, output_path in self._save_pages(backend, pdf_path, [page_num], output_format, dpi):
+            return output_path
+        raise ValueError(f"페이지 {page_num}을(를) 변환하지 못했습니다: {pdf_path.name}")
+    
+    def convert_to_sink(
+        self,
+        pdf_source: Union[str, Path, bytes, BinaryIO],
+        sink: OutputSink,
+        output_format: str = "PNG",
+        dpi: int = 200,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        single_image: bool = False,
+        streaming: bool = False,
+        name: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        PDF를 변환하여 인코딩된 이미지를 sink에 기록합니다.
+        
+        PDF 바이트나 파일 객체는 메모리에서 바로 렌더링하고(poppler는 표준 입력으로 전달),
+        결과도 sink에만 기록하므로 임시 파일이나 출력 디렉토리를 거치지 않습니다.
+        
+        Args:
+            pdf_source: PDF 파일 경로, PDF 바이트 또는 읽을 수 있는 바이너리 파일 객체
+            sink: 결과를 받을 출력 대상 (MemorySink, DirectorySink 등)
+            output_format: 출력 이미지 형식
+            dpi: 이미지 해상도
+            first_page: 시작 페이지 (1부터 시작)
+            last_page: 마지막 페이지
+            single_image: 모든 페이지를 하나의 이미지로 결합하여 한 항목으로 기록
+            streaming: 단일 이미지를 한 페이지씩 PNG로 인코딩 (PNG 전용)
+            name: 출력 파일명의 기준이 되는 문서 이름 (기본값: 파일 이름, 바이트이면 "document")
+            progress: 페이지를 처리할 때마다 호출할 함수. 예외를 발생시키면 변환을 중단합니다
+        
+        Returns:
+            sink.write가 반환한 위치 목록 (페이지 순서). 페이지 필터가 건너뛴 페이지는 포함하지 않으며,
+            중복 페이지는 link 방식일 때만 (원본과 같은 데이터를 자기 파일명으로 기록하여) 포함합니다.
+            단일 이미지는 필터가 남긴 페이지만 결합합니다
         """
         try:
-            pdf_path = Path(pdf_path)
-            if not pdf_path.exists():
-                raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
+            pdf_source = read_pdf_source(pdf_source)
+            if name:
+                stem = Path(name).stem
+            elif isinstance(pdf_source, Path):
+                stem = pdf_source.stem
+            else:
+                stem = "document"
+            self.logger.info(f"PDF 변환 시작: {stem}")
             
-            self.logger.info(f"PDF를 단일 이미지로 변환 시작: {pdf_path.name}")
+            page_nums = self._page_numbers(pdf_source, first_page, last_page)
+            backend = self._resolve_backend(pdf_source, dpi, page_nums)
+            # 빈 페이지와 중복 페이지는 전체 해상도로 렌더링하지 않음
+            keep_nums = self._filter_pages(backend, pdf_source, page_nums)
             
-            # PDF를 이미지로 변환
-            images = convert_from_path(pdf_path, dpi=dpi)
+            if single_image:
+                if len(keep_nums) == 0:
+                    raise ValueError("PDF에서 이미지를 추출할 수 없습니다.")
+                buffer = io.BytesIO()
+                self._combine(
+                    backend, pdf_source, keep_nums, dpi, buffer, output_format, streaming, progress
+                )
+                return [sink.write(f"{stem}_combined.{output_format.lower()}", buffer.getbuffer())]
             
-            if not images:
-                raise ValueError("PDF에서 이미지를 추출할 수 없습니다.")
+            # link 방식이면 중복 페이지가 원본 데이터를 다시 기록하므로 원본 페이지의 데이터만 보관
+            link = self.page_filter is not None and self.page_filter.dedupe == "link"
+            originals = {
+                report['duplicate_of'] for report in self.filter_reports.values()
+                if report['action'] == "duplicate"
+            }
+            kept_data: Dict[int, ImageData] = {}
+            locations: Dict[int, str] = {}
             
-            # 이미지들을 세로로 연결
-            total_width = max(img.width for img in images)
-            total_height = sum(img.height for img in images)
+            outputs = []
+            rendered = self._encode_pages(backend, pdf_source, keep_nums, output_format, dpi)
+            try:
+                for completed, page_num in enumerate(page_nums, 1):
+                    filename = self._page_filename(stem, page_num, output_format)
+                    report = self.filter_reports.get(page_num)
+                    if report is None or report['action'] == "keep":
+                        _, data = next(rendered)
+                        locations[page_num] = sink.write(filename, data)
+                        outputs.append(locations[page_num])
+                        if link and page_num in originals:
+                            kept_data[page_num] = data
+                        self.logger.info(f"페이지 {page_num} 변환 완료")
+                    elif report['action'] == "duplicate":
+                        # 중복 페이지의 원본은 항상 앞 페이지이므로 이미 기록되어 있음
+                        original = report['duplicate_of']
+                        report['output'] = locations[original]
+                        if link:
+                            report['output'] = sink.write(filename, kept_data[original])
+                            outputs.append(report['output'])
+                    if progress is not None:
+                        progress(page_num, completed, len(page_nums))
+            finally:
+                rendered.close()
             
-            # 새 이미지 생성
-            combined_image = Image.new('RGB', (total_width, total_height), 'white')
+            self.logger.info(f"변환 완료! {len(outputs)}개 페이지")
+            return outputs
             
-            y_offset = 0
-            for i, image in enumerate(images):
-                # 이미지가 total_width보다 작은 경우 중앙 정렬
-                x_offset = (total_width - image.width) // 2
-                combined_image.paste(image, (x_offset, y_offset))
-                y_offset += image.height
-                
-                self.logger.info(f"페이지 {i+1} 처리 완료")
+        except Exception as e:
+            self.logger.error(f"PDF 변환 중 오류 발생: {e}")
+            raise
+    
+    def convert_pdf_to_bytes(
+        self,
+        pdf_source: Union[str, Path, bytes, BinaryIO],
+        output_format: str = "PNG",
+        dpi: int = 200,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        name: Optional[str] = None
+    ) -> List[Tuple[str, ImageData]]:
+        """
+        PDF를 변환하여 페이지별 (파일명, 인코딩된 이미지 바이트) 목록을 반환합니다.
+        디스크를 사용하지 않습니다. 인자는 convert_to_sink와 같습니다.
+        """
+        sink = MemorySink()
+        self.convert_to_sink(
+            pdf_source, sink, output_format, dpi, first_page, last_page, name=name
+        )
+        return sink.items
+    
+    def _encode_pages(
+        self,
+        backend: RenderBackend,
+        pdf_source: PDFSource,
+        page_nums: range,
+        output_format: str,
+        dpi: int
+    ) -> Iterator[Tuple[int, ImageData]]:
+        """페이지를 인코딩된 바이트로 반환합니다. 캐시에 있는 페이지는 렌더링하지 않습니다."""
+        if self.cache is None:
+            yield from backend.encode_pages(pdf_source, page_nums, dpi, output_format)
+            return
+        
+        if isinstance(pdf_source, bytes):
+            pdf_hash = RenderCache.hash_bytes(pdf_source)
+        else:
+            pdf_hash = RenderCache.hash_file(pdf_source)
+        cache_keys = {
+            page_num: self._cache_key(
+                pdf_hash, page_num, backend.effective_dpi(pdf_source, page_num, dpi), output_format, backend
+            )
+            for page_num in page_nums
+        }
+        render_nums = [num for num in page_nums if not self.cache.contains(cache_keys[num])]
+        
+        # 캐시에 없는 페이지만 문서를 한 번 열어 차례로 렌더링
+        rendered = backend.encode_pages(pdf_source, render_nums, dpi, output_format)
+        try:
+            render_set = set(render_nums)
+            for page_num in page_nums:
+                if page_num in render_set:
+                    _, data = next(rendered)
+                    self.cache.put_bytes(cache_keys[page_num], data)
+                else:
+                    data = self.cache.get_bytes(cache_keys[page_num])
+                    if data is None:
+                        # 확인한 뒤 다른 프로세스가 항목을 정리한 경우
+                        _, data = next(backend.encode_pages(pdf_source, [page_num], dpi, output_format))
+                yield page_num, data
+        finally:
+            rendered.close()
+    
+    def _resolve_backend(
+        self,
+        pdf_path: PDFSource,
+        dpi: int,
+        page_nums: Optional[Iterable[int]] = None
+    ) -> RenderBackend:
+        """
+        설정된 백엔드 이름을 이 문서에 사용할 백엔드 인스턴스로 바꿉니다.
+        
+        메모리 예산이 있으면 백엔드를 BudgetedBackend로 감싸고, page_nums를 주면
+        렌더링 전에 페이지별 처리 방식을 정합니다(거부할 페이지가 있으면 여기서 예외 발생).
+        passthrough이면 그 위를 다시 PassthroughBackend로 감쌉니다.
+        """
+        if isinstance(self.backend, RenderBackend):
+            backend = self.backend
+        else:
+            backend = get_backend(self.backend, pdf_path, dpi)
+        if self.encode_workers is not None:
+            backend.encode_workers = self.encode_workers
+        backend.encoder_profile = self.encoder_profile
+        backend.lossless = self.lossless
+        backend.color_mode = self.color_mode
+        backend.threshold = self.threshold
+        backend.dither = self.dither
+        
+        if self.memory_budget is not None:
+            backend = BudgetedBackend(backend, self.memory_budget, pdf_path)
+            self.budget_reports = backend.reports
+            if page_nums is not None:
+                backend.plan_pages(page_nums, dpi)
+        
+        if self.passthrough:
+            backend = PassthroughBackend(backend)
+            self.extracted_pages = backend.extracted
+        return backend
+    
+    def _filter_pages(self, backend: RenderBackend, pdf_path: PDFSource, page_nums: range) -> List[int]:
+        """페이지 필터로 판정하여 전체 해상도로 렌더링할 페이지 번호만 반환합니다."""
+        self.filter_reports = {}
+        if self.page_filter is None:
+            return list(page_nums)
+        
+        # 미리보기는 DPI가 낮으므로 메모리 예산을 거치지 않음 (예산 처리 결과를 덮어쓰지 않도록)
+        backend = _base_backend(backend)
+        if backend.color_mode == "bilevel":
+            # 저해상도에서 1비트로 바꾸면 가는 글자가 사라져 빈 페이지로 잘못 판정하므로 그레이스케일로 판정
+            backend = copy.copy(backend)
+            backend.color_mode = "gray"
+        self.filter_reports = self.page_filter.classify(backend, pdf_path, page_nums)
+        blank, duplicate = summarize(self.filter_reports)
+        if blank or duplicate:
+            self.logger.info(f"페이지 필터: 빈 페이지 {blank}개, 중복 페이지 {duplicate}개")
+        return [num for num in page_nums if self.filter_reports[num]['action'] == "keep"]
+    
+    def _apply_filter_report(
+        self,
+        pdf_path: Path,
+        page_num: int,
+        output_format: str,
+        output_files: Dict[int, str]
+    ):
+        """
+        필터가 건너뛴 페이지를 처리합니다. 중복 페이지는 원본 출력을 참조(report['output'])하며,
+        link 방식이면 자기 파일명으로 원본을 하드 링크하여 output_files에 추가합니다.
+        """
+        report = self.filter_reports[page_num]
+        if report['action'] != "duplicate":
+            return
+        
+        original = output_files[report['duplicate_of']]
+        report['output'] = original
+        if self.page_filter.dedupe == "link":
+            output_path = self._page_output_path(pdf_path, page_num, output_format)
+            output_files[page_num] = link_output(original, output_path)
+            report['output'] = output_files[page_num]
+            self.logger.info(f"페이지 {page_num} 중복 링크: {output_path.name} -> {Path(original).name}")
+    
+    def _page_numbers(
+        self,
+        pdf_path: PDFSource,
+        first_page: Optional[int],
+        last_page: Optional[int]
+    ) -> range:
+        """요청한 페이지 범위를 문서 범위 안의 페이지 번호(1부터 시작)로 변환합니다."""
+        total_pages = self.get_page_count(pdf_path)
+        self.logger.info(f"총 페이지 수: {total_pages}")
+        
+        # 페이지 범위 설정
+        if first_page is None:
+            first_page = 1
+        if last_page is None:
+            last_page = total_pages
+        
+        # 페이지 번호 조정 (0부터 시작하는 인덱스로 변환)
+        start_idx = max(0, first_page - 1)
+        end_idx = min(total_pages, last_page)
+        
+        return range(start_idx + 1, end_idx + 1)
+    
+    def _save_pages(
+        self,
+        backend: RenderBackend,
+        pdf_path: Path,
+        page_nums: Iterable[int],
+        output_format: str,
+        dpi: int
+    ) -> Iterator[Tuple[int, str]]:
+        """백엔드로 페이지를 렌더링해 출력 디렉토리에 저장하고 (페이지 번호, 경로)를 반환합니다."""
+        return backend.save_pages(
+            pdf_path, page_nums, dpi, output_format,
+            lambda page_num: self._page_output_path(pdf_path, page_num, output_format)
+        )
+    
+    def _convert_parallel(
+        self,
+        pdf_path: Path,
+        page_nums: List[int],
+        output_format: str,
+        dpi: int,
+        workers: int,
+        backend: RenderBackend
+    ) -> List[Tuple[int, str]]:
+        """페이지 목록을 연속된 청크로 나누어 프로세스 풀에서 렌더링합니다."""
+        # 메모리 예산과 passthrough는 워커가 같은 설정으로 다시 적용
+        backend = _base_backend(backend)
+        if BACKENDS.get(backend.name) is not type(backend):
+            raise ValueError(f"등록되지 않은 백엔드는 병렬 변환에 사용할 수 없습니다: {backend.name}")
+        
+        # 페이지마다 렌더링 비용이 달라도 부하가 고르게 퍼지도록 워커 수보다 잘게 나눔
+        chunk_count = min(len(page_nums), workers * 4)
+        chunk_size = -(-len(page_nums) // chunk_count)
+        chunks = [
+            page_nums[i:i + chunk_size]
+            for i in range(0, len(page_nums), chunk_size)
+        ]
+        
+        self.logger.info(
+            f"병렬 변환 시작: {len(page_nums)}페이지, 워커 {workers}개, 청크 {len(chunks)}개"
+        )
+        
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            futures = [
+                executor.submit(
+                    _convert_pages_worker,
+                    backend.name, str(pdf_path), chunk, str(self.output_dir), output_format, dpi,
+                    self.memory_budget, self.passthrough, self.encoder_profile, self.lossless,
+                    self.color_mode, self.threshold, self.dither
+                )
+                for chunk in chunks
+            ]
+            
+            # 제출 순서대로 결과를 모아 직렬 경로와 같은 순서를 유지
+            rendered = []
+            for future in futures:
+                rendered.extend(future.result())
+        
+        return rendered
+    
+    def _fetch_cached_pages(
+        self,
+        pdf_path: Path,
+        page_nums: Iterable[int],
+        output_format: str,
+        dpi: int,
+        backend: RenderBackend
+    ) -> Tuple[Dict[int, str], Dict[int, str]]:
+        """
+        캐시에 있는 페이지를 출력 디렉토리로 복사합니다.
+        
+        Returns:
+            (캐시에서 복사한 페이지 -> 파일 경로, 페이지 -> 캐시 키)
+        """
+        if self.cache is None:
+            return {}, {}
+        
+        pdf_hash = RenderCache.hash_file(pdf_path)
+        
+        cached_files = {}
+        cache_keys = {}
+        for page_num in page_nums:
+            key = self._cache_key(
+                pdf_hash, page_num, backend.effective_dpi(pdf_path, page_num, dpi), output_format, backend
+            )
+            cache_keys[page_num] = key
+            output_path = self._page_output_path(pdf_path, page_num, output_format)
+            if self.cache.fetch(key, output_path):
+                cached_files[page_num] = str(output_path)
+                self.logger.info(f"페이지 {page_num} 캐시 사용: {output_path.name}")
+        
+        return cached_files, cache_keys
+    
+    def _cache_key(
+        self,
+        pdf_hash: str,
+        page_num: int,
+        dpi: int,
+        output_format: str,
+        backend: RenderBackend
+    ) -> str:
+        """페이지 렌더 캐시 키를 만듭니다."""
+        options = encoder_options(output_format, self.encoder_profile, self.lossless)
+        # rgb는 키에 넣지 않아 기존 캐시 항목을 그대로 사용
+        color = {}
+        if self.color_mode != "rgb":
+            color['color'] = self.color_mode
+        if self.color_mode == "bilevel":
+            color.update(threshold=self.threshold, dither=self.dither)
+        return RenderCache.make_key(
+            pdf_hash, page_num, dpi, output_format, options.pop('quality', None),
+            renderer=backend.name, profile=self.encoder_profile, lossless=options.get('lossless', False),
+            **color
+        )
+    
+    def _page_filename(self, stem: str, page_num: int, output_format: str) -> str:
+        """페이지의 출력 파일명을 만듭니다."""
+        return f"{stem}_page_{page_num:03d}.{output_format.lower()}"
+    
+    def _page_output_path(self, pdf_path: Path, page_num: int, output_format: str) -> Path:
+        """페이지의 출력 파일 경로를 만듭니다."""
+        return self.output_dir / self._page_filename(pdf_path.stem, page_num, output_format)
+    
+    def convert_pdf_to_single_image(
+        self, 
+        pdf_path: str, 
+        output_format: str = "PNG",
+        dpi: int = 200,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        streaming: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        PDF의 여러 페이지를 하나의 긴 이미지로 변환합니다.
+        
+        Args:
+            pdf_path: PDF 파일 경로
+            output_format: 출력 이미지 형식
+            dpi: 이미지 해상도
+            first_page: 시작 페이지 (1부터 시작)
+            last_page: 마지막 페이지
+            streaming: True이면 페이지 크기를 먼저 계산한 뒤 한 페이지씩 렌더링하여
+                PNG에 행 단위로 기록 (메모리 사용량이 페이지 하나 크기로 제한됨, PNG 전용)
+            progress: 페이지를 처리할 때마다 호출할 함수. 예외를 발생시키면 변환을 중단합니다
+        
+        Returns:
+            생성된 이미지 파일 경로
+        """
+        try:
+            pdf_path = Path(pdf_path)
+            self.logger.info(f"PDF를 단일 이미지로 변환 시작: {pdf_path.name}")
+            
+            page_nums = self._page_numbers(pdf_path, first_page, last_page)
+            if len(page_nums) == 0:
+                raise ValueError("PDF에서 이미지를 추출할 수 없습니다.")
+            backend = self._resolve_backend(pdf_path, dpi, page_nums)
             
-            # 파일 저장
             filename = f"{pdf_path.stem}_combined.{output_format.lower()}"
+            self.output_dir.mkdir(parents=True, exist_ok=True)
             output_path = self.output_dir / filename
             
-            if output_format.upper() == "JPEG":
-                combined_image.save(output_path, 'JPEG', quality=95)
-            else:
-                combined_image.save(output_path, output_format.upper())
+            self._combine(
+                backend, pdf_path, page_nums, dpi, output_path, output_format, streaming, progress
+            )
             
             self.logger.info(f"단일 이미지 변환 완료: {output_path}")
             return str(output_path)
@@ -168,9 +712,206 @@ class PDFConverter:
             self.logger.error(f"단일 이미지 변환 중 오류 발생: {e}")
             raise
     
+    def _combine(
+        self,
+        backend: RenderBackend,
+        pdf_path: PDFSource,
+        page_nums: range,
+        dpi: int,
+        output_path: Union[Path, BinaryIO],
+        output_format: str,
+        streaming: bool,
+        progress: Optional[ProgressCallback] = None
+    ):
+        """페이지들을 세로로 결합하여 output_path(파일 경로 또는 바이너리 파일 객체)에 기록합니다."""
+        if streaming and output_format.upper() != "PNG":
+            self.logger.warning(
+                f"스트리밍 결합은 PNG만 지원합니다. {output_format}은(는) 일반 방식으로 결합합니다."
+            )
+            streaming = False
+        
+        limit = max_dimension(output_format)
+        if limit is not None:
+            # 형식의 크기 제한을 넘으면 모든 페이지를 렌더링하기 전에 실패
+            page_sizes = backend.page_pixel_sizes(pdf_path, dpi)
+            width = max(page_sizes[page_num - 1][0] for page_num in page_nums)
+            height = sum(page_sizes[page_num - 1][1] for page_num in page_nums)
+            if max(width, height) > limit:
+                raise ValueError(
+                    f"{output_format.upper()}은(는) 가로/세로 {limit}픽셀까지만 저장할 수 있습니다 "
+                    f"(결합 이미지 {width}x{height}px). DPI를 낮추거나 페이지 범위를 줄여주세요."
+                )
+        
+        if streaming:
+            self._combine_streaming(backend, pdf_path, page_nums, dpi, output_path, progress)
+        else:
+            self._combine_in_memory(
+                backend, pdf_path, page_nums, dpi, output_path, output_format, progress
+            )
+    
+    def _combine_in_memory(
+        self,
+        backend: RenderBackend,
+        pdf_path: PDFSource,
+        page_nums: range,
+        dpi: int,
+        output_path: Union[Path, BinaryIO],
+        output_format: str,
+        progress: Optional[ProgressCallback] = None
+    ):
+        """모든 페이지를 렌더링한 뒤 하나의 캔버스에 세로로 붙여 저장합니다."""
+        images = []
+        for page_num, image in backend.iter_pages(pdf_path, page_nums, dpi):
+            images.append(image)
+            if progress is not None:
+                progress(page_num, len(images), len(page_nums))
+        
+        # 이미지들을 세로로 연결
+        total_width = max(img.width for img in images)
+        total_height = sum(img.height for img in images)
+        
+        # 새 이미지 생성 (그레이스케일/1비트 페이지는 같은 모드로, 섞여 있으면 RGB로)
+        modes = {img.mode for img in images}
+        mode = modes.pop() if len(modes) == 1 else 'RGB'
+        combined_image = Image.new(mode, (total_width, total_height), 'white')
+        
+        y_offset = 0
+        for page_num, image in zip(page_nums, images):
+            # 이미지가 total_width보다 작은 경우 중앙 정렬
+            x_offset = (total_width - image.width) // 2
+            combined_image.paste(image, (x_offset, y_offset))
+            y_offset += image.height
+            
+            self.logger.info(f"페이지 {page_num} 처리 완료")
+        
+        save_image(combined_image, output_path, output_format, self.encoder_profile, self.lossless)
+    
+    def _combine_streaming(
+        self,
+        backend: RenderBackend,
+        pdf_path: PDFSource,
+        page_nums: range,
+        dpi: int,
+        output_path: Union[Path, BinaryIO],
+        progress: Optional[ProgressCallback] = None
+    ):
+        """페이지들을 한 장씩 렌더링하여 결합 PNG에 바로 기록합니다."""
+        # 1단계: 렌더링 없이 페이지 크기만으로 전체 캔버스 크기 계산
+        all_sizes = backend.page_pixel_sizes(pdf_path, dpi)
+        page_sizes = [all_sizes[page_num - 1] for page_num in page_nums]
+        max_width = max(width for width, _ in page_sizes)
+        total_height = sum(height for _, height in page_sizes)
+        self.logger.info(f"스트리밍 결합 시작: {max_width}x{total_height}px, {len(page_sizes)}페이지")
+        
+        # 2단계: 한 페이지씩 렌더링하여 기록
+        compress_level = encoder_options("PNG", self.encoder_profile)['compress_level']
+        # 그레이스케일/1비트는 8비트 그레이스케일 PNG로 기록 (RGB의 1/3 크기)
+        mode = "RGB" if self.color_mode == "rgb" else "L"
+        with StreamingPNGWriter(
+            output_path, max_width, total_height, mode=mode, compress_level=compress_level
+        ) as writer:
+            for completed, ((page_num, image), (_, height)) in enumerate(zip(
+                backend.iter_pages(pdf_path, page_nums, dpi), page_sizes
+            ), 1):
+                writer.write_image(image, height=height)
+                self.logger.info(f"페이지 {page_num} 처리 완료")
+                if progress is not None:
+                    progress(page_num, completed, len(page_nums))
+    
+    def convert_pdf_to_multipage(
+        self,
+        pdf_path: str,
+        output_format: str = "TIFF",
+        dpi: int = 200,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        frame_duration: int = FRAME_DURATION,
+        progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        PDF의 여러 페이지를 파일 하나에 페이지(프레임)별로 담습니다.
+        
+        TIFF는 페이지를 하나씩 렌더링하여 멀티페이지 TIFF에 바로 압축해 기록하므로 결합 캔버스를
+        만들지 않고 메모리에는 페이지 하나만 올라갑니다 (보관용).
+        WEBP, GIF는 미리보기용 애니메이션이며, 프레임은 너비 multipage.ANIMATION_MAX_WIDTH 이하가
+        되도록 dpi보다 낮은 해상도로 렌더링합니다.
+        
+        Args:
+            pdf_path: PDF 파일 경로
+            output_format: TIFF, WEBP 또는 GIF
+            dpi: 이미지 해상도
+            first_page: 시작 페이지 (1부터 시작)
+            last_page: 마지막 페이지
+            frame_duration: 애니메이션에서 페이지 하나를 보여 줄 시간 (밀리초)
+            progress: 페이지를 처리할 때마다 호출할 함수. 예외를 발생시키면 변환을 중단합니다
+        
+        Returns:
+            생성된 파일 경로
+        """
+        try:
+            pdf_path = Path(pdf_path)
+            output_format = output_format.upper()
+            if output_format not in CONTAINER_FORMATS:
+                raise ValueError(
+                    f"여러 페이지를 담을 수 있는 형식은 {', '.join(CONTAINER_FORMATS)}입니다: {output_format}"
+                )
+            self.logger.info(f"PDF를 멀티페이지 {output_format}로 변환 시작: {pdf_path.name}")
+            
+            page_nums = self._page_numbers(pdf_path, first_page, last_page)
+            if len(page_nums) == 0:
+                raise ValueError("PDF에서 이미지를 추출할 수 없습니다.")
+            if output_format in ANIMATION_FORMATS:
+                page_sizes = get_page_sizes(pdf_path)
+                dpi = animation_dpi([page_sizes[page_num - 1][0] for page_num in page_nums], dpi)
+                self.logger.info(f"애니메이션 프레임 해상도: {dpi} DPI")
+            backend = self._resolve_backend(pdf_path, dpi, page_nums)
+            
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            output_path = self.output_dir / f"{pdf_path.stem}_pages.{output_format.lower()}"
+            self._write_multipage(
+                backend, pdf_path, page_nums, dpi, output_path, output_format, frame_duration, progress
+            )
+            
+            self.logger.info(f"멀티페이지 변환 완료: {output_path}")
+            return str(output_path)
+            
+        except Exception as e:
+            self.logger.error(f"멀티페이지 변환 중 오류 발생: {e}")
+            raise
+    
+    def _write_multipage(
+        self,
+        backend: RenderBackend,
+        pdf_path: PDFSource,
+        page_nums: range,
+        dpi: int,
+        output_path: Union[Path, BinaryIO],
+        output_format: str,
+        frame_duration: int = FRAME_DURATION,
+        progress: Optional[ProgressCallback] = None
+    ):
+        """페이지를 한 장씩 렌더링하여 멀티페이지 TIFF 또는 애니메이션에 기록합니다."""
+        def rendered():
+            for completed, (page_num, image) in enumerate(backend.iter_pages(pdf_path, page_nums, dpi), 1):
+                yield page_num, image
+                self.logger.info(f"페이지 {page_num} 처리 완료")
+                if progress is not None:
+                    progress(page_num, completed, len(page_nums))
+        
+        if output_format == "TIFF":
+            write_multipage_tiff(
+                ((image, backend.effective_dpi(pdf_path, page_num, dpi)) for page_num, image in rendered()),
+                output_path, self.encoder_profile
+            )
+        else:
+            write_animation(
+                (image for _, image in rendered()), output_path, output_format,
+                frame_duration, self.encoder_profile, self.lossless
+            )
+    
     def get_supported_formats(self) -> List[str]:
         """지원되는 이미지 형식을 반환합니다."""
-        return ["PNG", "JPEG", "TIFF", "BMP", "GIF"]
+        return supported_formats()
     
     def cleanup_output_dir(self):
         """출력 디렉토리의 모든 파일을 삭제합니다."""
@@ -183,6 +924,39 @@ class PDFConverter:
             self.logger.error(f"디렉토리 정리 중 오류 발생: {e}")
 
 
+def _base_backend(backend: RenderBackend) -> RenderBackend:
+    """passthrough/메모리 예산 래퍼를 벗긴 렌더링 백엔드"""
+    while isinstance(backend, (PassthroughBackend, BudgetedBackend)):
+        backend = backend.backend
+    return backend
+
+
+def _convert_pages_worker(
+    backend_name: str,
+    pdf_path: str,
+    page_nums: List[int],
+    output_dir: str,
+    output_format: str,
+    dpi: int,
+    memory_budget: Optional[MemoryBudget] = None,
+    passthrough: bool = False,
+    encoder_profile: str = DEFAULT_PROFILE,
+    lossless: bool = False,
+    color_mode: str = "rgb",
+    threshold: int = BILEVEL_THRESHOLD,
+    dither: bool = False
+) -> List[Tuple[int, str]]:
+    """프로세스 풀 워커: 자체 백엔드로 문서를 열고 주어진 페이지들을 렌더링합니다."""
+    # 프로세스가 이미 코어를 나누어 쓰므로 워커 안에서는 인코딩 스레드를 만들지 않음
+    converter = PDFConverter(
+        output_dir, backend=backend_name, memory_budget=memory_budget, passthrough=passthrough,
+        encode_workers=1, encoder_profile=encoder_profile, lossless=lossless,
+        color_mode=color_mode, threshold=threshold, dither=dither
+    )
+    backend = converter._resolve_backend(Path(pdf_path), dpi)
+    return list(converter._save_pages(backend, Path(pdf_path), page_nums, output_format, dpi))
+
+
 def main():
     """메인 함수 - 명령줄에서 실행할 때 사용"""
     import argparse
@@ -190,7 +964,7 @@ def main():
     parser = argparse.ArgumentParser(description="PDF를 이미지로 변환하는 프로그램")
     parser.add_argument("pdf_path", help="변환할 PDF 파일 경로")
     parser.add_argument("-f", "--format", default="PNG", 
-                       choices=["PNG", "JPEG", "TIFF", "BMP", "GIF"],
+                       choices=supported_formats(),
                        help="출력 이미지 형식 (기본값: PNG)")
     parser.add_argument("-d", "--dpi", type=int, default=200,
                        help="이미지 해상도 (기본값: 200)")
@@ -200,25 +974,127 @@ def main():
     parser.add_argument("--last-page", type=int, help="마지막 페이지 번호")
     parser.add_argument("--single-image", action="store_true",
                        help="모든 페이지를 하나의 이미지로 변환")
+    parser.add_argument("--streaming", action="store_true",
+                       help="단일 이미지를 한 페이지씩 기록하여 메모리 사용량 제한 (PNG 전용)")
+    parser.add_argument("--multipage", action="store_true",
+                       help="모든 페이지를 파일 하나에 페이지별로 담음: TIFF는 멀티페이지 TIFF(보관용), "
+                            "WEBP/GIF는 미리보기 애니메이션")
+    parser.add_argument("-b", "--backend", default="poppler",
+                       choices=list(BACKENDS) + ["auto"],
+                       help="렌더링 백엔드, auto는 문서마다 더 빠른 백엔드 선택 (기본값: poppler)")
+    parser.add_argument("-j", "--workers", type=int,
+                       help="병렬 렌더링 프로세스 수")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(ENCODER_PROFILES),
+                       help="인코더 프로필: fast는 크기보다 속도(PNG 압축 레벨 1, JPEG 85), "
+                            "archival은 속도보다 크기/화질 (기본값: balanced)")
+    parser.add_argument("--lossless", action="store_true",
+                       help="WebP를 무손실로 저장 (텍스트 페이지는 PNG보다 작음)")
+    parser.add_argument("--color", default="rgb", choices=COLOR_MODES,
+                       help="색상 모드: gray는 8비트 그레이스케일, bilevel은 1비트 흑백 "
+                            "(텍스트 문서, TIFF는 CCITT Group 4) (기본값: rgb)")
+    parser.add_argument("--threshold", type=int, default=BILEVEL_THRESHOLD,
+                       help=f"bilevel에서 흰색으로 볼 최소 밝기 0~255 (기본값: {BILEVEL_THRESHOLD})")
+    parser.add_argument("--dither", action="store_true",
+                       help="bilevel에서 기준 밝기 대신 디더링 사용 (사진이나 회색 영역이 있는 문서)")
+    parser.add_argument("--encode-workers", type=int,
+                       help="렌더링과 겹쳐 이미지를 인코딩할 스레드 수 (기본값: CPU 코어 수, 최대 4)")
+    parser.add_argument("--archive",
+                       help="이미지를 개별 파일 대신 하나의 아카이브에 저장 (.zip, .tar, .tar.gz)")
+    parser.add_argument("--max-megapixels", type=float,
+                       help="페이지당 최대 래스터 크기 (백만 픽셀), 넘으면 --oversize에 따라 처리")
+    parser.add_argument("--max-page-mb", type=float,
+                       help="페이지당 최대 래스터 메모리 (MB, RGB는 픽셀당 3바이트, gray/bilevel은 1바이트)")
+    parser.add_argument("--oversize", default="downscale", choices=OVERSIZE_POLICIES,
+                       help="한도를 넘는 페이지 처리: downscale은 DPI를 낮춤, tile은 PNG/TIFF를 타일로 렌더링, "
+                            "error는 변환 중단 (기본값: downscale)")
+    parser.add_argument("--tile-workers", type=int, default=1,
+                       help="--oversize tile에서 타일을 렌더링할 프로세스 수 (기본값: 1)")
+    parser.add_argument("--skip-blank", action="store_true",
+                       help="저해상도 미리보기로 빈 페이지를 찾아 변환하지 않음 (페이지별 파일 변환에만 적용)")
+    parser.add_argument("--dedupe", choices=DEDUPE_MODES,
+                       help="앞 페이지와 같은 페이지를 다시 렌더링하지 않음: link는 앞 페이지 출력의 "
+                            "하드 링크를 만들고, skip은 출력하지 않음")
+    parser.add_argument("--passthrough", action="store_true",
+                       help="스캔 이미지 한 장뿐인 페이지는 렌더링하지 않고 내장 이미지를 그대로 추출 "
+                            "(이미지 형식이 출력 형식과 같을 때, 원본 해상도)")
     
     args = parser.parse_args()
+    if args.multipage and (args.archive or args.single_image):
+        parser.error("--multipage는 --archive, --single-image와 함께 사용할 수 없습니다.")
     
     try:
-        converter = PDFConverter(args.output_dir)
+        memory_budget = None
+        if args.max_megapixels or args.max_page_mb:
+            memory_budget = MemoryBudget(
+                max_pixels=int(args.max_megapixels * 1_000_000) if args.max_megapixels else None,
+                max_bytes=int(args.max_page_mb * 1024 * 1024) if args.max_page_mb else None,
+                policy=args.oversize,
+                tile_workers=args.tile_workers
+            )
+        page_filter = None
+        if args.skip_blank or args.dedupe:
+            page_filter = PageFilter(skip_blank=args.skip_blank, dedupe=args.dedupe)
+        converter = PDFConverter(
+            args.output_dir, backend=args.backend, memory_budget=memory_budget,
+            page_filter=page_filter, passthrough=args.passthrough, encode_workers=args.encode_workers,
+            encoder_profile=args.profile, lossless=args.lossless,
+            color_mode=args.color, threshold=args.threshold, dither=args.dither
+        )
         
-        if args.single_image:
+        if args.multipage:
+            output_file = converter.convert_pdf_to_multipage(
+                args.pdf_path, args.format, args.dpi,
+                args.first_page, args.last_page
+            )
+            print(f"변환 완료: {output_file}")
+        elif args.archive:
+            # 페이지를 렌더링하는 대로 아카이브에 기록
+            with ArchiveSink(args.archive) as sink:
+                names = converter.convert_to_sink(
+                    args.pdf_path, sink, args.format, args.dpi,
+                    args.first_page, args.last_page,
+                    single_image=args.single_image, streaming=args.streaming
+                )
+            print(f"변환 완료: {len(names)}개 이미지를 {args.archive}에 저장했습니다.")
+        elif args.single_image:
             output_file = converter.convert_pdf_to_single_image(
-                args.pdf_path, args.format, args.dpi
+                args.pdf_path, args.format, args.dpi,
+                args.first_page, args.last_page,
+                streaming=args.streaming
             )
             print(f"변환 완료: {output_file}")
         else:
             output_files = converter.convert_pdf_to_images(
                 args.pdf_path, args.format, args.dpi,
-                args.first_page, args.last_page
+                args.first_page, args.last_page,
+                workers=args.workers
             )
             print(f"변환 완료: {len(output_files)}개 파일")
             for file in output_files:
                 print(f"  - {file}")
+        
+        # 메모리 예산 때문에 DPI를 낮추거나 타일로 렌더링한 페이지 보고
+        for report in converter.budget_reports.values():
+            if report['action'] == "downscaled":
+                print(
+                    f"  ⚠️ 페이지 {report['page']}: DPI {report['requested_dpi']} -> {report['dpi']} "
+                    f"({report['width']}x{report['height']}px)"
+                )
+            elif report['action'] == "tiled":
+                print(f"  ⚠️ 페이지 {report['page']}: 타일 렌더링 ({report['width']}x{report['height']}px)")
+        
+        if converter.extracted_pages:
+            print(f"  📎 내장 이미지를 그대로 추출한 페이지: {len(converter.extracted_pages)}개")
+        
+        # 페이지 필터가 건너뛴 페이지 보고
+        for report in converter.filter_reports.values():
+            if report['action'] == "blank":
+                print(f"  ⏭️ 페이지 {report['page']}: 빈 페이지 (잉크 {report['ink']:.3%})")
+            elif report['action'] == "duplicate":
+                print(
+                    f"  ⏭️ 페이지 {report['page']}: 페이지 {report['duplicate_of']}와(과) 중복 "
+                    f"-> {report.get('output', '')}"
+                )
                 
     except Exception as e:
         print(f"오류 발생: {e}")
@@ -0,0 +1,210 @@
+"""
+PDF 문서 정보(페이지 수, 페이지 크기, 메타데이터)를 가볍게 읽는 모듈
+
+PyMuPDF가 있으면 xref/페이지 트리만 읽어 정보를 가져오고, 없으면 PyPDF2로 대체합니다.
+같은 파일은 경로, 수정 시각, 크기를 키로 결과를 재사용하므로 변환기와 UI가
+한 문서를 여러 번 파싱하지 않습니다. PyMuPDF 문서 핸들은 렌더링과 같은 문서 풀에서 빌려 쓰므로
+PDF 바이트도 재실행마다 다시 파싱하지 않습니다. Streamlit 세션 스레드에서 동시에 호출되므로
+PyMuPDF로 읽을 때는 mupdf_lock을 잡습니다.
+"""
+
+import io
+import sys
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Tuple, Union
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+from document_pool import document_pool, mupdf_lock
+
+_METADATA_KEYS = ('title', 'author', 'subject', 'creator')
+
+# (경로, 수정 시각, 크기) -> 문서 정보, 최근 사용 순
+_INFO_CACHE_SIZE = 64
+_info_cache = OrderedDict()
+_info_cache_lock = threading.Lock()
+
+
+def get_document_info(source: Union[str, Path, bytes], include_page_sizes: bool = True) -> dict:
+    """
+    PDF 문서 정보를 반환합니다.
+
+    Args:
+        source: PDF 파일 경로 또는 PDF 바이트
+        include_page_sizes: 페이지별 크기까지 읽을지 여부 (페이지 수만 필요하면 False)
+
+    Returns:
+        {'page_count', 'page_sizes', 'title', 'author', 'subject', 'creator'} 딕셔너리.
+        page_sizes는 회전이 반영된 (너비, 높이) 포인트 단위 리스트이며,
+        include_page_sizes=False이면 빈 리스트입니다.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _read_info(bytes(source), include_page_sizes)
+
+    pdf_path = Path(source)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
+
+    stat = pdf_path.stat()
+    key = (str(pdf_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    with _info_cache_lock:
+        info = _info_cache.get(key)
+        if info is not None:
+            _info_cache.move_to_end(key)
+
+    # 페이지 크기가 필요한데 페이지 수만 캐시되어 있으면 다시 읽음
+    if info is None or (include_page_sizes and not info['has_page_sizes']):
+        info = _read_info(str(pdf_path), include_page_sizes)
+        info['has_page_sizes'] = include_page_sizes
+        with _info_cache_lock:
+            _info_cache[key] = info
+            _info_cache.move_to_end(key)
+            while len(_info_cache) > _INFO_CACHE_SIZE:
+                _info_cache.popitem(last=False)
+
+    # 캐시된 결과가 호출자에 의해 바뀌지 않도록 복사본 반환
+    result = dict(info, page_sizes=list(info['page_sizes']))
+    del result['has_page_sizes']
+    if not include_page_sizes:
+        result['page_sizes'] = []
+    return result
+
+
+def clear_cache():
+    """캐시된 문서 정보를 모두 비웁니다."""
+    with _info_cache_lock:
+        _info_cache.clear()
+
+
+def get_page_count(source: Union[str, Path, bytes]) -> int:
+    """PDF 문서의 페이지 수를 반환합니다."""
+    return get_document_info(source, include_page_sizes=False)['page_count']
+
+
+def get_page_sizes(source: Union[str, Path, bytes]) -> List[Tuple[float, float]]:
+    """페이지별 (너비, 높이)를 포인트 단위로 반환합니다. 회전이 반영됩니다."""
+    return get_document_info(source)['page_sizes']
+
+
+def _read_info(source: Union[str, bytes], include_page_sizes: bool) -> dict:
+    if fitz is not None:
+        return _read_info_fitz(source, include_page_sizes)
+    if PyPDF2 is not None:
+        return _read_info_pypdf2(source, include_page_sizes)
+    raise ImportError("PDF 정보를 읽으려면 PyMuPDF 또는 PyPDF2가 필요합니다.")
+
+
+def _read_info_fitz(source: Union[str, bytes], include_page_sizes: bool) -> dict:
+    with mupdf_lock, document_pool.document(source) as pdf_document:
+        metadata = pdf_document.metadata or {}
+        page_sizes = []
+        if include_page_sizes:
+            for page in pdf_document:
+                # page.rect는 cropbox에 회전을 반영한 크기
+                page_sizes.append((page.rect.width, page.rect.height))
+
+        info = {'page_count': pdf_document.page_count, 'page_sizes': page_sizes}
+        for key in _METADATA_KEYS:
+            info[key] = metadata.get(key) or ''
+        return info
+
+
+def _read_info_pypdf2(source: Union[str, bytes], include_page_sizes: bool) -> dict:
+    if isinstance(source, bytes):
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(source))
+    else:
+        pdf_reader = PyPDF2.PdfReader(source)
+
+    page_sizes = []
+    if include_page_sizes:
+        for page in pdf_reader.pages:
+            width = float(page.cropbox.width)
+            height = float(page.cropbox.height)
+            if page.get('/Rotate', 0) % 180 == 90:
+                width, height = height, width
+            page_sizes.append((width, height))
+
+    metadata = pdf_reader.metadata or {}
+    info = {'page_count': len(pdf_reader.pages), 'page_sizes': page_sizes}
+    for key in _METADATA_KEYS:
+        info[key] = str(metadata.get(f'/{key.capitalize()}') or '')
+    return info
+
+
+def benchmark(pdf_path: str, repeat: int = 5) -> dict:
+    """
+    기존 방식(변환기와 UI가 각각 PyPDF2로 전체 파싱)과 이 모듈의 조회 시간을 비교합니다.
+
+    Returns:
+        {'legacy_seconds', 'info_seconds', 'cached_seconds'} 평균 시간 딕셔너리
+    """
+    if PyPDF2 is None:
+        raise ImportError("비교 측정에는 PyPDF2가 필요합니다.")
+
+    def _legacy():
+        # 변환기의 페이지 수 확인 + UI의 페이지 수 표시
+        for _ in range(2):
+            with open(pdf_path, 'rb') as file:
+                len(PyPDF2.PdfReader(file).pages)
+
+    def _measure(func):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat
+
+    def _uncached():
+        clear_cache()
+        get_document_info(pdf_path)
+
+    return {
+        'legacy_seconds': _measure(_legacy),
+        'info_seconds': _measure(_uncached),
+        'cached_seconds': _measure(lambda: get_document_info(pdf_path))
+    }
+
+
+def main():
+    """명령줄에서 문서 정보를 출력하거나 조회 시간을 측정합니다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PDF 문서 정보 조회")
+    parser.add_argument("pdf_path", help="PDF 파일 경로")
+    parser.add_argument("--benchmark", action="store_true",
+                       help="기존 PyPDF2 파싱 방식과 조회 시간 비교")
+    parser.add_argument("--repeat", type=int, default=5,
+                       help="측정 반복 횟수 (기본값: 5)")
+
+    args = parser.parse_args()
+
+    try:
+        if args.benchmark:
+            result = benchmark(args.pdf_path, args.repeat)
+            print(f"기존 방식 (PyPDF2 2회): {result['legacy_seconds'] * 1000:.1f} ms")
+            print(f"문서 정보 조회:         {result['info_seconds'] * 1000:.1f} ms")
+            print(f"캐시된 조회:            {result['cached_seconds'] * 1000:.3f} ms")
+        else:
+            info = get_document_info(args.pdf_path)
+            print(f"페이지 수: {info['page_count']}")
+            for key in _METADATA_KEYS:
+                if info[key]:
+                    print(f"{key}: {info[key]}")
+    except Exception as e:
+        print(f"오류 발생: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from PIL import Image
+
+# PNG 색상 타입
+_COLOR_TYPES = {"L": 0, "RGB": 2}
+_BACKGROUND = {"L": 255, "RGB": (255, 255, 255)}
+# 압축된 데이터가 이 크기를 넘으면 IDAT 청크로 내보냄
+_IDAT_CHUNK_SIZE = 256 * 1024
+
+
+class StreamingPNGWriter:
+    """
+    전체 캔버스를 메모리에 만들지 않고 이미지를 위에서부터 행 단위로 기록하는 PNG writer
+
+    최종 크기를 먼저 알려주고 write_image로 페이지를 차례로 추가하면,
+    각 페이지는 캔버스 너비에 맞춰 가운데 정렬된 뒤 바로 압축되어 파일에 기록됩니다.
+    메모리 사용량은 페이지 하나 크기로 제한됩니다.
+    output_path에 바이너리 파일 객체를 주면 그 객체에 기록하며, 닫지 않습니다.
+    """
+
+    def __init__(
+        self,
+        output_path: Union[str, Path, BinaryIO],
+        width: int,
+        height: int,
+        mode: str = "RGB",
+        compress_level: int = 6
+    ):
+        if mode not in _COLOR_TYPES:
+            raise ValueError(f"지원하지 않는 모드입니다: {mode}")
+        if width <= 0 or height <= 0:
+            raise ValueError(f"잘못된 이미지 크기입니다: {width}x{height}")
+
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.rows_written = 0
+
+        if hasattr(output_path, 'write'):
+            self.output_path = None
+            self._file = output_path
+        else:
+            self.output_path = Path(output_path)
+            self._file = open(self.output_path, 'wb')
+        self._closed = False
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending = []
+        self._pending_size = 0
+
+        self._file.write(b'\x89PNG\r\n\x1a\n')
+        self._write_chunk(b'IHDR', struct.pack(
+            ">IIBBBBB", width, height, 8, _COLOR_TYPES[mode], 0, 0, 0
+        ))
+
+    def write_image(self, image: Image.Image, height: Optional[int] = None):
+        """
+        이미지를 다음 행들로 기록합니다.
+
+        Args:
+            image: 기록할 이미지. 캔버스보다 좁으면 가운데 정렬, 넓으면 가운데를 잘라냄
+            height: 이 이미지가 차지할 행 수. 지정하면 이미지 높이가 달라도 잘라내거나
+                흰 배경으로 채워 맞춤 (미리 계산한 레이아웃을 유지하기 위함)
+        """
+        if height is None:
+            height = image.height
+        if self.rows_written + height > self.height:
+            raise ValueError("이미지가 PNG 높이를 초과합니다.")
+
+        if image.mode != self.mode:
+            image = image.convert(self.mode)
+
+        if image.size != (self.width, height):
+            band = Image.new(self.mode, (self.width, height), _BACKGROUND[self.mode])
+            band.paste(image, ((self.width - image.width) // 2, 0))
+            image = band
+
+        raw = image.tobytes()
+        row_size = len(raw) // height
+        view = memoryview(raw)
+        for y in range(height):
+            # 각 행 앞에 필터 타입 0(None) 바이트를 붙임
+            self._compress(b'\x00')
+            self._compress(view[y * row_size:(y + 1) * row_size])
+
+        self.rows_written += height
+
+    def close(self):
+        """남은 행을 흰 배경으로 채우고 파일을 마무리합니다."""
+        if self._closed:
+            return
+
+        try:
+            if self.rows_written < self.height:
+                blank = Image.new(
+                    self.mode, (self.width, self.height - self.rows_written),
+                    _BACKGROUND[self.mode]
+                )
+                self.write_image(blank)
+
+            self._pending.append(self._compressor.flush())
+            self._flush_idat()
+            self._write_chunk(b'IEND', b'')
+        finally:
+            self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 실패한 경우 불완전한 파일을 남기지 않음
+            self._close_file()
+            if self.output_path is not None:
+                self.output_path.unlink(missing_ok=True)
+        return False
+
+    def _close_file(self):
+        self._closed = True
+        # 호출자가 넘긴 파일 객체는 호출자가 닫음
+        if self.output_path is not None:
+            self._file.close()
+
+    def _compress(self, data):
+        compressed = self._compressor.compress(data)
+        if compressed:
+            self._pending.append(compressed)
+            self._pending_size += len(compressed)
+            if self._pending_size >= _IDAT_CHUNK_SIZE:
+                self._flush_idat()
+
+    def _flush_idat(self):
+        if self._pending:
+            self._write_chunk(b'IDAT', b''.join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
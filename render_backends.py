@@ -0,0 +1,491 @@
+"""
+PDF 렌더링 백엔드
+
+변환기는 렌더링을 백엔드에 맡깁니다. 기본 제공 백엔드는 poppler(pdf2image)와
+PyMuPDF이며, register_backend로 다른 엔진을 추가할 수 있습니다.
+get_backend("auto")는 문서마다 샘플 페이지를 각 백엔드로 렌더링해 보고 가장 빠른 것을 고릅니다.
+모든 백엔드는 PDF 파일 경로와 PDF 바이트를 모두 입력으로 받습니다.
+저장/인코딩은 encode_workers개의 스레드에서 렌더링과 겹쳐 실행하며, 인코더 설정은
+encoder_profile로 고릅니다 (encode_pipeline, image_encoding 참고).
+color_mode가 "gray"나 "bilevel"이면 RGB로 렌더링한 뒤 변환하지 않고 그레이스케일로 바로 렌더링하며,
+bilevel은 그 결과를 threshold로 자르거나 dither로 오차 확산하여 1비트 이미지로 만듭니다.
+"""
+
+import hashlib
+import io
+import logging
+import math
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from PIL import Image
+
+from document_pool import document_pool
+from encode_pipeline import DEFAULT_ENCODE_WORKERS, pipelined_map
+from image_encoding import DEFAULT_PROFILE, encode_image, normalize_format, save_image
+from pdf_info import get_page_count, get_page_sizes
+
+try:
+    from pdf2image import convert_from_path
+except ImportError:
+    convert_from_path = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+# PDF 입력: 파일 경로 또는 PDF 바이트
+PDFSource = Union[str, Path, bytes]
+
+# 렌더링 색 공간: rgb(24비트), gray(8비트 그레이스케일), bilevel(1비트 흑백)
+COLOR_MODES = ("rgb", "gray", "bilevel")
+# bilevel에서 이 값(0~255) 이상인 픽셀을 흰색으로 봄
+BILEVEL_THRESHOLD = 128
+
+
+def to_color_mode(
+    image: Image.Image,
+    color_mode: str,
+    threshold: int = BILEVEL_THRESHOLD,
+    dither: bool = False
+) -> Image.Image:
+    """
+    렌더링한 이미지를 color_mode에 맞춥니다. 백엔드가 이미 그레이스케일로 렌더링했으면
+    gray는 그대로 반환하고, bilevel은 threshold로 자르거나 dither이면 Floyd-Steinberg로 오차 확산합니다.
+    """
+    if color_mode == "rgb":
+        return image
+    if image.mode != "L":
+        image = image.convert("L")
+    if color_mode == "gray":
+        return image
+    if dither:
+        return image.convert("1")
+    return image.point([0] * threshold + [255] * (256 - threshold), "1")
+
+
+class RenderBackend:
+    """
+    렌더링 백엔드 기본 클래스
+
+    하위 클래스는 최소한 render_page를 구현해야 합니다. 페이지 번호는 1부터 시작합니다.
+    """
+
+    name = ""
+    # save_pages/encode_pages에서 렌더링과 겹쳐 인코딩할 스레드 수 (1이면 렌더링 스레드에서 인코딩)
+    encode_workers = DEFAULT_ENCODE_WORKERS
+    # save_pages/encode_pages에서 쓸 인코더 프로필 (image_encoding.ENCODER_PROFILES)
+    encoder_profile = DEFAULT_PROFILE
+    # 무손실 설정이 있는 형식(WebP)을 무손실로 인코딩할지 여부
+    lossless = False
+    # 렌더링 색 공간 (COLOR_MODES)과 bilevel 변환 방식
+    color_mode = "rgb"
+    threshold = BILEVEL_THRESHOLD
+    dither = False
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """필요한 라이브러리/프로그램이 설치되어 있는지 여부"""
+        return True
+
+    def render_page(self, pdf_path: PDFSource, page_num: int, dpi: int) -> Image.Image:
+        """
+        한 페이지를 렌더링합니다.
+
+        color_mode가 rgb가 아니면 가능한 한 그레이스케일로 바로 렌더링합니다 (1비트 변환은 iter_pages에서).
+        """
+        raise NotImplementedError
+
+    def iter_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        """
+        주어진 페이지를 하나씩 렌더링하여 (페이지 번호, 이미지)를 반환합니다.
+
+        재정의하는 백엔드도 반환하기 전에 to_color_mode를 적용해야 합니다.
+        """
+        for page_num in page_nums:
+            yield page_num, self.to_color_mode(self.render_page(pdf_path, page_num, dpi))
+
+    def to_color_mode(self, image: Image.Image) -> Image.Image:
+        """렌더링한 이미지를 백엔드의 color_mode에 맞춥니다."""
+        return to_color_mode(image, self.color_mode, self.threshold, self.dither)
+
+    def save_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str,
+        output_path_for: Callable[[int], Path]
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        주어진 페이지를 렌더링하여 저장하고 (페이지 번호, 파일 경로)를 반환합니다.
+
+        백엔드가 이미지 객체를 거치지 않고 바로 저장할 수 있으면 재정의합니다.
+        """
+        def write(page_num: int, image: Image.Image) -> Tuple[int, str]:
+            output_path = output_path_for(page_num)
+            save_image(image, output_path, output_format, self.encoder_profile, self.lossless)
+            return page_num, str(output_path)
+
+        return pipelined_map(write, self.iter_pages(pdf_path, page_nums, dpi), self.encode_workers)
+
+    def encode_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str
+    ) -> Iterator[Tuple[int, Union[bytes, memoryview]]]:
+        """
+        주어진 페이지를 렌더링하여 출력 형식으로 인코딩한 바이트를 반환합니다.
+
+        파일을 쓰지 않으므로 결과를 바로 응답하거나 다른 곳에 전달할 때 사용합니다.
+        """
+        return pipelined_map(
+            lambda page_num, image: (
+                page_num, encode_image(image, output_format, self.encoder_profile, self.lossless)
+            ),
+            self.iter_pages(pdf_path, page_nums, dpi),
+            self.encode_workers
+        )
+
+    def effective_dpi(self, pdf_path: PDFSource, page_num: int, dpi: int) -> int:
+        """요청한 DPI로 렌더링할 때 페이지에 실제로 적용되는 DPI (메모리 예산 등으로 달라질 수 있음)"""
+        return dpi
+
+    def page_pixel_sizes(self, pdf_path: PDFSource, dpi: int) -> List[Tuple[int, int]]:
+        """렌더링하지 않고 페이지별 픽셀 크기를 계산합니다."""
+        return [
+            (math.ceil(width * dpi / 72.0), math.ceil(height * dpi / 72.0))
+            for width, height in get_page_sizes(pdf_path)
+        ]
+
+
+class PopplerBackend(RenderBackend):
+    """pdf2image(poppler pdftoppm)를 사용하는 백엔드"""
+
+    name = "poppler"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return convert_from_path is not None and shutil.which("pdftoppm") is not None
+
+    def render_page(self, pdf_path: PDFSource, page_num: int, dpi: int) -> Image.Image:
+        if isinstance(pdf_path, bytes):
+            return self._render_page_stdin(pdf_path, page_num, dpi)
+
+        images = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=page_num,
+            last_page=page_num,
+            grayscale=self.color_mode != "rgb"
+        )
+        if not images:
+            raise ValueError(f"페이지 {page_num}을(를) 렌더링할 수 없습니다.")
+        return images[0]
+
+    def _render_page_stdin(self, pdf_bytes: bytes, page_num: int, dpi: int) -> Image.Image:
+        """
+        PDF 바이트를 pdftoppm의 표준 입력으로 넘기고 표준 출력의 PPM을 읽습니다.
+
+        pdf2image의 convert_from_bytes는 임시 파일을 거치므로 직접 실행합니다.
+        """
+        command = [
+            "pdftoppm", "-r", str(dpi),
+            "-f", str(page_num), "-l", str(page_num),
+            "-singlefile"
+        ]
+        if self.color_mode != "rgb":
+            # PPM 대신 그레이스케일 PGM으로 출력
+            command.append("-gray")
+        result = subprocess.run(
+            command + ["-"],
+            input=pdf_bytes,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        if result.returncode != 0 or not result.stdout:
+            message = result.stderr.decode(errors="replace").strip()
+            raise ValueError(f"페이지 {page_num}을(를) 렌더링할 수 없습니다: {message}")
+
+        image = Image.open(io.BytesIO(result.stdout))
+        image.load()
+        return image
+
+
+# pixmap 채널 수 -> PIL 모드
+_PIXMAP_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+
+
+def pixmap_to_image(pix: "fitz.Pixmap") -> Image.Image:
+    """
+    pixmap의 raw 샘플을 그대로 PIL Image로 감쌉니다.
+
+    PNG로 인코딩했다가 다시 디코딩하는 과정 없이 샘플 버퍼를 직접 사용합니다.
+    """
+    mode = _PIXMAP_MODES[pix.n]
+    return Image.frombuffer(
+        mode, (pix.width, pix.height), pix.samples, "raw", mode, pix.stride, 1
+    )
+
+
+def _mupdf_encodes(output_format: str, profile: str) -> bool:
+    """
+    MuPDF 인코더로 바로 인코딩할지 여부.
+
+    MuPDF의 PNG 인코더는 balanced와 같은 기본 압축 레벨을 쓰며 Pillow보다 빠르지만 레벨을 바꿀 수 없고,
+    JPEG 인코더는 Pillow보다 열 배 가까이 느리므로 쓰지 않습니다.
+    """
+    return normalize_format(output_format) == "PNG" and profile == DEFAULT_PROFILE
+
+
+def save_pixmap(
+    pix: "fitz.Pixmap",
+    output_path: Union[str, Path],
+    output_format: str,
+    profile: str = DEFAULT_PROFILE
+) -> bool:
+    """
+    Pillow를 거치지 않아도 되면(balanced PNG) pixmap에서 바로 저장합니다.
+
+    Returns:
+        직접 저장했으면 True, Pillow를 거쳐야 하면 False
+    """
+    if _mupdf_encodes(output_format, profile):
+        pix.save(str(output_path), output="png")
+        return True
+    return False
+
+
+def encode_pixmap(pix: "fitz.Pixmap", output_format: str, profile: str = DEFAULT_PROFILE) -> Optional[bytes]:
+    """
+    Pillow를 거치지 않아도 되면(balanced PNG) pixmap에서 바로 인코딩합니다.
+
+    Returns:
+        인코딩된 바이트, Pillow를 거쳐야 하면 None
+    """
+    if _mupdf_encodes(output_format, profile):
+        return pix.tobytes(output="png")
+    return None
+
+
+def open_document(pdf_path: PDFSource) -> "fitz.Document":
+    """
+    PDF 파일 경로 또는 PDF 바이트로 PyMuPDF 문서를 새로 엽니다.
+
+    호출자가 닫아야 합니다. 짧게 쓰고 닫는 경우에는 document_pool.document로 핸들을 재사용하세요.
+    """
+    if isinstance(pdf_path, bytes):
+        return fitz.open(stream=pdf_path, filetype="pdf")
+    return fitz.open(pdf_path)
+
+
+class PyMuPDFBackend(RenderBackend):
+    """PyMuPDF(fitz)로 프로세스 안에서 렌더링하는 백엔드"""
+
+    name = "pymupdf"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return fitz is not None
+
+    def iter_pixmaps(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int
+    ) -> Iterator[Tuple[int, "fitz.Pixmap"]]:
+        """
+        문서 핸들을 풀에서 빌려 주어진 페이지를 하나씩 pixmap으로 렌더링합니다.
+        color_mode가 rgb가 아니면 그레이스케일 pixmap으로 렌더링합니다.
+        """
+        # DPI에 따른 스케일 팩터 계산
+        scale_factor = dpi / 72.0
+        mat = fitz.Matrix(scale_factor, scale_factor)
+        colorspace = fitz.csRGB if self.color_mode == "rgb" else fitz.csGRAY
+
+        with document_pool.document(pdf_path) as pdf_document:
+            for page_num in page_nums:
+                yield page_num, pdf_document[page_num - 1].get_pixmap(matrix=mat, colorspace=colorspace)
+
+    def render_page(self, pdf_path: PDFSource, page_num: int, dpi: int) -> Image.Image:
+        for _, image in self.iter_pages(pdf_path, [page_num], dpi):
+            return image
+
+    def iter_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        for page_num, pix in self.iter_pixmaps(pdf_path, page_nums, dpi):
+            yield page_num, self.to_color_mode(pixmap_to_image(pix))
+
+    def save_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str,
+        output_path_for: Callable[[int], Path]
+    ) -> Iterator[Tuple[int, str]]:
+        if self.encode_workers > 1 or self.color_mode == "bilevel":
+            # MuPDF 호출은 스레드 안전하지 않으므로 인코딩 스레드에서는 Pillow로 저장
+            # (1비트 이미지도 MuPDF로 저장할 수 없으므로 Pillow로 저장)
+            yield from super().save_pages(pdf_path, page_nums, dpi, output_format, output_path_for)
+            return
+        for page_num, pix in self.iter_pixmaps(pdf_path, page_nums, dpi):
+            output_path = output_path_for(page_num)
+            # balanced PNG는 Pillow를 거치지 않고 pixmap에서 바로 저장
+            if not save_pixmap(pix, output_path, output_format, self.encoder_profile):
+                save_image(pixmap_to_image(pix), output_path, output_format, self.encoder_profile, self.lossless)
+            yield page_num, str(output_path)
+
+    def encode_pages(
+        self,
+        pdf_path: PDFSource,
+        page_nums: Iterable[int],
+        dpi: int,
+        output_format: str
+    ) -> Iterator[Tuple[int, Union[bytes, memoryview]]]:
+        if self.encode_workers > 1 or self.color_mode == "bilevel":
+            yield from super().encode_pages(pdf_path, page_nums, dpi, output_format)
+            return
+        for page_num, pix in self.iter_pixmaps(pdf_path, page_nums, dpi):
+            data = encode_pixmap(pix, output_format, self.encoder_profile)
+            if data is None:
+                data = encode_image(pixmap_to_image(pix), output_format, self.encoder_profile, self.lossless)
+            yield page_num, data
+
+    def page_pixel_sizes(self, pdf_path: PDFSource, dpi: int) -> List[Tuple[int, int]]:
+        # MuPDF의 픽셀 경계 반올림 규칙을 그대로 따르도록 irect 사용
+        scale_factor = dpi / 72.0
+        mat = fitz.Matrix(scale_factor, scale_factor)
+        with document_pool.document(pdf_path) as pdf_document:
+            return [
+                ((page.rect * mat).irect.width, (page.rect * mat).irect.height)
+                for page in pdf_document
+            ]
+
+
+# 이름 -> 백엔드 클래스. 순서는 auto 모드에서 측정 없이 고를 때의 우선순위
+BACKENDS: Dict[str, Type[RenderBackend]] = {
+    PyMuPDFBackend.name: PyMuPDFBackend,
+    PopplerBackend.name: PopplerBackend,
+}
+
+# 샘플 측정을 생략하고 우선순위로 고르는 최대 페이지 수
+AUTO_PROBE_MIN_PAGES = 3
+
+# (문서 경로, 수정 시각, DPI) -> auto 모드에서 고른 백엔드 이름
+_auto_choices: Dict[Tuple[str, int, int], str] = {}
+_auto_lock = threading.Lock()
+
+
+def register_backend(backend_class: Type[RenderBackend]) -> Type[RenderBackend]:
+    """새 백엔드를 등록합니다. 클래스 데코레이터로도 사용할 수 있습니다."""
+    if not backend_class.name or backend_class.name == "auto":
+        raise ValueError(f"사용할 수 없는 백엔드 이름입니다: {backend_class.name!r}")
+    BACKENDS[backend_class.name] = backend_class
+    return backend_class
+
+
+def available_backends() -> List[str]:
+    """현재 환경에서 사용 가능한 백엔드 이름 목록"""
+    return [name for name, backend_class in BACKENDS.items() if backend_class.is_available()]
+
+
+def get_backend(
+    name: str,
+    pdf_path: Optional[PDFSource] = None,
+    dpi: int = 200
+) -> RenderBackend:
+    """
+    이름으로 백엔드를 만듭니다.
+
+    Args:
+        name: 백엔드 이름 또는 "auto"
+        pdf_path: auto 모드에서 측정할 PDF 파일 경로 또는 PDF 바이트
+        dpi: auto 모드에서 측정할 해상도
+    """
+    if name == "auto":
+        if pdf_path is None:
+            raise ValueError("auto 백엔드는 PDF 파일 경로 또는 PDF 바이트가 필요합니다.")
+        return select_backend(pdf_path, dpi)
+
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드입니다: {name} (사용 가능: {', '.join(BACKENDS)})")
+
+    backend_class = BACKENDS[name]
+    if not backend_class.is_available():
+        raise RuntimeError(
+            f"{name} 백엔드를 사용할 수 없습니다. 필요한 라이브러리/프로그램이 설치되어 있는지 확인하세요."
+        )
+    return backend_class()
+
+
+def select_backend(pdf_path: PDFSource, dpi: int = 200) -> RenderBackend:
+    """
+    문서에 가장 빠른 백엔드를 고릅니다.
+
+    페이지가 적으면 측정 비용이 더 크므로 우선순위대로 고르고, 그렇지 않으면
+    문서 가운데 페이지를 요청한 DPI로 각 백엔드가 렌더링하는 시간을 재서 고릅니다.
+    이미지 위주 문서와 벡터 위주 문서, 해상도에 따라 빠른 엔진이 달라지기 때문입니다.
+    결과는 같은 문서/DPI에 대해 재사용합니다.
+    """
+    candidates = available_backends()
+    if not candidates:
+        raise RuntimeError("사용 가능한 렌더링 백엔드가 없습니다. PyMuPDF 또는 poppler를 설치하세요.")
+    if len(candidates) == 1:
+        return BACKENDS[candidates[0]]()
+
+    if isinstance(pdf_path, bytes):
+        key = (hashlib.sha256(pdf_path).hexdigest(), 0, dpi)
+    else:
+        pdf_path = Path(pdf_path)
+        key = (str(pdf_path.resolve()), pdf_path.stat().st_mtime_ns, dpi)
+    with _auto_lock:
+        chosen = _auto_choices.get(key)
+    if chosen is not None:
+        return BACKENDS[chosen]()
+
+    page_count = get_page_count(pdf_path)
+    if page_count <= AUTO_PROBE_MIN_PAGES:
+        chosen = candidates[0]
+        logger.info(f"백엔드 자동 선택: {chosen} ({page_count}페이지, 측정 생략)")
+    else:
+        sample_page = page_count // 2 + 1
+        timings = {}
+        for name in candidates:
+            backend = BACKENDS[name]()
+            started = time.perf_counter()
+            try:
+                backend.render_page(pdf_path, sample_page, dpi)
+            except Exception as e:
+                logger.warning(f"{name} 백엔드 측정 실패: {e}")
+                continue
+            timings[name] = time.perf_counter() - started
+
+        if not timings:
+            raise RuntimeError("모든 백엔드가 샘플 페이지 렌더링에 실패했습니다.")
+
+        chosen = min(timings, key=timings.get)
+        summary = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items())
+        logger.info(f"백엔드 자동 선택: {chosen} (페이지 {sample_page}, {dpi} DPI: {summary})")
+
+    with _auto_lock:
+        _auto_choices[key] = chosen
+    return BACKENDS[chosen]()
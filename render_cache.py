@@ -0,0 +1,214 @@
+import os
+import hashlib
+import logging
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional, Union
+
+
+class RenderCache:
+    """
+    렌더링된 페이지 이미지를 디스크에 보관하는 내용 주소 기반 캐시
+
+    키는 PDF 내용 해시, 페이지 번호, DPI, 출력 형식, 품질 등 변환 옵션으로 구성됩니다.
+    항목은 파일로 저장되므로 같은 캐시 디렉토리를 쓰는 여러 프로세스가 공유할 수 있고,
+    파일 수정 시각을 최근 사용 시각으로 삼아 용량 상한을 넘으면 오래된 항목부터 삭제합니다(LRU).
+    """
+
+    def __init__(self, cache_dir: str = ".render_cache", max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # 다른 프로세스가 추가한 항목은 반영되지 않으므로 상한을 넘을 때마다 다시 계산
+        self._approx_size = self._scan_size()
+
+    def __getstate__(self):
+        # 다른 프로세스(변환 서비스의 작업 프로세스)로 넘길 때 잠금은 새로 만듦
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_file(pdf_path: Union[str, Path]) -> str:
+        """PDF 파일 내용의 SHA-256 해시를 반환합니다."""
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """PDF 바이트의 SHA-256 해시를 반환합니다."""
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def make_key(
+        pdf_hash: str,
+        page_num: int,
+        dpi: int,
+        output_format: str,
+        quality: Optional[int] = None,
+        **options
+    ) -> str:
+        """
+        캐시 키를 만듭니다.
+
+        Args:
+            pdf_hash: PDF 내용 해시
+            page_num: 페이지 번호 (1부터 시작)
+            dpi: 이미지 해상도
+            output_format: 출력 이미지 형식
+            quality: 손실 압축 품질 (해당 없으면 None)
+            **options: 출력 결과에 영향을 주는 기타 변환 옵션
+        """
+        parts = [pdf_hash, str(page_num), str(dpi), output_format.upper(), str(quality)]
+        parts += [f"{name}={options[name]}" for name in sorted(options)]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def fetch(self, key: str, dest_path: Union[str, Path]) -> bool:
+        """
+        캐시된 항목을 dest_path로 복사합니다.
+
+        Returns:
+            캐시 적중이면 True, 아니면 False
+        """
+        entry_path = self._entry_path(key)
+        try:
+            shutil.copyfile(entry_path, dest_path)
+            # 최근 사용 시각 갱신 (LRU)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def contains(self, key: str) -> bool:
+        """항목이 있는지 확인합니다. 없으면 미스로 집계합니다."""
+        if self._entry_path(key).exists():
+            return True
+        with self._lock:
+            self.misses += 1
+        return False
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """캐시된 항목의 내용을 반환합니다. 없으면 None"""
+        entry_path = self._entry_path(key)
+        try:
+            data = entry_path.read_bytes()
+            os.utime(entry_path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, source_path: Union[str, Path]):
+        """렌더링 결과 파일을 캐시에 저장합니다."""
+        with open(source_path, 'rb') as source:
+            self._write_entry(key, lambda tmp_file: shutil.copyfileobj(source, tmp_file))
+
+    def put_bytes(self, key: str, data: Union[bytes, memoryview]):
+        """인코딩된 이미지 바이트를 캐시에 저장합니다."""
+        self._write_entry(key, lambda tmp_file: tmp_file.write(data))
+
+    def _write_entry(self, key: str, write: Callable[[BinaryIO], object]):
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(exist_ok=True)
+
+        # 다른 프로세스가 절반만 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                write(tmp_file)
+            os.replace(tmp_path, entry_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._approx_size += entry_path.stat().st_size
+            over_limit = self._approx_size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def evict(self):
+        """용량 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        with self._lock:
+            entries = []
+            for entry_path in self.cache_dir.glob("*/*"):
+                if entry_path.suffix == ".tmp":
+                    continue
+                try:
+                    stat = entry_path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+            total_size = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, entry_path in sorted(entries):
+                if total_size <= self.max_bytes:
+                    break
+                try:
+                    entry_path.unlink()
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                removed += 1
+
+            self._approx_size = total_size
+
+        if removed:
+            self.logger.info(f"렌더 캐시 정리: {removed}개 항목 삭제")
+
+    def stats(self) -> dict:
+        """적중/미스 횟수와 현재 캐시 크기를 반환합니다."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size_bytes': self._scan_size(),
+                'max_bytes': self.max_bytes
+            }
+
+    def clear(self):
+        """캐시의 모든 항목을 삭제합니다."""
+        with self._lock:
+            for entry_path in self.cache_dir.glob("*/*"):
+                try:
+                    entry_path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._approx_size = 0
+
+    def _entry_path(self, key: str) -> Path:
+        # 한 디렉토리에 파일이 너무 많아지지 않도록 키 앞 두 글자로 분산
+        return self.cache_dir / key[:2] / key
+
+    def _scan_size(self) -> int:
+        total_size = 0
+        for entry_path in self.cache_dir.glob("*/*"):
+            try:
+                total_size += entry_path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total_size
@@ -1,8 +1,15 @@
 import streamlit as st
 import os
-from pathlib import Path
-import tempfile
-from pdf_converter import PDFConverter
+import time
+from conversion_service import (
+    CANCELLED, DONE, FAILED, QUEUED, RUNNING, LocalConversionService, QueueFullError
+)
+from image_encoding import DEFAULT_PROFILE, ENCODER_PROFILES, mime_type, supported_formats
+from memory_budget import MemoryBudget
+from pdf_info import get_document_info
+from render_backends import BACKENDS, BILEVEL_THRESHOLD, COLOR_MODES
+from render_cache import RenderCache
+from thumbnails import GALLERY_WINDOW, ThumbnailRenderer, page_window, window_count
 
 # 페이지 설정
 st.set_page_config(
@@ -11,6 +18,33 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_render_cache():
+    """세션과 재실행 사이에 공유하는 디스크 렌더 캐시"""
+    return RenderCache(os.environ.get("PDF_RENDER_CACHE_DIR", ".render_cache"))
+
+@st.cache_resource
+def get_conversion_service():
+    """세션 사이에 공유하는 변환 작업 대기열 (동시 변환 수를 워커 수로 제한)"""
+    return LocalConversionService(
+        workers=int(os.environ.get("PDF_CONVERSION_WORKERS", "2")),
+        cache=get_render_cache(),
+        # 큰 도면을 높은 DPI로 렌더링해도 워커 메모리를 넘지 않도록 페이지당 래스터 크기 제한
+        memory_budget=MemoryBudget(
+            max_pixels=int(float(os.environ.get("PDF_MAX_PAGE_MEGAPIXELS", "100")) * 1_000_000)
+        )
+    )
+
+@st.cache_resource
+def get_thumbnail_renderer():
+    """갤러리 미리보기용 썸네일 렌더러 (변환 결과와 별도의 캐시 사용)"""
+    return ThumbnailRenderer(
+        cache=RenderCache(
+            os.environ.get("PDF_THUMBNAIL_CACHE_DIR", ".thumbnail_cache"),
+            max_bytes=256 * 1024 * 1024
+        )
+    )
+
 # 제목과 설명
 st.title("🔄 PDF to Image Converter")
 st.markdown("PDF 파일을 PNG, JPEG, TIFF 등의 이미지 형식으로 변환하는 프로그램입니다.")
@@ -22,15 +56,47 @@ with st.sidebar:
     # 출력 형식 선택
     output_format = st.selectbox(
         "출력 이미지 형식",
-        ["PNG", "JPEG", "TIFF", "BMP", "GIF"],
+        supported_formats(),
         index=0
     )
     
+    # 인코더 프로필 (압축 속도와 파일 크기)
+    encoder_profile = st.selectbox(
+        "인코딩 프로필",
+        list(ENCODER_PROFILES),
+        index=list(ENCODER_PROFILES).index(DEFAULT_PROFILE),
+        help="fast: 빠르게 저장(파일이 조금 큼), archival: 느리지만 가장 작고 화질이 좋음"
+    )
+    lossless = False
+    if output_format == "WEBP":
+        lossless = st.checkbox("무손실 WebP", help="텍스트/도면 페이지는 PNG보다 훨씬 작습니다")
+    
+    # 색상 모드 (흑백 계약서/청구서는 그레이스케일이나 1비트 흑백이 훨씬 작음)
+    color_mode = st.selectbox(
+        "색상 모드",
+        list(COLOR_MODES),
+        format_func=lambda mode: {"rgb": "컬러 (RGB)", "gray": "그레이스케일", "bilevel": "1비트 흑백"}[mode],
+        help="텍스트 문서는 그레이스케일(8비트)이나 1비트 흑백(TIFF는 CCITT Group 4)으로 저장하면 훨씬 작습니다"
+    )
+    threshold = BILEVEL_THRESHOLD
+    dither = False
+    if color_mode == "bilevel":
+        threshold = st.slider(
+            "흑백 기준 밝기", 0, 255, BILEVEL_THRESHOLD,
+            help="밝기가 이 값 이상인 픽셀은 흰색이 됩니다. 배경이 옅은 스캔은 낮추세요"
+        )
+        dither = st.checkbox("디더링", help="사진이나 회색 영역이 있는 문서는 기준 밝기 대신 디더링을 사용합니다")
+    
     # DPI 설정
     dpi = st.slider("이미지 해상도 (DPI)", 100, 600, 200, 50)
     
-    # 출력 디렉토리 설정
-    output_dir = st.text_input("출력 디렉토리", "converted_images")
+    # 렌더링 백엔드 선택
+    backend = st.selectbox(
+        "렌더링 백엔드",
+        list(BACKENDS) + ["auto"],
+        index=list(BACKENDS).index("poppler"),
+        help="auto: 문서마다 샘플 페이지를 측정하여 더 빠른 백엔드를 사용합니다"
+    )
     
     # 변환 옵션
     st.subheader("변환 옵션")
@@ -77,12 +143,11 @@ with col2:
         for key, value in file_details.items():
             st.write(f"**{key}:** {value}")
         
-        # PDF 페이지 수 확인 (간단한 방법)
+        # PDF 페이지 수 확인 (페이지 수만 가볍게 읽음)
         try:
-            import PyPDF2
-            uploaded_file.seek(0)
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            page_count = len(pdf_reader.pages)
+            page_count = get_document_info(
+                uploaded_file.getvalue(), include_page_sizes=False
+            )['page_count']
             st.write(f"**총 페이지 수:** {page_count}")
             
             # 페이지 범위 설정이 활성화된 경우 기본값 설정
@@ -97,74 +162,145 @@ with col2:
 if uploaded_file is not None:
     st.subheader("🚀 변환 실행")
     
+    service = get_conversion_service()
+    
     if st.button("변환 시작", type="primary"):
+        # 페이지 범위 설정
+        first_page_arg = None
+        last_page_arg = None
+        
+        if not convert_to_single and 'use_page_range' in locals() and use_page_range:
+            first_page_arg = first_page
+            last_page_arg = last_page
+        
+        # 이전 작업과 메모리에 보관한 결과 정리
+        previous_job_id = st.session_state.pop("job_id", None)
+        if previous_job_id:
+            service.cancel(previous_job_id)
+            service.remove_job(previous_job_id)
+        
         try:
-            with st.spinner("PDF를 이미지로 변환 중..."):
-                # 임시 파일로 PDF 저장
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_pdf_path = tmp_file.name
-                
-                try:
-                    # PDF 변환기 초기화
-                    converter = PDFConverter(output_dir)
-                    
-                    # 변환 실행
-                    if convert_to_single:
-                        output_file = converter.convert_pdf_to_single_image(
-                            tmp_pdf_path, output_format, dpi
-                        )
-                        st.success(f"✅ 변환 완료!")
-                        st.info(f"출력 파일: {output_file}")
-                        
-                        # 변환된 이미지 표시
-                        st.image(output_file, caption="변환된 이미지", use_container_width=True)
-                        
-                    else:
-                        # 페이지 범위 설정
-                        first_page_arg = None
-                        last_page_arg = None
-                        
-                        if 'use_page_range' in locals() and use_page_range:
-                            first_page_arg = first_page
-                            last_page_arg = last_page
-                        
-                        output_files = converter.convert_pdf_to_images(
-                            tmp_pdf_path, output_format, dpi,
-                            first_page_arg, last_page_arg
-                        )
-                        
-                        st.success(f"✅ 변환 완료! {len(output_files)}개 파일이 생성되었습니다.")
-                        
-                        # 변환된 이미지들 표시
-                        st.subheader("🖼️ 변환된 이미지들")
-                        
-                        # 이미지를 그리드 형태로 표시
-                        cols = st.columns(min(3, len(output_files)))
-                        for i, file_path in enumerate(output_files):
-                            col_idx = i % 3
-                            with cols[col_idx]:
-                                st.image(file_path, caption=Path(file_path).name, use_container_width=True)
-                        
-                        # 다운로드 링크 제공
-                        st.subheader("📥 다운로드")
-                        for file_path in output_files:
-                            file_name = Path(file_path).name
-                            with open(file_path, 'rb') as f:
-                                st.download_button(
-                                    label=f"📄 {file_name} 다운로드",
-                                    data=f.read(),
-                                    file_name=file_name,
-                                    mime="image/png" if output_format.lower() == "png" else "image/jpeg"
-                                )
-                
-                finally:
-                    # 임시 파일 정리
-                    os.unlink(tmp_pdf_path)
-                    
-        except Exception as e:
-            st.error(f"❌ 변환 중 오류가 발생했습니다: {str(e)}")
-            st.exception(e)
+            st.session_state.job_id = service.submit(
+                uploaded_file.getvalue(),
+                filename=uploaded_file.name,
+                output_format=output_format,
+                dpi=dpi,
+                first_page=first_page_arg,
+                last_page=last_page_arg,
+                single_image=convert_to_single,
+                streaming=(output_format == "PNG"),
+                backend=backend,
+                encoder_profile=encoder_profile,
+                lossless=lossless,
+                color_mode=color_mode,
+                threshold=threshold,
+                dither=dither
+            )
+        except QueueFullError as e:
+            st.warning(f"⏳ {e}")
+    
+    job_id = st.session_state.get("job_id")
+    job = service.get_job(job_id) if job_id else None
+    
+    if job is not None and job['status'] in (QUEUED, RUNNING):
+        # 작업이 끝날 때까지 진행률을 표시하며 주기적으로 다시 조회
+        if job['status'] == QUEUED:
+            st.progress(0.0, text="⏳ 변환 대기 중...")
+        else:
+            total = job['total_pages'] or 1
+            st.progress(
+                job['completed_pages'] / total,
+                text=f"PDF를 이미지로 변환 중... ({job['completed_pages']}/{job['total_pages']}페이지)"
+            )
+        
+        if st.button("⏹️ 변환 취소"):
+            service.cancel(job_id)
+        
+        time.sleep(0.5)
+        st.rerun()
+    
+    elif job is not None and job['status'] == DONE:
+        # 변환 결과는 디스크를 거치지 않고 메모리에서 바로 표시/다운로드
+        outputs = service.get_outputs(job_id)
+        # 사이드바 설정이 바뀌었어도 작업을 등록할 때의 형식 사용
+        output_format = job['options']['output_format']
+        
+        # 메모리 예산 때문에 해상도를 낮춘 페이지 안내
+        for report in job['downscaled_pages']:
+            st.warning(
+                f"⚠️ 페이지 {report['page']}: 페이지가 너무 커서 {report['requested_dpi']} DPI 대신 "
+                f"{report['dpi']} DPI로 변환했습니다. ({report['width']}x{report['height']}px)"
+            )
+        
+        if job['options']['single_image']:
+            file_name, image_data = outputs[0]
+            image_data = bytes(image_data)
+            st.success(f"✅ 변환 완료!")
+            
+            # 변환된 이미지 표시
+            st.image(image_data, caption="변환된 이미지", use_container_width=True)
+            st.download_button(
+                label=f"📄 {file_name} 다운로드",
+                data=image_data,
+                file_name=file_name,
+                mime=mime_type(output_format)
+            )
+            
+        else:
+            st.success(f"✅ 변환 완료! {len(outputs)}개 이미지가 생성되었습니다.")
+            cache_stats = get_render_cache().stats()
+            st.caption(f"렌더 캐시: 적중 {cache_stats['hits']}회, 미스 {cache_stats['misses']}회")
+            
+            # 변환된 이미지들 표시 (전체 해상도 파일 대신 PDF에서 바로 렌더링한 썸네일 사용)
+            st.subheader("🖼️ 변환된 이미지들")
+            
+            # 페이지가 많으면 창 단위로 나누어 현재 창의 이미지와 다운로드 버튼만 세션에 올림
+            windows = window_count(len(outputs))
+            window_index = 0
+            if windows > 1:
+                window_index = st.selectbox(
+                    "표시할 이미지",
+                    range(windows),
+                    format_func=lambda index: (
+                        f"{page_window(outputs, index)[0][0]} ~ {page_window(outputs, index)[-1][0]}"
+                    ),
+                    key="gallery_window"
+                )
+            window_outputs = page_window(outputs, window_index)
+            
+            # 이미지를 그리드 형태로 표시
+            pdf_bytes = uploaded_file.getvalue()
+            pdf_hash = RenderCache.hash_bytes(pdf_bytes)
+            first_page_num = (job['options'].get('first_page') or 1) + window_index * GALLERY_WINDOW
+            page_nums = range(first_page_num, first_page_num + len(window_outputs))
+            thumbnail_renderer = get_thumbnail_renderer()
+            thumbnails = thumbnail_renderer.iter_thumbnails(pdf_bytes, page_nums, pdf_hash=pdf_hash)
+            cols = st.columns(min(3, len(window_outputs)))
+            for i, ((file_name, _), (_, thumbnail)) in enumerate(zip(window_outputs, thumbnails)):
+                col_idx = i % 3
+                with cols[col_idx]:
+                    st.image(thumbnail, caption=file_name, use_container_width=True)
+            
+            # 다음 창의 썸네일은 백그라운드에서 미리 렌더링
+            next_first = first_page_num + len(window_outputs)
+            next_count = len(page_window(outputs, window_index + 1))
+            thumbnail_renderer.prefetch(pdf_bytes, range(next_first, next_first + next_count), pdf_hash=pdf_hash)
+            
+            # 다운로드 링크 제공
+            st.subheader("📥 다운로드")
+            for file_name, image_data in window_outputs:
+                st.download_button(
+                    label=f"📄 {file_name} 다운로드",
+                    data=bytes(image_data),
+                    file_name=file_name,
+                    mime=mime_type(output_format)
+                )
+    
+    elif job is not None and job['status'] == FAILED:
+        st.error(f"❌ 변환 중 오류가 발생했습니다: {job['error']}")
+    
+    elif job is not None and job['status'] == CANCELLED:
+        st.warning("⏹️ 변환이 취소되었습니다.")
 
 # 사용법 안내
 with st.expander("📖 사용법"):
@@ -182,11 +318,12 @@ with st.expander("📖 사용법"):
     
     ### 지원 형식
     - **입력**: PDF
-    - **출력**: PNG, JPEG, TIFF, BMP, GIF
+    - **출력**: PNG, JPEG, TIFF, BMP, GIF, WebP, AVIF
     
     ### 팁
     - 고품질 이미지가 필요한 경우 DPI를 높게 설정하세요
     - 파일 크기를 줄이고 싶다면 JPEG 형식을 사용하세요
+    - 웹에 올릴 이미지는 WebP(텍스트 페이지는 무손실)나 AVIF가 가장 작습니다
     - 투명도가 필요한 경우 PNG 형식을 사용하세요
     """)
 
@@ -211,9 +348,6 @@ with st.expander("🔧 문제 해결"):
     **4. 메모리 부족 오류**
     - DPI 값을 낮추거나
     - 페이지 범위를 제한하여 변환
-    
-    **5. 파일 권한 오류**
-    - 출력 디렉토리에 쓰기 권한이 있는지 확인
     """)
 
 # 푸터
@@ -1,9 +1,18 @@
 import streamlit as st
+import io
 import os
+import time
+import zipfile
 from pathlib import Path
-import tempfile
-import io
-from pdf_converter_web import PDFConverterWeb
+from conversion_service import (
+    CANCELLED, DONE, FAILED, QUEUED, RUNNING, LocalConversionService, QueueFullError
+)
+from image_encoding import DEFAULT_PROFILE, ENCODER_PROFILES, mime_type, supported_formats
+from memory_budget import MemoryBudget
+from pdf_info import get_document_info
+from render_backends import BILEVEL_THRESHOLD, COLOR_MODES
+from render_cache import RenderCache
+from thumbnails import ThumbnailRenderer, page_window, window_count
 
 st.set_page_config(
     page_title="PDF to Image Converter (Web)",
@@ -11,6 +20,56 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_render_cache():
+    """세션과 재실행 사이에 공유하는 디스크 렌더 캐시"""
+    return RenderCache(os.environ.get("PDF_RENDER_CACHE_DIR", ".render_cache"))
+
+@st.cache_resource
+def get_conversion_service():
+    """세션 사이에 공유하는 변환 작업 대기열 (동시 변환 수를 워커 수로 제한)"""
+    return LocalConversionService(
+        workers=int(os.environ.get("PDF_CONVERSION_WORKERS", "2")),
+        max_finished_jobs=20,
+        cache=get_render_cache(),
+        # 큰 도면을 높은 DPI로 렌더링해도 워커 메모리를 넘지 않도록 페이지당 래스터 크기 제한
+        memory_budget=MemoryBudget(
+            max_pixels=int(float(os.environ.get("PDF_MAX_PAGE_MEGAPIXELS", "100")) * 1_000_000)
+        )
+    )
+
+@st.cache_resource
+def get_thumbnail_renderer():
+    """갤러리 미리보기용 썸네일 렌더러 (변환 결과와 별도의 캐시 사용)"""
+    return ThumbnailRenderer(
+        cache=RenderCache(
+            os.environ.get("PDF_THUMBNAIL_CACHE_DIR", ".thumbnail_cache"),
+            max_bytes=256 * 1024 * 1024
+        )
+    )
+
+def get_pdf_hash(uploaded_file):
+    """업로드한 파일의 내용 해시 (재실행마다 다시 계산하지 않도록 세션에 보관)"""
+    if st.session_state.get("pdf_hash_file_id") != uploaded_file.file_id:
+        st.session_state.pdf_hash = RenderCache.hash_bytes(uploaded_file.getvalue())
+        st.session_state.pdf_hash_file_id = uploaded_file.file_id
+    return st.session_state.pdf_hash
+
+def show_gallery(num_images, thumbnails):
+    """(페이지 번호, 이미지) 쌍을 한 행에 4개씩, 렌더링되는 대로 표시"""
+    # 4개 이하면 한 행에 모두 표시
+    columns_per_row = min(4, num_images)
+    cols = None
+    
+    for i, (page_num, data) in enumerate(thumbnails):
+        if i % 4 == 0:
+            # 행 간 구분선 (첫 행 제외)
+            if i > 0:
+                st.markdown("---")
+            cols = st.columns(columns_per_row)
+        with cols[i % 4]:
+            st.image(data, caption=f"페이지 {page_num}", width=200)
+
 st.title("🔄 PDF 이미지 변환기")
 st.markdown("**설치 없이 바로 사용할 수 있는 PDF 변환기입니다!**")
 
@@ -21,10 +80,37 @@ with st.sidebar:
     # 출력 형식 선택
     output_format = st.selectbox(
         "출력 형식",
-        ["PNG", "JPEG", "JPG"],
+        ["PNG", "JPEG", "JPG"] + [f for f in ("WEBP", "AVIF") if f in supported_formats()],
         help="변환할 이미지 형식을 선택하세요"
     )
     
+    # 인코더 프로필 (압축 속도와 파일 크기)
+    encoder_profile = st.selectbox(
+        "인코딩 프로필",
+        list(ENCODER_PROFILES),
+        index=list(ENCODER_PROFILES).index(DEFAULT_PROFILE),
+        help="fast: 빠르게 저장(파일이 조금 큼), archival: 느리지만 가장 작고 화질이 좋음"
+    )
+    lossless = False
+    if output_format == "WEBP":
+        lossless = st.checkbox("무손실 WebP", help="텍스트/도면 페이지는 PNG보다 훨씬 작습니다")
+    
+    # 색상 모드 (흑백 계약서/청구서는 그레이스케일이나 1비트 흑백이 훨씬 작음)
+    color_mode = st.selectbox(
+        "색상 모드",
+        list(COLOR_MODES),
+        format_func=lambda mode: {"rgb": "컬러 (RGB)", "gray": "그레이스케일", "bilevel": "1비트 흑백"}[mode],
+        help="텍스트 문서는 그레이스케일(8비트)이나 1비트 흑백(TIFF는 CCITT Group 4)으로 저장하면 훨씬 작습니다"
+    )
+    threshold = BILEVEL_THRESHOLD
+    dither = False
+    if color_mode == "bilevel":
+        threshold = st.slider(
+            "흑백 기준 밝기", 0, 255, BILEVEL_THRESHOLD,
+            help="밝기가 이 값 이상인 픽셀은 흰색이 됩니다. 배경이 옅은 스캔은 낮추세요"
+        )
+        dither = st.checkbox("디더링", help="사진이나 회색 영역이 있는 문서는 기준 밝기 대신 디더링을 사용합니다")
+    
     # DPI 설정
     dpi = st.slider(
         "DPI (해상도)",
@@ -42,6 +128,13 @@ with st.sidebar:
         help="개별 페이지: 각 페이지를 별도 파일로 저장\n단일 이미지: 모든 페이지를 하나의 이미지로 결합"
     )
     
+    # 스캔 문서는 페이지의 JPEG를 다시 인코딩하지 않고 그대로 추출
+    passthrough = st.checkbox(
+        "스캔 이미지 그대로 추출",
+        help="페이지 전체가 이미지 한 장인 스캔 페이지는 렌더링하지 않고 원본 이미지를 그대로 저장합니다 "
+             "(이미지 형식이 출력 형식과 같을 때, 원본 해상도). 개별 페이지 변환에만 적용됩니다."
+    )
+    
     # 페이지 범위 설정
     st.subheader("📄 페이지 범위")
     use_page_range = st.checkbox("특정 페이지 범위만 변환")
@@ -82,14 +175,12 @@ with col2:
         for key, value in file_details.items():
             st.write(f"**{key}:** {value}")
         
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_file_path = tmp_file.name
-        
-        # PDF 정보 가져오기
-        converter = PDFConverterWeb()
-        pdf_info = converter.get_pdf_info(tmp_file_path)
+        # PDF 정보 가져오기 (업로드된 바이트에서 바로 읽음)
+        try:
+            pdf_info = get_document_info(uploaded_file.getvalue(), include_page_sizes=False)
+        except Exception as e:
+            st.error(f"PDF 정보를 읽을 수 없습니다: {e}")
+            pdf_info = {'page_count': 0, 'title': '', 'author': ''}
         
         st.write(f"**총 페이지 수:** {pdf_info['page_count']}페이지")
         if pdf_info['title']:
@@ -112,138 +203,148 @@ with col2:
 if uploaded_file is not None:
     st.subheader("🚀 변환 실행")
     
+    service = get_conversion_service()
+    
     if st.button("🔄 변환 시작", type="primary", use_container_width=True):
-        with st.spinner("PDF를 이미지로 변환하는 중..."):
-            try:
-                # 변환 실행
-                if conversion_mode == "개별 페이지":
-                    output_files = converter.convert_pdf_to_images(
-                        tmp_file_path,
-                        output_format=output_format,
-                        dpi=dpi,
-                        first_page=first_page,
-                        last_page=last_page
-                    )
-                    
-                    st.success(f"✅ 변환 완료! {len(output_files)}개의 이미지 파일이 생성되었습니다.")
-                    
-                    # 결과 표시
-                    st.subheader("📸 변환된 이미지")
-                    
-                    # 이미지들을 가로로 나열 (안정적인 레이아웃)
-                    num_images = len(output_files)
-                    
-                    # 이미지 개수에 따라 동적으로 컬럼 생성
-                    if num_images <= 4:
-                        # 4개 이하면 한 행에 모두 표시
-                        cols = st.columns(num_images)
-                        
-                        for i, file_path in enumerate(output_files):
-                            with open(file_path, "rb") as img_file:
-                                img_data = img_file.read()
-                            
-                            with cols[i]:
-                                # 이미지 표시
-                                st.image(img_data, caption=f"페이지 {i+1}", width=200)
-                                
-                                # 다운로드 버튼 (이미지와 같은 너비)
-                                filename = Path(file_path).name
-                                st.download_button(
-                                    label=f"📥 다운로드",
-                                    data=img_data,
-                                    file_name=filename,
-                                    mime=f"image/{output_format.lower()}",
-                                    use_container_width=True
-                                )
-                    else:
-                        # 4개 초과시 여러 행으로 나누기
-                        rows = (num_images + 3) // 4  # 올림 나눗셈
-                        
-                        for row in range(rows):
-                            start_idx = row * 4
-                            end_idx = min(start_idx + 4, num_images)
-                            row_images = end_idx - start_idx
-                            
-                            # 현재 행의 컬럼 생성
-                            cols = st.columns(4)
-                            
-                            for i in range(4):
-                                if i < row_images:
-                                    # 실제 이미지 인덱스
-                                    img_idx = start_idx + i
-                                    file_path = output_files[img_idx]
-                                    
-                                    with open(file_path, "rb") as img_file:
-                                        img_data = img_file.read()
-                                    
-                                    with cols[i]:
-                                        # 이미지 표시
-                                        st.image(img_data, caption=f"페이지 {img_idx+1}", width=200)
-                                        
-                                        # 다운로드 버튼 (이미지와 같은 너비)
-                                        filename = Path(file_path).name
-                                        st.download_button(
-                                            label=f"📥 다운로드",
-                                            data=img_data,
-                                            file_name=filename,
-                                            mime=f"image/{output_format.lower()}",
-                                            use_container_width=True
-                                        )
-                                else:
-                                    # 빈 컬럼
-                                    with cols[i]:
-                                        st.empty()
-                            
-                            # 행 간 구분선 (마지막 행 제외)
-                            if row < rows - 1:
-                                st.markdown("---")
-                
-                else:  # 단일 이미지로 결합
-                    output_file = converter.convert_pdf_to_single_image(
-                        tmp_file_path,
-                        output_format=output_format,
-                        dpi=dpi,
-                        first_page=first_page,
-                        last_page=last_page
-                    )
-                    
-                    if output_file:
-                        st.success("✅ 변환 완료! 단일 이미지 파일이 생성되었습니다.")
-                        
-                        # 결과 표시
-                        st.subheader("📸 변환된 이미지")
-                        
-                        with open(output_file, "rb") as img_file:
-                            img_data = img_file.read()
-                        
-                        # 이미지와 다운로드 버튼을 나란히 배치
-                        col_img, col_btn = st.columns([3, 1])
-                        
-                        with col_img:
-                            # 이미지 크기 제한 (최대 너비 600px)
-                            st.image(img_data, caption="결합된 이미지", width=600)
-                        
-                        with col_btn:
-                            # 다운로드 버튼
-                            filename = Path(output_file).name
-                            st.download_button(
-                                label=f"📥 다운로드",
-                                data=img_data,
-                                file_name=filename,
-                                mime=f"image/{output_format.lower()}",
-                                use_container_width=True
-                            )
+        # 이전 작업의 결과 파일 정리
+        previous_job_id = st.session_state.pop("job_id", None)
+        if previous_job_id:
+            service.cancel(previous_job_id)
+            service.remove_job(previous_job_id)
+        
+        try:
+            st.session_state.job_id = service.submit(
+                uploaded_file.getvalue(),
+                filename=uploaded_file.name,
+                output_format=output_format,
+                dpi=dpi,
+                first_page=first_page,
+                last_page=last_page,
+                single_image=(conversion_mode != "개별 페이지"),
+                streaming=(output_format == "PNG"),
+                archive=("zip" if conversion_mode == "개별 페이지" else None),
+                passthrough=passthrough,
+                encoder_profile=encoder_profile,
+                lossless=lossless,
+                color_mode=color_mode,
+                threshold=threshold,
+                dither=dither
+            )
+        except QueueFullError as e:
+            st.warning(f"⏳ {e}")
+    
+    job_id = st.session_state.get("job_id")
+    job = service.get_job(job_id) if job_id else None
+    
+    if job is not None and job['status'] in (QUEUED, RUNNING):
+        # 작업이 끝날 때까지 진행률을 표시하며 주기적으로 다시 조회
+        if job['status'] == QUEUED:
+            st.progress(0.0, text="⏳ 변환 대기 중...")
+        else:
+            total = job['total_pages'] or 1
+            st.progress(
+                job['completed_pages'] / total,
+                text=f"PDF를 이미지로 변환하는 중... ({job['completed_pages']}/{job['total_pages']}페이지)"
+            )
+        
+        if st.button("⏹️ 변환 취소"):
+            service.cancel(job_id)
+    
+    elif job is not None and job['status'] == DONE:
+        # 사이드바 설정이 바뀌었어도 작업을 등록할 때의 형식 사용
+        output_format = job['options']['output_format']
+        
+        # 메모리 예산 때문에 해상도를 낮춘 페이지 안내
+        for report in job['downscaled_pages']:
+            st.warning(
+                f"⚠️ 페이지 {report['page']}: 페이지가 너무 커서 {report['requested_dpi']} DPI 대신 "
+                f"{report['dpi']} DPI로 변환했습니다. ({report['width']}x{report['height']}px)"
+            )
+        
+        if not job['options']['single_image']:
+            # 개별 페이지는 메모리의 ZIP 하나로 받아 일괄 다운로드 (미리보기는 아래 썸네일 사용)
+            archive_data = service.get_archive(job_id)
+            with zipfile.ZipFile(io.BytesIO(archive_data)) as archive:
+                filenames = archive.namelist()
+            
+            st.success(f"✅ 변환 완료! {len(filenames)}개의 이미지 파일이 생성되었습니다.")
+            cache_stats = get_render_cache().stats()
+            st.caption(f"렌더 캐시: 적중 {cache_stats['hits']}회, 미스 {cache_stats['misses']}회")
+            if job['extracted_pages']:
+                st.caption(f"📎 {len(job['extracted_pages'])}개 페이지는 내장 이미지를 그대로 추출했습니다.")
             
-            except Exception as e:
-                st.error(f"❌ 변환 중 오류가 발생했습니다: {str(e)}")
+            # 전체 이미지를 ZIP 파일 하나로 다운로드
+            st.download_button(
+                label=f"📦 전체 이미지 다운로드 (ZIP, {len(filenames)}개)",
+                data=archive_data,
+                file_name=f"{Path(job['filename']).stem}_images.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+        
+        else:  # 단일 이미지로 결합
+            # 변환 결과는 디스크를 거치지 않고 메모리에서 바로 표시
+            filename, img_data = service.get_outputs(job_id)[0]
+            img_data = bytes(img_data)
+            st.success("✅ 변환 완료! 단일 이미지 파일이 생성되었습니다.")
+            
+            # 결과 표시
+            st.subheader("📸 변환된 이미지")
+            
+            # 이미지와 다운로드 버튼을 나란히 배치
+            col_img, col_btn = st.columns([3, 1])
             
-            finally:
-                # 임시 파일 정리
-                try:
-                    os.unlink(tmp_file_path)
-                    converter.cleanup_output_dir()
-                except:
-                    pass
+            with col_img:
+                # 이미지 크기 제한 (최대 너비 600px)
+                st.image(img_data, caption="결합된 이미지", width=600)
+            
+            with col_btn:
+                # 다운로드 버튼
+                st.download_button(
+                    label=f"📥 다운로드",
+                    data=img_data,
+                    file_name=filename,
+                    mime=mime_type(output_format),
+                    use_container_width=True
+                )
+    
+    elif job is not None and job['status'] == FAILED:
+        st.error(f"❌ 변환 중 오류가 발생했습니다: {job['error']}")
+    
+    elif job is not None and job['status'] == CANCELLED:
+        st.warning("⏹️ 변환이 취소되었습니다.")
+    
+    # 전체 해상도 변환과 관계없이 저해상도 썸네일을 PDF에서 바로 렌더링하여 먼저 표시
+    # 화면에 보이는 창(기본 24페이지)만 렌더링하고 다음 창은 백그라운드에서 미리 렌더링
+    preview_pages = list(range(first_page, min(last_page, pdf_info['page_count']) + 1))
+    if preview_pages:
+        st.subheader("📸 페이지 미리보기")
+        windows = window_count(len(preview_pages))
+        window_index = 0
+        if windows > 1:
+            window_index = st.selectbox(
+                "미리보기 페이지",
+                range(windows),
+                format_func=lambda index: (
+                    f"{page_window(preview_pages, index)[0]}~{page_window(preview_pages, index)[-1]}페이지"
+                ),
+                key="gallery_window"
+            )
+        
+        thumbnail_renderer = get_thumbnail_renderer()
+        pdf_bytes = uploaded_file.getvalue()
+        pdf_hash = get_pdf_hash(uploaded_file)
+        window_pages = page_window(preview_pages, window_index)
+        show_gallery(
+            len(window_pages),
+            thumbnail_renderer.iter_thumbnails(pdf_bytes, window_pages, pdf_hash=pdf_hash)
+        )
+        thumbnail_renderer.prefetch(pdf_bytes, page_window(preview_pages, window_index + 1), pdf_hash=pdf_hash)
+    
+    if job is not None and job['status'] in (QUEUED, RUNNING):
+        # 작업이 끝날 때까지 주기적으로 다시 조회 (썸네일은 캐시에서 바로 다시 표시됨)
+        time.sleep(0.5)
+        st.rerun()
 else:
     st.info("📁 PDF 파일을 업로드해주세요.")
 
@@ -253,6 +354,7 @@ st.markdown("""
 ### 💡 사용 팁
 - **PNG**: 투명도 지원, 무손실 압축 (파일 크기 큼)
 - **JPEG/JPG**: 손실 압축, 작은 파일 크기 (투명도 없음)
+- **WebP/AVIF**: 웹용으로 가장 작은 파일 (텍스트 페이지는 무손실 WebP 권장, 결합 이미지는 WebP 최대 16383px)
 - **DPI**: 200-300이 일반적으로 적당합니다
 - **단일 이미지**: 모든 페이지를 세로로 연결한 하나의 이미지
 """)
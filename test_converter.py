@@ -5,6 +5,7 @@ PDF 변환기 테스트 스크립트
 
 import os
 import tempfile
+import time
 from pathlib import Path
 from pdf_converter import PDFConverter
 
@@ -92,6 +93,917 @@ def test_with_sample_pdf():
         print(f"❌ 변환 테스트 실패: {e}")
         print("📋 requirements.txt의 패키지들이 설치되어 있는지 확인하세요.")
 
+def _create_sample_pdf(path, page_count=3):
+    """테스트용 PDF를 PyMuPDF로 생성합니다."""
+    import fitz
+
+    pdf_document = fitz.open()
+    for i in range(page_count):
+        page = pdf_document.new_page(width=200, height=280)
+        page.insert_text((20, 40), f"Page {i + 1}", fontsize=18)
+        page.draw_rect(fitz.Rect(20, 60, 180, 120), color=(0, 0, 1), fill=(1, 0.8, 0))
+    pdf_document.save(path)
+    pdf_document.close()
+    return path
+
+def test_web_converter_parallel_matches_serial():
+    """병렬 렌더링 결과가 직렬 경로와 같은 파일명/순서/내용인지 확인합니다."""
+    from pdf_converter_web import PDFConverterWeb
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=5)
+
+        serial = PDFConverterWeb(os.path.join(temp_dir, "serial"))
+        parallel = PDFConverterWeb(os.path.join(temp_dir, "parallel"))
+
+        serial_files = serial.convert_pdf_to_images(pdf_path, dpi=72, first_page=2)
+        parallel_files = parallel.convert_pdf_to_images(pdf_path, dpi=72, first_page=2, workers=2)
+
+        assert [Path(f).name for f in serial_files] == [Path(f).name for f in parallel_files]
+        assert Path(parallel_files[0]).name == "sample_page_002.png"
+        for serial_file, parallel_file in zip(serial_files, parallel_files):
+            assert Path(serial_file).read_bytes() == Path(parallel_file).read_bytes()
+        print(f"✅ 병렬 변환 테스트 통과: {len(parallel_files)}개 파일")
+
+def test_web_iter_pages_streams_in_order():
+    """iter_pages가 페이지를 하나씩 순서대로 반환하는지 확인합니다."""
+    from pdf_converter_web import PDFConverterWeb
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=4)
+        converter = PDFConverterWeb(os.path.join(temp_dir, "out"))
+
+        pages = converter.iter_pages(pdf_path, dpi=72, first_page=2, last_page=3)
+        page_num, image = next(pages)
+        assert page_num == 2
+        assert image.size == (200, 280)
+        assert [num for num, _ in pages] == [3]
+        print("✅ 페이지 스트리밍 테스트 통과")
+
+def test_render_cache_reuses_pages():
+    """같은 PDF를 다시 변환하면 렌더 캐시에서 페이지를 가져오는지 확인합니다."""
+    from pdf_converter_web import PDFConverterWeb
+    from render_cache import RenderCache
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=3)
+        cache = RenderCache(os.path.join(temp_dir, "cache"))
+        converter = PDFConverterWeb(os.path.join(temp_dir, "out"), cache=cache)
+
+        first_files = converter.convert_pdf_to_images(pdf_path, dpi=72)
+        first_bytes = [Path(f).read_bytes() for f in first_files]
+        converter.cleanup_output_dir()
+
+        second_files = converter.convert_pdf_to_images(pdf_path, dpi=72)
+        assert second_files == first_files
+        assert [Path(f).read_bytes() for f in second_files] == first_bytes
+        assert cache.stats()['hits'] == 3
+
+        # DPI가 다르면 다른 키
+        converter.convert_pdf_to_images(pdf_path, dpi=96, last_page=1)
+        assert cache.stats()['misses'] == 4
+
+        # 용량 상한을 넘으면 오래된 항목부터 삭제
+        cache.max_bytes = len(first_bytes[0])
+        cache.evict()
+        assert cache.stats()['size_bytes'] <= cache.max_bytes
+        print(f"✅ 렌더 캐시 테스트 통과: {cache.stats()}")
+
+def test_web_streaming_single_image_matches_canvas():
+    """스트리밍 결합 결과가 기존 캔버스 방식과 픽셀 단위로 같은지 확인합니다."""
+    from PIL import Image, ImageChops
+    from pdf_converter_web import PDFConverterWeb
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=3)
+        converter = PDFConverterWeb(os.path.join(temp_dir, "out"))
+
+        canvas_path = converter.convert_pdf_to_single_image(pdf_path, dpi=96)
+        canvas_image = Image.open(canvas_path)
+        canvas_image.load()
+
+        streamed_path = converter.convert_pdf_to_single_image(pdf_path, dpi=96, streaming=True)
+        streamed_image = Image.open(streamed_path)
+        streamed_image.load()
+
+        assert streamed_image.size == canvas_image.size
+        assert ImageChops.difference(streamed_image, canvas_image).getbbox() is None
+        print(f"✅ 스트리밍 결합 테스트 통과: {streamed_image.size}")
+
+def test_document_info_counts_sizes_and_cache():
+    """문서 정보의 페이지 수/크기/메타데이터, 파일 변경 시 캐시 무효화, 바이트 입력을 확인합니다."""
+    import fitz
+    import pdf_info
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, "info.pdf")
+        pdf_document = fitz.open()
+        pdf_document.new_page(width=200, height=280)
+        pdf_document.new_page(width=300, height=400).set_rotation(90)
+        pdf_document.set_metadata({'title': "견적서", 'author': "tester"})
+        pdf_document.save(pdf_path)
+        pdf_document.close()
+
+        reads = []
+        read_info = pdf_info._read_info
+        pdf_info._read_info = lambda *args: reads.append(args) or read_info(*args)
+        pdf_info.clear_cache()
+        try:
+            info = pdf_info.get_document_info(pdf_path)
+            assert info['page_count'] == 2
+            # 회전한 페이지는 가로/세로가 바뀜
+            assert info['page_sizes'] == [(200, 280), (400, 300)]
+            assert (info['title'], info['author'], info['subject']) == ("견적서", "tester", "")
+
+            # 같은 파일은 다시 읽지 않고, 반환값을 바꿔도 캐시는 그대로
+            info['page_sizes'].clear()
+            assert pdf_info.get_page_count(pdf_path) == 2
+            assert pdf_info.get_page_sizes(pdf_path) == [(200, 280), (400, 300)]
+            assert pdf_info.get_document_info(pdf_path, include_page_sizes=False)['page_sizes'] == []
+            assert len(reads) == 1
+
+            # 수정 시각이 바뀐 파일은 다시 읽음
+            _create_sample_pdf(pdf_path, page_count=5)
+            stat = os.stat(pdf_path)
+            os.utime(pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            assert pdf_info.get_page_count(pdf_path) == 5
+            assert len(reads) == 2
+
+            with open(pdf_path, "rb") as f:
+                data = f.read()
+            assert pdf_info.get_page_count(data) == 5
+            assert pdf_info.get_page_sizes(data) == [(200, 280)] * 5
+        finally:
+            pdf_info._read_info = read_info
+            pdf_info.clear_cache()
+
+        try:
+            pdf_info.get_page_count(os.path.join(temp_dir, "missing.pdf"))
+            assert False, "없는 파일이 허용되었습니다"
+        except FileNotFoundError:
+            pass
+        print("✅ 문서 정보 테스트 통과")
+
+def test_backend_selection_and_single_image_range():
+    """백엔드 이름/auto 선택과 단일 이미지 페이지 범위를 확인합니다."""
+    from PIL import Image
+    from pdf_converter import PDFConverter
+    from render_backends import available_backends, get_backend
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=4)
+
+        assert get_backend("auto", pdf_path).name in available_backends()
+        try:
+            get_backend("unknown")
+            assert False, "알 수 없는 백엔드는 오류여야 합니다"
+        except ValueError:
+            pass
+
+        converter = PDFConverter(os.path.join(temp_dir, "out"), backend="pymupdf")
+        output_file = converter.convert_pdf_to_single_image(
+            pdf_path, dpi=72, first_page=2, last_page=3
+        )
+        assert Image.open(output_file).size == (200, 560)
+        print(f"✅ 백엔드 선택 테스트 통과: {available_backends()}")
+
+def test_in_memory_conversion_matches_files():
+    """바이트 입력/출력 변환이 파일 변환과 같은 결과를 내고 디스크에 쓰지 않는지 확인합니다."""
+    import io
+    from output_sinks import DirectorySink
+    from pdf_converter_web import PDFConverterWeb
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=3)
+        with open(pdf_path, "rb") as pdf_file:
+            pdf_bytes = pdf_file.read()
+
+        memory_converter = PDFConverterWeb(os.path.join(temp_dir, "unused"))
+        pages = memory_converter.convert_pdf_to_bytes(io.BytesIO(pdf_bytes), dpi=72, name="sample.pdf")
+        assert not os.path.exists(os.path.join(temp_dir, "unused"))
+
+        output_files = PDFConverterWeb(os.path.join(temp_dir, "files")).convert_pdf_to_images(pdf_path, dpi=72)
+        assert [name for name, _ in pages] == [Path(path).name for path in output_files]
+        for (_, data), path in zip(pages, output_files):
+            with open(path, "rb") as image_file:
+                assert bytes(data) == image_file.read()
+
+        sink = DirectorySink(os.path.join(temp_dir, "sink"))
+        combined = memory_converter.convert_to_sink(pdf_bytes, sink, dpi=72, single_image=True)
+        assert [Path(path).name for path in combined] == ["document_combined.png"]
+        print(f"✅ 메모리 변환 테스트 통과: {len(pages)}페이지")
+
+def test_archive_sink_zip_and_tar():
+    """ZIP/TAR 아카이브에 모든 페이지가 들어가고 PNG는 압축 없이 저장되는지 확인합니다."""
+    import tarfile
+    import zipfile
+    from output_sinks import ArchiveSink
+    from pdf_converter_web import PDFConverterWeb
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=3)
+        converter = PDFConverterWeb(os.path.join(temp_dir, "unused"))
+        pages = dict(converter.convert_pdf_to_bytes(pdf_path, dpi=72))
+
+        zip_path = os.path.join(temp_dir, "pages.zip")
+        with ArchiveSink(zip_path) as sink:
+            converter.convert_to_sink(pdf_path, sink, dpi=72)
+        with zipfile.ZipFile(zip_path) as archive:
+            assert archive.namelist() == list(pages)
+            for info in archive.infolist():
+                assert info.compress_type == zipfile.ZIP_STORED
+                assert archive.read(info) == bytes(pages[info.filename])
+
+        tar_path = os.path.join(temp_dir, "pages.tar.gz")
+        with ArchiveSink(tar_path) as sink:
+            converter.convert_to_sink(pdf_path, sink, dpi=72)
+        with tarfile.open(tar_path) as archive:
+            assert archive.getnames() == list(pages)
+        print(f"✅ 아카이브 내보내기 테스트 통과: {len(pages)}페이지")
+
+def test_batch_resume_skips_completed_pages():
+    """이어서 변환 시 매니페스트에 기록된 페이지는 건너뛰고 지워진 페이지와 바뀐 문서만 변환하는지 확인합니다."""
+    from batch_convert import batch_convert
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # batch_convert.log가 임시 디렉토리에 생기도록 이동
+        os.chdir(temp_dir)
+        try:
+            _check_batch_resume(temp_dir, batch_convert)
+        finally:
+            os.chdir(cwd)
+    print("✅ 이어서 변환 테스트 통과")
+
+def _check_batch_resume(temp_dir, batch_convert):
+    input_dir = os.path.join(temp_dir, "input")
+    output_dir = os.path.join(temp_dir, "output")
+    os.makedirs(input_dir)
+    _create_sample_pdf(os.path.join(input_dir, "a.pdf"), page_count=3)
+    _create_sample_pdf(os.path.join(input_dir, "b.pdf"), page_count=2)
+
+    batch_convert(input_dir, output_dir, dpi=50, backend="pymupdf")
+    before = {name: os.stat(os.path.join(output_dir, name)).st_mtime_ns for name in os.listdir(output_dir)}
+    assert ".batch_manifest.jsonl" in before
+
+    os.remove(os.path.join(output_dir, "a_page_002.png"))
+    _create_sample_pdf(os.path.join(input_dir, "b.pdf"), page_count=1)
+    time.sleep(0.01)
+    batch_convert(input_dir, output_dir, dpi=50, backend="pymupdf", resume=True)
+
+    rewritten = sorted(
+        name for name in os.listdir(output_dir)
+        if name.endswith(".png") and os.stat(os.path.join(output_dir, name)).st_mtime_ns != before.get(name)
+    )
+    assert rewritten == ["a_page_002.png", "b_page_001.png"]
+
+def test_batch_parallel_jobs_and_errors():
+    """--jobs 2의 페이지 단위 병렬 변환이 성공/실패 수, error_files, 파일별 처리 시간을 직렬과 같게 보고하는지 확인합니다."""
+    import logging
+    from batch_convert import batch_convert
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # batch_convert.log가 임시 디렉토리에 생기도록 이동
+        os.chdir(temp_dir)
+        try:
+            _check_batch_parallel(temp_dir, batch_convert, logging)
+        finally:
+            os.chdir(cwd)
+    print("✅ 배치 병렬 변환 테스트 통과")
+
+def _check_batch_parallel(temp_dir, batch_convert, logging):
+    input_dir = os.path.join(temp_dir, "input")
+    output_dir = os.path.join(temp_dir, "output")
+    os.makedirs(input_dir)
+    _create_sample_pdf(os.path.join(input_dir, "good.pdf"), page_count=3)
+    with open(os.path.join(input_dir, "broken.pdf"), "wb") as f:
+        f.write(b"%PDF-1.4\nnot a pdf")
+
+    messages = []
+    handler = logging.Handler()
+    handler.emit = lambda record: messages.append(record.getMessage())
+    logger = logging.getLogger("batch_convert")
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        success, errors, error_files = batch_convert(input_dir, output_dir, dpi=50, backend="pymupdf", jobs=2)
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+    assert (success, errors) == (1, 1)
+    assert [name for name, _ in error_files] == ["broken.pdf"]
+    assert all(isinstance(message, str) and message for _, message in error_files)
+    assert sorted(name for name in os.listdir(output_dir) if name.endswith(".png")) == [
+        f"good_page_{page:03d}.png" for page in (1, 2, 3)
+    ]
+    # 파일별 처리 시간과 초당 페이지 수 보고
+    assert any(message.startswith("  - good.pdf: 3페이지, ") and message.endswith(" 페이지/초") for message in messages)
+
+def test_convert_page_without_output_raises():
+    """백엔드가 페이지를 저장하지 않으면 convert_page가 None 대신 ValueError를 내는지 확인합니다."""
+    from render_backends import RenderBackend
+
+    class EmptyBackend(RenderBackend):
+        name = "empty"
+
+        def save_pages(self, pdf_path, page_nums, dpi, output_format, output_path_for):
+            return iter(())
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=1)
+        try:
+            PDFConverter(temp_dir, backend=EmptyBackend()).convert_page(pdf_path, 1)
+            assert False, "저장한 파일이 없는데 convert_page가 성공했습니다"
+        except ValueError as e:
+            assert "페이지 1" in str(e)
+    print("✅ 단일 페이지 변환 실패 테스트 통과")
+
+def test_memory_budget_downscales_and_refuses():
+    """페이지당 래스터 한도를 넘는 페이지만 DPI를 낮추거나, error 정책이면 렌더링 전에 거부하는지 확인합니다."""
+    import fitz
+    from PIL import Image
+    from memory_budget import MemoryBudget, PageTooLargeError
+    from pdf_converter_web import PDFConverterWeb
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, "drawing.pdf")
+        pdf_document = fitz.open()
+        pdf_document.new_page(width=200, height=280)
+        pdf_document.new_page(width=2000, height=2800)
+        pdf_document.save(pdf_path)
+        pdf_document.close()
+
+        budget = MemoryBudget(max_pixels=1_000_000)
+        converter = PDFConverterWeb(os.path.join(temp_dir, "out"), memory_budget=budget)
+        for workers in (None, 2):
+            output_files = converter.convert_pdf_to_images(pdf_path, dpi=144, workers=workers)
+            sizes = [Image.open(path).size for path in output_files]
+            assert sizes[0] == (400, 560)
+            assert sizes[1][0] * sizes[1][1] <= 1_000_000
+        assert [report['action'] for report in converter.budget_reports.values()] == ["ok", "downscaled"]
+
+        refusing = PDFConverterWeb(
+            os.path.join(temp_dir, "refused"), memory_budget=MemoryBudget(max_pixels=1_000_000, policy="error")
+        )
+        try:
+            refusing.convert_pdf_to_images(pdf_path, dpi=144)
+            assert False, "한도를 넘는 페이지가 렌더링되었습니다"
+        except PageTooLargeError:
+            pass
+        assert not os.path.exists(os.path.join(temp_dir, "refused"))
+        print("✅ 메모리 예산 테스트 통과")
+
+def test_tiled_rendering_matches_full_page():
+    """tile 정책으로 렌더링한 PNG/TIFF가 전체 렌더링과 같은 크기와 내용인지 확인합니다."""
+    import fitz
+    from PIL import Image, ImageChops, ImageStat
+    from memory_budget import MemoryBudget, PageTooLargeError
+    from pdf_converter_web import PDFConverterWeb
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, "drawing.pdf")
+        pdf_document = fitz.open()
+        page = pdf_document.new_page(width=600, height=850)
+        for offset in range(0, 600, 40):
+            page.draw_line((offset, 0), (600 - offset, 850), color=(0, 0, 1), width=2)
+        page.insert_text((50, 100), "Tiled drawing", fontsize=36)
+        pdf_document.save(pdf_path)
+        pdf_document.close()
+
+        _, full = next(PDFConverterWeb(os.path.join(temp_dir, "full")).iter_pages(pdf_path, dpi=200))
+        budget = MemoryBudget(max_pixels=500_000, policy="tile", tile_size=256)
+        converter = PDFConverterWeb(os.path.join(temp_dir, "tiled"), memory_budget=budget)
+        for fmt in ("PNG", "TIFF"):
+            output_file = converter.convert_pdf_to_images(pdf_path, fmt, dpi=200)[0]
+            tiled = Image.open(output_file).convert("RGB")
+            assert tiled.size == full.size
+            # 클립 렌더링은 안티에일리어싱 경계에서만 조금 다를 수 있음
+            assert max(ImageStat.Stat(ImageChops.difference(tiled, full)).mean) < 1.0
+        assert converter.budget_reports[1]['action'] == "tiled"
+
+        # 타일 압축 레벨은 인코더 프로필을 따르며, 픽셀과 모드는 프로필과 관계없이 같음
+        sizes = {}
+        for profile in ("fast", "archival"):
+            profile_converter = PDFConverterWeb(
+                os.path.join(temp_dir, profile), memory_budget=budget, encoder_profile=profile
+            )
+            for fmt in ("PNG", "TIFF"):
+                output_file = profile_converter.convert_pdf_to_images(pdf_path, fmt, dpi=200)[0]
+                with Image.open(output_file) as tiled:
+                    assert tiled.mode == "RGB"
+                    assert max(ImageStat.Stat(ImageChops.difference(tiled, full)).mean) < 1.0
+                sizes[profile, fmt] = os.path.getsize(output_file)
+        assert sizes["archival", "PNG"] < sizes["fast", "PNG"]
+        assert sizes["archival", "TIFF"] < sizes["fast", "TIFF"]
+
+        # 그레이스케일은 타일도 그레이스케일로 렌더링하며, max_bytes는 픽셀당 1바이트로 계산
+        _, full_gray = next(PDFConverterWeb(color_mode="gray").iter_pages(pdf_path, dpi=200))
+        gray_budget = MemoryBudget(max_bytes=1_500_000, policy="tile", tile_size=256, tile_workers=2)
+        assert gray_budget.pixel_limit("gray") == 3 * gray_budget.pixel_limit("rgb")
+        gray_converter = PDFConverterWeb(
+            os.path.join(temp_dir, "gray"), memory_budget=gray_budget, color_mode="gray"
+        )
+        for fmt in ("PNG", "TIFF"):
+            output_file = gray_converter.convert_pdf_to_images(pdf_path, fmt, dpi=200)[0]
+            tiled = Image.open(output_file)
+            assert tiled.mode == "L" and tiled.size == full_gray.size
+            assert ImageStat.Stat(ImageChops.difference(tiled, full_gray)).mean[0] < 1.0
+        assert gray_converter.budget_reports[1]['action'] == "tiled"
+
+        # 1비트 흑백은 타일로 기록할 수 없으므로 렌더링 전에 거부
+        bilevel_converter = PDFConverterWeb(
+            os.path.join(temp_dir, "bilevel"), memory_budget=budget, color_mode="bilevel"
+        )
+        try:
+            bilevel_converter.convert_pdf_to_images(pdf_path, "TIFF", dpi=200)
+            assert False, "1비트 흑백 페이지가 타일로 렌더링되었습니다"
+        except PageTooLargeError:
+            pass
+        assert not os.path.exists(os.path.join(temp_dir, "bilevel"))
+
+        try:
+            converter.convert_pdf_to_single_image(pdf_path, dpi=200)
+            assert False, "타일 페이지가 단일 이미지로 결합되었습니다"
+        except PageTooLargeError:
+            pass
+
+        # 없는 페이지를 열다 실패해도 빌린 문서 핸들은 풀에 돌아감
+        from document_pool import document_pool
+        from tiled_render import _PageTiles
+        in_use = document_pool.stats()['in_use']
+        try:
+            _PageTiles(pdf_path, 5, 200)
+            assert False, "없는 페이지가 허용되었습니다"
+        except IndexError:
+            pass
+        assert document_pool.stats()['in_use'] == in_use
+        print("✅ 타일 렌더링 테스트 통과")
+
+def test_thumbnails_fit_width_and_use_cache():
+    """썸네일이 너비/DPI 상한에 맞춰 렌더링되고 두 번째 요청은 캐시에서 나오는지 확인합니다."""
+    import io
+    import fitz
+    from PIL import Image
+    from render_cache import RenderCache
+    from thumbnails import ThumbnailRenderer, page_window, window_count
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, "mixed.pdf")
+        pdf_document = fitz.open()
+        pdf_document.new_page(width=595, height=842)  # A4: 너비에 맞춤 (약 48 DPI)
+        pdf_document.new_page(width=200, height=280)  # 작은 페이지: 72 DPI 상한
+        pdf_document.save(pdf_path)
+        pdf_document.close()
+
+        cache = RenderCache(os.path.join(temp_dir, "thumbs"))
+        renderer = ThumbnailRenderer(width=400, cache=cache)
+        thumbnails = list(renderer.iter_thumbnails(pdf_path))
+        sizes = [Image.open(io.BytesIO(data)).size for _, data in thumbnails]
+        assert [page_num for page_num, _ in thumbnails] == [1, 2]
+        assert sizes[0][0] == 400 and sizes[1] == (200, 280)
+
+        assert [data for _, data in renderer.iter_thumbnails(pdf_path)] == [data for _, data in thumbnails]
+        assert (cache.stats()['hits'], cache.stats()['misses']) == (2, 2)
+
+        # 갤러리 창 나누기와 다음 창 미리 렌더링
+        pages = list(range(1, 51))
+        assert window_count(len(pages), 24) == 3
+        assert page_window(pages, 2, 24) == [49, 50]
+        assert page_window(pages, 3, 24) == []
+        prefetching = ThumbnailRenderer(cache=RenderCache(os.path.join(temp_dir, "prefetch")))
+        # 미리 렌더링 스레드도 MuPDF 잠금 안에서만 렌더링
+        from document_pool import mupdf_lock
+        locked = []
+        render = prefetching._render_pymupdf
+        prefetching._render_pymupdf = lambda page: locked.append(mupdf_lock._is_owned()) or render(page)
+        prefetching.prefetch(pdf_path, [1, 2]).result(timeout=30)
+        assert locked == [True, True]
+        assert prefetching.prefetch(pdf_path, [1, 2]) is None  # 이미 캐시에 있음
+        assert prefetching.cache.stats()['size_bytes'] > 0
+        prefetching.close()
+        print("✅ 썸네일 테스트 통과")
+
+def test_page_filter_skips_blank_and_duplicate_pages():
+    """빈 페이지는 건너뛰고, 같은 페이지는 링크하며, 비슷하지만 다른 페이지는 남기는지 확인합니다."""
+    import io
+    import fitz
+    from page_filter import PageFilter
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, "scan.pdf")
+        pdf_document = fitz.open()
+        for text in ("COVER", None, "Body A", "Body B", "COVER"):
+            page = pdf_document.new_page(width=200, height=280)
+            if text is not None:
+                page.insert_text((20, 40), text, fontsize=24)
+                page.draw_rect(fitz.Rect(20, 60, 180, 120), color=(0, 0, 0), fill=(0.2, 0.2, 0.2))
+        pdf_document.save(pdf_path)
+        pdf_document.close()
+
+        output_dir = os.path.join(temp_dir, "out")
+        converter = PDFConverter(output_dir, backend="pymupdf", page_filter=PageFilter(dedupe="link"))
+        output_files = converter.convert_pdf_to_images(pdf_path, dpi=72)
+        actions = {page: report['action'] for page, report in converter.filter_reports.items()}
+        assert actions == {1: "keep", 2: "blank", 3: "keep", 4: "keep", 5: "duplicate"}
+        assert converter.filter_reports[5]['duplicate_of'] == 1
+        assert [Path(path).name for path in output_files] == [
+            f"scan_page_{page:03d}.png" for page in (1, 3, 4, 5)
+        ]
+        assert os.path.samefile(output_files[0], output_files[-1])
+
+        converter = PDFConverter(output_dir, backend="pymupdf", page_filter=PageFilter(dedupe="skip"))
+        assert len(converter.convert_pdf_to_images(pdf_path, dpi=72)) == 3
+        assert converter.filter_reports[5]['output'] == output_files[0]
+
+        # 메모리 변환과 웹 변환기도 같은 필터를 적용
+        from output_sinks import MemorySink
+        from pdf_converter_web import PDFConverterWeb
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+        converter = PDFConverterWeb(page_filter=PageFilter(dedupe="link"))
+        items = converter.convert_pdf_to_bytes(pdf_bytes, dpi=72, name="scan.pdf")
+        assert [filename for filename, _ in items] == [f"scan_page_{page:03d}.png" for page in (1, 3, 4, 5)]
+        assert bytes(items[0][1]) == bytes(items[-1][1])
+        assert converter.filter_reports[2]['action'] == "blank"
+
+        converter = PDFConverterWeb(page_filter=PageFilter(dedupe="skip"))
+        sink = MemorySink()
+        progress = []
+        outputs = converter.convert_to_sink(
+            pdf_bytes, sink, dpi=72, name="scan.pdf", progress=lambda page, done, total: progress.append(page)
+        )
+        assert outputs == [f"scan_page_{page:03d}.png" for page in (1, 3, 4)]
+        assert converter.filter_reports[5]['output'] == outputs[0]
+        assert progress == [1, 2, 3, 4, 5]
+        converter.convert_to_sink(pdf_bytes, sink, dpi=72, name="scan.pdf", single_image=True)
+        from PIL import Image
+        with Image.open(io.BytesIO(sink.items[-1][1])) as combined:
+            assert combined.size == (200, 280 * 3)  # 빈 페이지와 중복 페이지를 빼고 결합
+        print("✅ 페이지 필터 테스트 통과")
+
+def test_passthrough_extracts_scanned_images():
+    """이미지 한 장뿐인 페이지는 내장 JPEG를 그대로 꺼내고, 나머지는 렌더링하는지 확인합니다."""
+    import io
+    import fitz
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        buffer = io.BytesIO()
+        Image.new("RGB", (300, 400), (200, 180, 150)).save(buffer, "JPEG", quality=70)
+        scan = buffer.getvalue()
+
+        pdf_path = os.path.join(temp_dir, "scan.pdf")
+        pdf_document = fitz.open()
+        page = pdf_document.new_page(width=216, height=288)
+        page.insert_image(page.rect, stream=scan)
+        page = pdf_document.new_page(width=216, height=288)
+        page.insert_image(page.rect, stream=scan)
+        page.insert_text((20, 40), "stamp", fontsize=18)  # 보이는 텍스트가 있으면 렌더링
+        page = pdf_document.new_page(width=216, height=288)
+        page.insert_image(page.rect, stream=scan)
+        page.insert_text((20, 40), "OCR text", fontsize=18, render_mode=3)  # 보이지 않는 OCR 텍스트
+        pdf_document.save(pdf_path)
+        pdf_document.close()
+
+        converter = PDFConverter(temp_dir, backend="pymupdf", passthrough=True)
+        items = converter.convert_pdf_to_bytes(pdf_path, "JPEG", dpi=72)
+        assert converter.extracted_pages == [1, 3]
+        assert bytes(items[0][1]) == scan and bytes(items[2][1]) == scan
+        assert Image.open(io.BytesIO(items[1][1])).size == (216, 288)
+
+        output_files = converter.convert_pdf_to_images(pdf_path, "JPEG", dpi=72)
+        assert Path(output_files[0]).read_bytes() == scan
+
+        # 내장 이미지와 출력 형식이 다르면 렌더링
+        converter.convert_pdf_to_bytes(pdf_path, "PNG", dpi=72)
+        assert converter.extracted_pages == []
+        print("✅ 내장 이미지 추출 테스트 통과")
+
+def test_encode_pipeline_keeps_order_and_pixels():
+    """인코딩 스레드를 써도 출력 순서와 픽셀이 렌더링 스레드에서 인코딩한 결과와 같은지 확인합니다."""
+    import io
+    from PIL import Image, ImageChops
+    from encode_pipeline import pipelined_map
+
+    # 늦게 끝나는 항목이 있어도 입력 순서대로 반환
+    delays = [0.03, 0.0, 0.02, 0.0, 0.01]
+    results = list(pipelined_map(lambda index, delay: time.sleep(delay) or index, enumerate(delays), workers=3))
+    assert results == [0, 1, 2, 3, 4]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=5)
+        serial = PDFConverter(temp_dir, backend="pymupdf", encode_workers=1)
+        pipelined = PDFConverter(temp_dir, backend="pymupdf", encode_workers=3)
+
+        serial_items = serial.convert_pdf_to_bytes(pdf_path, "PNG", dpi=72)
+        pipelined_items = pipelined.convert_pdf_to_bytes(pdf_path, "PNG", dpi=72)
+        assert [name for name, _ in pipelined_items] == [name for name, _ in serial_items]
+        for (_, expected), (_, actual) in zip(serial_items, pipelined_items):
+            difference = ImageChops.difference(
+                Image.open(io.BytesIO(expected)).convert("RGB"), Image.open(io.BytesIO(actual)).convert("RGB")
+            )
+            assert difference.getbbox() is None
+
+        output_files = pipelined.convert_pdf_to_images(pdf_path, "JPEG", dpi=72)
+        assert [Path(path).name for path in output_files] == [
+            f"sample_page_{page:03d}.jpeg" for page in range(1, 6)
+        ]
+        print("✅ 인코딩 파이프라인 테스트 통과")
+
+def test_encoder_profiles_apply_format_settings():
+    """인코더 프로필이 형식별 설정(PNG 압축 레벨, JPEG 서브샘플링, TIFF 압축)을 적용하는지 확인합니다."""
+    import io
+    from PIL import Image, JpegImagePlugin
+    from image_encoding import encode_image
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=1)
+
+        sizes = {}
+        for profile in ("fast", "balanced", "archival"):
+            converter = PDFConverter(temp_dir, backend="pymupdf", encoder_profile=profile)
+            (_, data), = converter.convert_pdf_to_bytes(pdf_path, "PNG", dpi=150)
+            sizes[profile] = len(data)
+        assert sizes["fast"] > sizes["archival"]
+
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        archival_jpeg = Image.open(io.BytesIO(encode_image(image, "JPEG", "archival")))
+        assert JpegImagePlugin.get_sampling(archival_jpeg) == 0  # 4:4:4
+        tiff = Image.open(io.BytesIO(encode_image(image, "TIFF", "balanced")))
+        assert tiff.info['compression'] == "tiff_adobe_deflate"
+
+        try:
+            PDFConverter(temp_dir, encoder_profile="tiny")
+            assert False, "알 수 없는 프로필이 허용되었습니다"
+        except ValueError:
+            pass
+        print("✅ 인코더 프로필 테스트 통과")
+
+def test_webp_and_avif_output():
+    """
+    WebP(손실/무손실)와 AVIF로 변환되고, 무손실 WebP는 렌더링 픽셀을 그대로 보존하며
+    글자 페이지에서 PNG보다 작은지 확인합니다.
+    """
+    import io
+    import fitz
+    import pytest
+    from PIL import Image, ImageChops
+    from image_encoding import supported_formats
+
+    if "WEBP" not in supported_formats():
+        pytest.skip("이 Pillow 빌드는 WebP를 지원하지 않습니다")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=1)
+
+        (_, png_data), = PDFConverter(temp_dir, backend="pymupdf").convert_pdf_to_bytes(pdf_path, "PNG", dpi=100)
+        rendered = Image.open(io.BytesIO(png_data)).convert("RGB")
+
+        converter = PDFConverter(temp_dir, backend="pymupdf", lossless=True)
+        (_, lossless_data), = converter.convert_pdf_to_bytes(pdf_path, "WEBP", dpi=100)
+        lossless = Image.open(io.BytesIO(lossless_data))
+        assert lossless.format == "WEBP"
+        assert ImageChops.difference(lossless.convert("RGB"), rendered).getbbox() is None
+
+        converter = PDFConverter(temp_dir, backend="pymupdf", encoder_profile="fast")
+        (_, lossy_data), = converter.convert_pdf_to_bytes(pdf_path, "WEBP", dpi=100)
+        assert Image.open(io.BytesIO(lossy_data)).size == rendered.size
+
+        # 글자 위주 페이지는 무손실 WebP가 PNG보다 작아야 함
+        text_path = os.path.join(temp_dir, "text.pdf")
+        pdf_document = fitz.open()
+        page = pdf_document.new_page(width=200, height=280)
+        for line in range(20):
+            page.insert_text((10, 20 + line * 12), f"Line {line + 1}: lorem ipsum dolor sit", fontsize=9)
+        pdf_document.save(text_path)
+        pdf_document.close()
+        (_, text_png), = PDFConverter(temp_dir, backend="pymupdf").convert_pdf_to_bytes(text_path, "PNG", dpi=100)
+        lossless_converter = PDFConverter(temp_dir, backend="pymupdf", lossless=True)
+        (_, text_webp), = lossless_converter.convert_pdf_to_bytes(text_path, "WEBP", dpi=100)
+        assert len(text_webp) < len(text_png), (len(text_webp), len(text_png))
+
+        if "AVIF" in supported_formats():
+            output_files = converter.convert_pdf_to_images(pdf_path, "AVIF", dpi=72)
+            assert output_files[0].endswith(".avif")
+            assert Image.open(output_files[0]).format == "AVIF"
+
+        # 결합 이미지가 WebP 크기 제한을 넘으면 렌더링 전에 실패
+        try:
+            converter.convert_pdf_to_single_image(pdf_path, "WEBP", dpi=5000)
+            assert False, "WebP 크기 제한을 넘는 결합 이미지가 허용되었습니다"
+        except ValueError:
+            pass
+        print("✅ WebP/AVIF 출력 테스트 통과")
+
+def test_multipage_tiff_and_animation():
+    """여러 페이지를 멀티페이지 TIFF와 애니메이션 GIF/WebP 하나에 페이지(프레임)별로 담는지 확인합니다."""
+    from PIL import Image
+    from image_encoding import supported_formats
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=3)
+        converter = PDFConverter(temp_dir, backend="pymupdf")
+
+        tiff_path = converter.convert_pdf_to_multipage(pdf_path, "TIFF", dpi=100)
+        with Image.open(tiff_path) as tiff:
+            assert tiff.n_frames == 3
+            assert tiff.info['compression'] == "tiff_adobe_deflate"
+            tiff.seek(2)
+            assert tiff.size == converter._resolve_backend(pdf_path, 100).page_pixel_sizes(pdf_path, 100)[2]
+
+        formats = ["GIF"] + (["WEBP"] if "WEBP" in supported_formats() else [])
+        for output_format in formats:
+            animation_path = converter.convert_pdf_to_multipage(pdf_path, output_format, dpi=72)
+            with Image.open(animation_path) as animation:
+                assert animation.n_frames == 3
+
+        try:
+            converter.convert_pdf_to_multipage(pdf_path, "PNG")
+            assert False, "여러 페이지를 담을 수 없는 형식이 허용되었습니다"
+        except ValueError:
+            pass
+        print("✅ 멀티페이지 출력 테스트 통과")
+
+def test_gray_and_bilevel_render_modes():
+    """그레이스케일/1비트 모드가 8비트 그레이 PNG와 CCITT Group 4 TIFF를 만드는지 확인합니다."""
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=2)
+
+        gray = PDFConverter(os.path.join(temp_dir, "gray"), backend="pymupdf", color_mode="gray")
+        for path in gray.convert_pdf_to_images(pdf_path, "PNG", dpi=100):
+            with Image.open(path) as image:
+                assert image.mode == "L"
+
+        for dither in (False, True):
+            bilevel = PDFConverter(
+                os.path.join(temp_dir, f"bilevel_{dither}"), backend="pymupdf",
+                color_mode="bilevel", dither=dither
+            )
+            paths = bilevel.convert_pdf_to_images(pdf_path, "TIFF", dpi=100)
+            with Image.open(paths[0]) as image:
+                assert image.mode == "1"
+                assert image.info['compression'] == "group4"
+                # 흰 배경과 검은 글자가 모두 남아야 함
+                assert image.convert("L").getextrema() == (0, 255)
+
+        multipage_path = bilevel.convert_pdf_to_multipage(pdf_path, "TIFF", dpi=100)
+        with Image.open(multipage_path) as tiff:
+            assert tiff.n_frames == 2 and tiff.mode == "1"
+
+        combined_path = gray.convert_pdf_to_single_image(pdf_path, "PNG", dpi=72, streaming=True)
+        with Image.open(combined_path) as image:
+            assert image.mode == "L"
+
+        try:
+            PDFConverter(temp_dir, color_mode="cmyk")
+            assert False, "알 수 없는 색상 모드가 허용되었습니다"
+        except ValueError:
+            pass
+        print("✅ 그레이스케일/1비트 모드 테스트 통과")
+
+def test_document_pool_reuses_handles():
+    """문서 풀이 같은 문서의 핸들을 재사용하고, 바뀐 파일과 상한을 초과한 핸들은 다시 여는지 확인합니다."""
+    from document_pool import DocumentPool
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=2)
+        other_path = _create_sample_pdf(os.path.join(temp_dir, "other.pdf"), page_count=1)
+        pool = DocumentPool(max_documents=2)
+
+        with pool.document(pdf_path) as first:
+            # 사용 중인 핸들은 다른 요청에 주지 않음
+            with pool.document(pdf_path) as second:
+                assert second is not first
+        with pool.document(pdf_path) as again:
+            assert again is first or again is second
+        assert (pool.stats()['hits'], pool.stats()['misses']) == (1, 2)
+
+        # 다른 문서를 열면 가장 오래 쉰 핸들이 닫힘
+        with pool.document(other_path) as other:
+            assert other.page_count == 1
+        assert pool.stats()['idle'] == 2
+        assert first.is_closed or second.is_closed
+
+        # 파일이 바뀌면 키가 바뀌어 새로 엶
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        _create_sample_pdf(pdf_path, page_count=3)
+        with pool.document(pdf_path) as changed:
+            assert changed.page_count == 3
+
+        with pool.document(data) as from_bytes:
+            assert from_bytes.page_count == 2
+        with pool.document(data) as from_bytes_again:
+            assert from_bytes_again is from_bytes
+
+        pool.close()
+        assert pool.stats()['idle'] == 0 and from_bytes.is_closed
+        print("✅ 문서 풀 테스트 통과")
+
+def test_conversion_service_progress_and_cancel():
+    """변환 서비스의 페이지 진행 이벤트와 작업 취소를 확인합니다."""
+    import io
+    import zipfile
+    from conversion_service import CANCELLED, DONE, FAILED, LocalConversionService
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = _create_sample_pdf(os.path.join(temp_dir, "sample.pdf"), page_count=3)
+        service = LocalConversionService(workers=1)
+        try:
+            job_id = service.submit(pdf_path, dpi=72)
+            # 워커가 하나이므로 두 번째 작업은 대기 중에 취소됨
+            cancelled_id = service.submit(pdf_path, dpi=72)
+            assert service.cancel(cancelled_id)
+
+            job = service.wait(job_id, timeout=30)
+            assert job['status'] == DONE
+            assert (job['completed_pages'], job['total_pages']) == (3, 3)
+            assert job['output_files'] == [f"sample_page_{page:03d}.png" for page in (1, 2, 3)]
+            assert all(data[:4] == b"\x89PNG" for _, data in service.get_outputs(job_id))
+            assert service.get_job(cancelled_id)['status'] == CANCELLED
+
+            archive_id = service.submit(pdf_path, dpi=72, archive="zip")
+            assert service.wait(archive_id, timeout=30)['status'] == DONE
+            with zipfile.ZipFile(io.BytesIO(service.get_archive(archive_id))) as archive:
+                assert archive.namelist() == job['output_files']
+
+            assert service.remove_job(job_id)
+            assert service.get_job(job_id) is None
+
+            # 색상 모드는 작업 프로세스의 변환기까지 전달됨
+            from PIL import Image
+            gray_id = service.submit(pdf_path, dpi=72, last_page=1, color_mode="gray")
+            bilevel_id = service.submit(
+                pdf_path, output_format="TIFF", dpi=72, last_page=1,
+                color_mode="bilevel", threshold=200, dither=True
+            )
+            for color_id, mode in ((gray_id, "L"), (bilevel_id, "1")):
+                assert service.wait(color_id, timeout=30)['status'] == DONE
+                (_, data), = service.get_outputs(color_id)
+                assert Image.open(io.BytesIO(data)).mode == mode
+            assert service.get_job(bilevel_id)['options']['threshold'] == 200
+
+            # 작업 프로세스에서 난 오류는 메시지와 함께 실패 처리
+            failed_id = service.submit(b"%PDF-1.4\nnot a pdf", filename="broken.pdf")
+            failed = service.wait(failed_id, timeout=30)
+            assert failed['status'] == FAILED and failed['error']
+
+            # 실행 중인 작업은 다음 페이지에서 멈춤
+            long_path = _create_sample_pdf(os.path.join(temp_dir, "long.pdf"), page_count=200)
+            running_id = service.submit(long_path, dpi=150, output_dir=os.path.join(temp_dir, "out"))
+            while service.get_job(running_id)['completed_pages'] == 0:
+                time.sleep(0.05)
+            assert service.cancel(running_id)
+            running = service.wait(running_id, timeout=30)
+            assert running['status'] == CANCELLED
+            assert running['completed_pages'] < 200
+        finally:
+            service.close()
+        print("✅ 변환 서비스 테스트 통과")
+
+def test_benchmark_synthetic_pdf_and_baseline_comparison():
+    """벤치마크의 합성 PDF 페이지 수와 기준 결과 비교(저하 판정, 임계값, 편차)를 확인합니다."""
+    import fitz
+    from benchmark import SHAPES, case_id, compare_results, create_synthetic_pdf
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for shape in SHAPES:
+            pdf_path = os.path.join(temp_dir, f"{shape}.pdf")
+            create_synthetic_pdf(pdf_path, shape, 2)
+            with fitz.open(pdf_path) as pdf_document:
+                assert pdf_document.page_count == 2
+
+    case = {"converter": "PDFConverterWeb", "shape": "text", "page_count": 1, "dpi": 100,
+            "format": "PNG", "options": {}, "encode_workers": None}
+    assert case_id(case) == "PDFConverterWeb/text/1p/100dpi/PNG"
+    assert case_id(dict(case, options={"quality": 80}, encode_workers=2)) == \
+        "PDFConverterWeb/text/1p/100dpi/PNG/quality=80/encode=2"
+
+    baseline = {"results": [dict(case, pages_per_second=20.0, peak_rss_bytes=100 * 1024 * 1024)]}
+
+    def compare(pages_per_second, peak_rss_bytes=100 * 1024 * 1024, **extra):
+        result = dict(case, pages_per_second=pages_per_second, peak_rss_bytes=peak_rss_bytes, **extra)
+        return [(metric, round(change, 2)) for _, metric, _, _, change in compare_results([result], baseline)]
+
+    # 임계값(10%) 안의 변화는 무시하고 넘는 감소만 저하로 봄
+    assert compare(19.0) == []
+    assert compare(16.0) == [("pages_per_second", -0.2)]
+    assert compare_results([dict(case, pages_per_second=16.0)], baseline, threshold=0.25) == []
+    # 최대 RSS 증가
+    assert compare(20.0, peak_rss_bytes=120 * 1024 * 1024) == [("peak_rss_bytes", 0.2)]
+    # 반복 측정 편차보다 작은 변화는 잡음으로 봄
+    assert compare(16.0, wall_seconds_spread=0.3) == []
+    assert compare(12.0, wall_seconds_spread=0.3) == [("pages_per_second", -0.4)]
+    # 기준에 없는 조합과 오류 결과는 비교하지 않음
+    assert compare_results([dict(case, dpi=200, pages_per_second=1.0)], baseline) == []
+    assert compare_results([dict(case, error="실패")], baseline) == []
+    print("✅ 벤치마크 테스트 통과")
+
 if __name__ == "__main__":
     print("🚀 PDF to Image Converter 테스트")
     print()
@@ -0,0 +1,224 @@
+"""
+페이지 썸네일(미리보기) 렌더링
+
+갤러리에 표시할 작은 이미지는 전체 DPI로 렌더링한 결과를 줄이지 않고 PDF에서 바로
+렌더링합니다. 배율은 썸네일 너비에 맞춰 페이지마다 정하므로 A4 기준 약 36~72 DPI가 되고,
+max_dpi로 작은 페이지가 불필요하게 커지지 않도록 제한합니다.
+썸네일은 변환 결과와 섞이지 않도록 별도의 RenderCache에 저장합니다.
+
+갤러리는 페이지를 GALLERY_WINDOW개씩 나눈 창(window) 단위로 표시하고, 다음 창의 썸네일은
+prefetch로 백그라운드에서 미리 캐시에 넣어 둡니다. 세션에 올라가는 이미지는 창 크기로 제한됩니다.
+미리 렌더링 스레드와 Streamlit 세션 스레드가 같은 프로세스에서 MuPDF를 쓰므로 썸네일 렌더링은
+mupdf_lock 안에서 한 페이지씩 합니다 (캐시에 있는 썸네일은 잠그지 않음).
+"""
+
+import io
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from document_pool import document_pool, mupdf_lock
+from image_encoding import normalize_format
+from pdf_info import get_page_count, get_page_sizes
+from render_backends import PDFSource, RenderBackend, fitz
+from render_cache import RenderCache
+
+# 기본 썸네일 너비 (픽셀). 200px로 표시할 때 고해상도 화면에서도 선명하도록 두 배
+THUMBNAIL_WIDTH = 400
+# 썸네일 해상도 상한 (작은 페이지를 크게 확대하지 않음)
+MAX_THUMBNAIL_DPI = 72
+# 썸네일 형식과 JPEG 품질
+THUMBNAIL_FORMAT = "JPEG"
+THUMBNAIL_QUALITY = 80
+# 갤러리 한 화면(창)에 표시할 페이지 수
+GALLERY_WINDOW = 24
+
+
+def window_count(item_count: int, window_size: int = GALLERY_WINDOW) -> int:
+    """항목을 window_size개씩 나눈 창의 수"""
+    return max(1, -(-item_count // window_size))
+
+
+def page_window(items: Sequence, window_index: int, window_size: int = GALLERY_WINDOW) -> Sequence:
+    """window_index번째 창에 속하는 항목 (범위를 벗어나면 빈 목록)"""
+    start = window_index * window_size
+    return items[start:start + window_size]
+
+
+class ThumbnailRenderer:
+    """
+    PDF 페이지 썸네일을 렌더링하는 렌더러
+
+    PyMuPDF가 있으면 썸네일 너비에 맞춘 배율 행렬로 바로 렌더링하고,
+    backend를 지정하면 그 백엔드로 썸네일 배율에 해당하는 정수 DPI로 렌더링합니다.
+    """
+
+    def __init__(
+        self,
+        width: int = THUMBNAIL_WIDTH,
+        cache: Optional[RenderCache] = None,
+        output_format: str = THUMBNAIL_FORMAT,
+        max_dpi: int = MAX_THUMBNAIL_DPI,
+        backend: Optional[RenderBackend] = None
+    ):
+        """
+        Args:
+            width: 썸네일 너비 (픽셀)
+            cache: 썸네일 전용 렌더 캐시 (None이면 캐시하지 않음)
+            output_format: 썸네일 이미지 형식 (JPEG 또는 PNG)
+            max_dpi: 썸네일 해상도 상한
+            backend: 렌더링 백엔드 (None이면 PyMuPDF)
+        """
+        if backend is None and fitz is None:
+            raise RuntimeError("PyMuPDF가 없으면 썸네일 렌더링에 사용할 백엔드를 지정해야 합니다.")
+        self.width = width
+        self.cache = cache
+        self.output_format = normalize_format(output_format)
+        self.max_dpi = max_dpi
+        self.backend = backend
+        self.logger = logging.getLogger(__name__)
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        # 미리 렌더링 중인 캐시 키 (재실행마다 같은 페이지를 중복 요청하지 않도록)
+        self._prefetching = set()
+        self._lock = threading.Lock()
+
+    def zoom_for(self, width_pt: float) -> float:
+        """페이지 너비(포인트)에 맞는 배율 (1.0 = 72 DPI)"""
+        return min(self.width / width_pt, self.max_dpi / 72.0)
+
+    def iter_thumbnails(
+        self,
+        pdf_source: PDFSource,
+        page_nums: Optional[Iterable[int]] = None,
+        pdf_hash: Optional[str] = None
+    ) -> Iterator[Tuple[int, bytes]]:
+        """
+        페이지 썸네일을 순서대로 반환합니다. 캐시에 있는 페이지는 렌더링하지 않습니다.
+
+        Args:
+            pdf_source: PDF 파일 경로 또는 PDF 바이트
+            page_nums: 페이지 번호 목록 (None이면 전체)
+            pdf_hash: PDF 내용 해시 (이미 계산했다면 전달하여 다시 계산하지 않음)
+
+        Returns:
+            (페이지 번호, 인코딩된 썸네일 바이트)를 반환하는 이터레이터
+        """
+        if page_nums is None:
+            page_nums = range(1, get_page_count(pdf_source) + 1)
+        if self.cache is not None and pdf_hash is None:
+            pdf_hash = self._hash(pdf_source)
+
+        pdf_document = None
+        page_sizes = None
+        try:
+            for page_num in page_nums:
+                key = self._cache_key(pdf_hash, page_num) if self.cache is not None else None
+                data = self.cache.get_bytes(key) if key is not None else None
+                if data is None:
+                    with mupdf_lock:
+                        if self.backend is None:
+                            # 문서는 캐시에 없는 페이지가 처음 나올 때 한 번만 빌림
+                            if pdf_document is None:
+                                pdf_document = document_pool.checkout(pdf_source)
+                            data = self._render_pymupdf(pdf_document[page_num - 1])
+                        else:
+                            if page_sizes is None:
+                                page_sizes = get_page_sizes(pdf_source)
+                            data = self._render_backend(pdf_source, page_num, page_sizes[page_num - 1][0])
+                    if key is not None:
+                        self.cache.put_bytes(key, data)
+                yield page_num, data
+        finally:
+            if pdf_document is not None:
+                with mupdf_lock:
+                    document_pool.release(pdf_document)
+
+    def render_thumbnail(self, pdf_source: PDFSource, page_num: int, pdf_hash: Optional[str] = None) -> bytes:
+        """페이지 하나의 썸네일을 반환합니다."""
+        for _, data in self.iter_thumbnails(pdf_source, [page_num], pdf_hash):
+            return data
+
+    def prefetch(
+        self,
+        pdf_source: PDFSource,
+        page_nums: Iterable[int],
+        pdf_hash: Optional[str] = None
+    ) -> Optional[Future]:
+        """
+        페이지 썸네일을 백그라운드 스레드에서 렌더링하여 캐시에 넣습니다.
+
+        캐시가 없거나, 이미 캐시에 있거나 렌더링 중인 페이지만 남으면 아무것도 하지 않습니다.
+
+        Returns:
+            미리 렌더링 작업의 Future, 할 일이 없으면 None
+        """
+        if self.cache is None:
+            return None
+        if pdf_hash is None:
+            pdf_hash = self._hash(pdf_source)
+
+        with self._lock:
+            pending = []
+            for page_num in page_nums:
+                key = self._cache_key(pdf_hash, page_num)
+                if key not in self._prefetching and not self.cache.contains(key):
+                    self._prefetching.add(key)
+                    pending.append(page_num)
+            if not pending:
+                return None
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="thumbnail-prefetch"
+                )
+        return self._prefetch_executor.submit(self._prefetch, pdf_source, pending, pdf_hash)
+
+    def close(self):
+        """미리 렌더링 스레드를 정리합니다."""
+        with self._lock:
+            executor, self._prefetch_executor = self._prefetch_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _prefetch(self, pdf_source: PDFSource, page_nums: List[int], pdf_hash: str):
+        try:
+            for _ in self.iter_thumbnails(pdf_source, page_nums, pdf_hash):
+                pass
+        except Exception as e:
+            self.logger.warning(f"썸네일 미리 렌더링 실패: {e}")
+        finally:
+            with self._lock:
+                self._prefetching.difference_update(
+                    self._cache_key(pdf_hash, page_num) for page_num in page_nums
+                )
+
+    def _render_pymupdf(self, page: "fitz.Page") -> bytes:
+        zoom = self.zoom_for(page.rect.width)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        if self.output_format == "JPEG":
+            return pix.tobytes(output="jpg", jpg_quality=THUMBNAIL_QUALITY)
+        return pix.tobytes(output="png")
+
+    def _render_backend(self, pdf_source: PDFSource, page_num: int, width_pt: float) -> bytes:
+        dpi = max(1, round(self.zoom_for(width_pt) * 72))
+        image = self.backend.render_page(pdf_source, page_num, dpi)
+        buffer = io.BytesIO()
+        if self.output_format == "JPEG":
+            image.convert("RGB").save(buffer, "JPEG", quality=THUMBNAIL_QUALITY)
+        else:
+            image.save(buffer, self.output_format)
+        return buffer.getvalue()
+
+    def _cache_key(self, pdf_hash: str, page_num: int) -> str:
+        return RenderCache.make_key(
+            pdf_hash, page_num, self.max_dpi, self.output_format,
+            THUMBNAIL_QUALITY if self.output_format == "JPEG" else None,
+            thumbnail_width=self.width,
+            backend=self.backend.name if self.backend is not None else "pymupdf"
+        )
+
+    @staticmethod
+    def _hash(pdf_source: PDFSource) -> str:
+        if isinstance(pdf_source, bytes):
+            return RenderCache.hash_bytes(pdf_source)
+        return RenderCache.hash_file(pdf_source)
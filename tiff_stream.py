@@ -0,0 +1,218 @@
+import math
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Union
+
+from PIL import Image
+
+# 모드 -> (채널 수, PhotometricInterpretation)
+_MODES = {"L": (1, 1), "RGB": (3, 2)}
+_BACKGROUND = {"L": 255, "RGB": (255, 255, 255)}
+# 압축 방식 -> Compression 태그 값
+_COMPRESSIONS = {"none": 1, "deflate": 8}
+
+# TIFF 필드 타입 -> struct 형식
+_SHORT, _LONG, _RATIONAL, _LONG8 = 3, 4, 5, 16
+_TYPE_FORMATS = {_SHORT: "H", _LONG: "I", _RATIONAL: "II", _LONG8: "Q"}
+
+# 압축하지 않은 크기가 이보다 크면 4GB 오프셋 한계를 넘을 수 있으므로 BigTIFF로 기록
+_BIGTIFF_THRESHOLD = 2 ** 32 - 2 ** 26
+
+
+def encode_tile(
+    image: Image.Image,
+    tile_size: int,
+    mode: str = "RGB",
+    compression: str = "deflate",
+    compress_level: int = 6
+) -> bytes:
+    """
+    이미지 하나를 TIFF 타일 데이터로 압축합니다.
+
+    오른쪽/아래 가장자리 타일처럼 tile_size보다 작은 이미지는 흰 배경으로 채워 맞춥니다.
+    프로세스 풀 워커에서 타일을 병렬로 압축할 때도 사용합니다.
+    """
+    if image.mode != mode:
+        image = image.convert(mode)
+    if image.size != (tile_size, tile_size):
+        tile = Image.new(mode, (tile_size, tile_size), _BACKGROUND[mode])
+        tile.paste(image, (0, 0))
+        image = tile
+
+    raw = image.tobytes()
+    if compression == "deflate":
+        return zlib.compress(raw, compress_level)
+    return raw
+
+
+class TiledTIFFWriter:
+    """
+    전체 래스터를 메모리에 만들지 않고 타일을 하나씩 기록하는 타일 TIFF writer
+
+    타일을 행 우선 순서(왼쪽 위부터 오른쪽으로, 그다음 아래 행)로 write_tile에 넘기면
+    압축하여 바로 파일에 기록하고, close에서 타일 위치 표(IFD)를 파일 끝에 씁니다.
+    메모리 사용량은 타일 하나 크기로 제한됩니다. 4GB를 넘을 수 있는 크기는 BigTIFF로 기록합니다.
+    output_path에 탐색 가능한 바이너리 파일 객체를 주면 그 객체에 기록하며, 닫지 않습니다.
+    """
+
+    def __init__(
+        self,
+        output_path: Union[str, Path, BinaryIO],
+        width: int,
+        height: int,
+        tile_size: int = 512,
+        mode: str = "RGB",
+        dpi: Optional[int] = None,
+        compression: str = "deflate",
+        compress_level: int = 6
+    ):
+        if mode not in _MODES:
+            raise ValueError(f"지원하지 않는 모드입니다: {mode}")
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"지원하지 않는 압축 방식입니다: {compression}")
+        if width <= 0 or height <= 0:
+            raise ValueError(f"잘못된 이미지 크기입니다: {width}x{height}")
+        if tile_size <= 0 or tile_size % 16:
+            raise ValueError(f"타일 크기는 16의 배수여야 합니다: {tile_size}")
+
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.mode = mode
+        self.dpi = dpi
+        self.compression = compression
+        self.compress_level = compress_level
+        self.tiles_across = math.ceil(width / tile_size)
+        self.tiles_down = math.ceil(height / tile_size)
+        self.tile_count = self.tiles_across * self.tiles_down
+
+        samples = _MODES[mode][0]
+        self.bigtiff = self.tile_count * tile_size * tile_size * samples > _BIGTIFF_THRESHOLD
+
+        if hasattr(output_path, 'write'):
+            self.output_path = None
+            self._file = output_path
+        else:
+            self.output_path = Path(output_path)
+            self._file = open(self.output_path, 'wb')
+        self._closed = False
+        self._start = self._file.tell()
+        self._offsets: List[int] = []
+        self._byte_counts: List[int] = []
+
+        # 헤더: IFD 위치는 close에서 채움
+        if self.bigtiff:
+            self._file.write(b"II" + struct.pack("<HHHQ", 43, 8, 0, 0))
+            self._ifd_pointer = self._start + 8
+        else:
+            self._file.write(b"II" + struct.pack("<HI", 42, 0))
+            self._ifd_pointer = self._start + 4
+
+    @property
+    def tiles_written(self) -> int:
+        return len(self._offsets)
+
+    def write_tile(self, image: Image.Image):
+        """다음 타일을 압축하여 기록합니다."""
+        self.write_encoded_tile(
+            encode_tile(image, self.tile_size, self.mode, self.compression, self.compress_level)
+        )
+
+    def write_encoded_tile(self, data: bytes):
+        """encode_tile로 이미 압축한 다음 타일을 기록합니다."""
+        if self.tiles_written >= self.tile_count:
+            raise ValueError("타일 수가 TIFF 크기를 초과합니다.")
+        self._offsets.append(self._file.tell() - self._start)
+        self._file.write(data)
+        self._byte_counts.append(len(data))
+
+    def close(self):
+        """남은 타일을 흰 배경으로 채우고 IFD를 기록하여 파일을 마무리합니다."""
+        if self._closed:
+            return
+
+        try:
+            if self.tiles_written < self.tile_count:
+                blank = encode_tile(
+                    Image.new(self.mode, (1, 1), _BACKGROUND[self.mode]), self.tile_size,
+                    self.mode, self.compression, self.compress_level
+                )
+                while self.tiles_written < self.tile_count:
+                    self.write_encoded_tile(blank)
+            self._write_ifd()
+        finally:
+            self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 실패한 경우 불완전한 파일을 남기지 않음
+            self._close_file()
+            if self.output_path is not None:
+                self.output_path.unlink(missing_ok=True)
+        return False
+
+    def _close_file(self):
+        self._closed = True
+        # 호출자가 넘긴 파일 객체는 호출자가 닫음
+        if self.output_path is not None:
+            self._file.close()
+
+    def _write_ifd(self):
+        samples, photometric = _MODES[self.mode]
+        offset_type = _LONG8 if self.bigtiff else _LONG
+        entries = [
+            (256, _LONG, [self.width]),
+            (257, _LONG, [self.height]),
+            (258, _SHORT, [8] * samples),
+            (259, _SHORT, [_COMPRESSIONS[self.compression]]),
+            (262, _SHORT, [photometric]),
+            (277, _SHORT, [samples]),
+            (284, _SHORT, [1]),
+            (322, _LONG, [self.tile_size]),
+            (323, _LONG, [self.tile_size]),
+            (324, offset_type, self._offsets),
+            (325, offset_type, self._byte_counts),
+        ]
+        if self.dpi:
+            entries += [(282, _RATIONAL, [self.dpi, 1]), (283, _RATIONAL, [self.dpi, 1]), (296, _SHORT, [2])]
+        entries.sort(key=lambda entry: entry[0])
+
+        inline_size = 8 if self.bigtiff else 4
+        count_format = "Q" if self.bigtiff else "I"
+        offset_format = "Q" if self.bigtiff else "I"
+
+        # 값이 항목 안에 들어가지 않으면 IFD 앞에 따로 기록하고 위치를 가리킴
+        packed_entries = []
+        for tag, field_type, values in entries:
+            # RATIONAL은 (분자, 분모) 두 값이 하나의 항목
+            count = len(values) // 2 if field_type == _RATIONAL else len(values)
+            data = struct.pack("<" + _TYPE_FORMATS[field_type] * count, *values)
+            if len(data) <= inline_size:
+                value = data.ljust(inline_size, b"\x00")
+            else:
+                self._align()
+                value = struct.pack("<" + offset_format, self._file.tell() - self._start)
+                self._file.write(data)
+            packed_entries.append(struct.pack("<HH" + count_format, tag, field_type, count) + value)
+
+        self._align()
+        ifd_offset = self._file.tell() - self._start
+        self._file.write(struct.pack("<" + ("Q" if self.bigtiff else "H"), len(packed_entries)))
+        self._file.write(b"".join(packed_entries))
+        self._file.write(struct.pack("<" + offset_format, 0))
+        end = self._file.tell()
+
+        self._file.seek(self._ifd_pointer)
+        self._file.write(struct.pack("<" + offset_format, ifd_offset))
+        self._file.seek(end)
+
+    def _align(self):
+        # TIFF 오프셋은 워드(2바이트) 경계여야 함
+        if (self._file.tell() - self._start) % 2:
+            self._file.write(b"\x00")
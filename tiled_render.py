@@ -0,0 +1,270 @@
+"""
+큰 페이지의 타일 렌더링
+
+페이지 전체 래스터를 한 번에 만들지 않고 클립 영역(타일)으로 나누어 렌더링합니다.
+PyMuPDF로 페이지의 display list를 한 번 만든 뒤 영역마다 그 부분만 래스터화하므로
+메모리에는 처리 중인 영역만 올라갑니다. TIFF는 타일 한 행을 max_region_pixels 안에서
+가능한 한 넓게 렌더링한 뒤 타일로 잘라 타일 TIFF로 기록하고, PNG는 페이지 너비의
+띠(band) 단위로 렌더링하여 행 단위 PNG writer로 이어 붙입니다.
+클립 렌더링 비용은 영역과 겹치는 도형 수에 비례하므로, 작은 영역을 많이 렌더링하는 것보다
+한도 안에서 넓은 영역을 적게 렌더링하는 편이 빠릅니다.
+workers가 2 이상이면 영역을 프로세스 풀에서 렌더링/압축합니다.
+mode가 "L"이면 RGB로 렌더링한 뒤 바꾸지 않고 그레이스케일 pixmap으로 바로 렌더링하여 8비트
+그레이스케일로 기록합니다. 압축은 PNG와 TIFF 모두 zlib(Deflate)이며, 인코더 프로필의 PNG 압축 레벨을
+따릅니다 (tile_compress_level).
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from document_pool import document_pool
+from image_encoding import DEFAULT_PROFILE, ENCODER_PROFILES, normalize_format
+from png_stream import StreamingPNGWriter
+from render_backends import PDFSource, fitz, pixmap_to_image
+from tiff_stream import TiledTIFFWriter, encode_tile
+
+# 타일 렌더링으로 기록할 수 있는 형식
+TILED_FORMATS = ("PNG", "TIFF")
+
+# 기본 타일 한 변의 픽셀 수 (RGB 타일 하나 약 3MB)
+DEFAULT_TILE_SIZE = 1024
+
+# 타일 렌더링으로 기록할 수 있는 이미지 모드 (RGB, 8비트 그레이스케일)
+TILE_MODES = ("RGB", "L")
+
+# PNG 띠 하나의 최대 크기 (타일 수). 띠는 항상 페이지 너비라 더 키워도 빨라지지 않고
+# 인코딩 중 복사본 때문에 메모리만 늘어남
+_PNG_BAND_TILES = 8
+
+# 픽셀 좌표 영역 (x0, y0, x1, y1)
+Box = Tuple[int, int, int, int]
+
+
+def tile_compress_level(profile: str = DEFAULT_PROFILE) -> int:
+    """
+    인코더 프로필에 맞는 타일 기록의 zlib 압축 레벨.
+    타일 TIFF writer는 Deflate만 쓰므로 TIFF도 프로필의 PNG 압축 레벨을 따릅니다 (fast는 PackBits 대신 레벨 1).
+
+    Raises:
+        ValueError: 알 수 없는 프로필인 경우
+    """
+    if profile not in ENCODER_PROFILES:
+        raise ValueError(
+            f"알 수 없는 인코더 프로필입니다: {profile} (사용 가능: {', '.join(ENCODER_PROFILES)})"
+        )
+    return ENCODER_PROFILES[profile]["PNG"]["compress_level"]
+
+
+class _PageTiles:
+    """문서 핸들을 빌려 페이지의 display list를 만들고 영역별로 렌더링합니다."""
+
+    def __init__(self, pdf_source: PDFSource, page_num: int, dpi: int, mode: str = "RGB"):
+        self.mode = mode
+        self.colorspace = fitz.csRGB if mode == "RGB" else fitz.csGRAY
+        self.document = document_pool.checkout(pdf_source)
+        try:
+            page = self.document[page_num - 1]
+            scale_factor = dpi / 72.0
+            self.matrix = fitz.Matrix(scale_factor, scale_factor)
+            self.inverse = ~self.matrix
+            # 페이지 내용을 한 번만 해석하고 타일마다 재사용
+            self.display_list = page.get_displaylist()
+        except Exception:
+            # 잘못된 페이지 번호나 손상된 페이지: 빌린 핸들을 돌려주지 않으면 풀에서 계속 사용 중으로 남음
+            document_pool.release(self.document)
+            raise
+
+    def render(self, box: Box) -> Image.Image:
+        """픽셀 영역 하나를 렌더링합니다. 결과 크기는 항상 영역 크기와 같습니다."""
+        x0, y0, x1, y1 = box
+        clip = fitz.Rect(x0, y0, x1, y1) * self.inverse
+        pix = self.display_list.get_pixmap(
+            matrix=self.matrix, colorspace=self.colorspace, clip=clip, alpha=False
+        )
+        image = pixmap_to_image(pix)
+
+        if (pix.x, pix.y, image.width, image.height) != (x0, y0, x1 - x0, y1 - y0):
+            # 경계 반올림으로 한 픽셀 어긋나면 요청한 영역에 맞춰 붙임
+            tile = Image.new(self.mode, (x1 - x0, y1 - y0), "white")
+            tile.paste(image, (pix.x - x0, pix.y - y0))
+            image = tile
+        return image
+
+    def close(self):
+        document_pool.release(self.document)
+
+
+# 워커 프로세스마다 한 번 여는 페이지
+_worker_tiles: Optional[_PageTiles] = None
+
+
+def _init_worker(pdf_source: PDFSource, page_num: int, dpi: int, mode: str):
+    global _worker_tiles
+    _worker_tiles = _PageTiles(pdf_source, page_num, dpi, mode)
+
+
+def _render_worker(box: Box, tile_size: Optional[int], compress_level: int) -> Union[bytes, List[bytes]]:
+    """프로세스 풀 워커: 영역 하나를 렌더링하여 TIFF 타일 목록 또는 픽셀 바이트로 반환"""
+    region = _render_region(_worker_tiles, box, tile_size, compress_level)
+    return region.tobytes() if isinstance(region, Image.Image) else region
+
+
+def _render_region(
+    tiles: _PageTiles,
+    box: Box,
+    tile_size: Optional[int],
+    compress_level: int
+) -> Union[Image.Image, List[bytes]]:
+    """
+    영역을 렌더링하여 tile_size가 있으면 왼쪽부터 자른 TIFF 타일 목록으로,
+    없으면 이미지 그대로 반환합니다.
+    """
+    image = tiles.render(box)
+    if not tile_size:
+        return image
+    return [
+        encode_tile(
+            image.crop((x, 0, min(x + tile_size, image.width), image.height)), tile_size,
+            tiles.mode, compress_level=compress_level
+        )
+        for x in range(0, image.width, tile_size)
+    ]
+
+
+class TiledPageRenderer:
+    """
+    PyMuPDF 클립 렌더링으로 큰 페이지를 타일 단위로 렌더링하는 렌더러
+
+    한 번에 렌더링하는 영역은 max_region_pixels 이하(단, 타일 하나보다 작아지지는 않음)이며,
+    병렬이면 이런 영역이 워커 수의 두 배만큼까지 메모리에 올라갑니다.
+    """
+
+    def __init__(
+        self,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        workers: int = 1,
+        max_region_pixels: Optional[int] = None,
+        mode: str = "RGB",
+        compress_level: int = 6
+    ):
+        """
+        Args:
+            tile_size: 타일 한 변의 픽셀 수 (16의 배수)
+            workers: 영역을 렌더링할 프로세스 수 (1이면 현재 프로세스에서 렌더링)
+            max_region_pixels: 한 번에 렌더링할 영역의 최대 픽셀 수 (기본값: 타일 하나)
+            mode: 렌더링/기록할 이미지 모드 ("RGB" 또는 8비트 그레이스케일 "L")
+            compress_level: PNG/TIFF의 zlib 압축 레벨 (0~9, tile_compress_level 참고)
+        """
+        if fitz is None:
+            raise RuntimeError("타일 렌더링에는 PyMuPDF가 필요합니다. pip install PyMuPDF를 실행해주세요.")
+        if tile_size <= 0 or tile_size % 16:
+            raise ValueError(f"타일 크기는 16의 배수여야 합니다: {tile_size}")
+        if mode not in TILE_MODES:
+            raise ValueError(f"타일 렌더링은 {', '.join(TILE_MODES)} 모드만 지원합니다: {mode}")
+        self.tile_size = tile_size
+        self.workers = max(1, workers)
+        self.max_region_pixels = max_region_pixels or tile_size * tile_size
+        self.mode = mode
+        self.compress_level = compress_level
+
+    @staticmethod
+    def page_size(pdf_source: PDFSource, page_num: int, dpi: int) -> Tuple[int, int]:
+        """페이지를 dpi로 렌더링했을 때의 픽셀 크기 (PyMuPDF와 같은 반올림)"""
+        scale_factor = dpi / 72.0
+        with document_pool.document(pdf_source) as pdf_document:
+            irect = (pdf_document[page_num - 1].rect * fitz.Matrix(scale_factor, scale_factor)).irect
+            return irect.width, irect.height
+
+    def render(
+        self,
+        pdf_source: PDFSource,
+        page_num: int,
+        dpi: int,
+        output: Union[str, Path, BinaryIO],
+        output_format: str = "PNG"
+    ) -> Tuple[int, int]:
+        """
+        페이지 하나를 타일로 렌더링하여 output(파일 경로 또는 바이너리 파일 객체)에 기록합니다.
+
+        Returns:
+            기록한 이미지의 (너비, 높이)
+        """
+        output_format = normalize_format(output_format)
+        if output_format not in TILED_FORMATS:
+            raise ValueError(
+                f"타일 렌더링은 {', '.join(TILED_FORMATS)} 형식만 지원합니다: {output_format}"
+            )
+        width, height = self.page_size(pdf_source, page_num, dpi)
+
+        if output_format == "TIFF":
+            # 타일 한 행을 타일 여러 개 너비의 영역으로 나눔 (행 우선 순서 유지)
+            tiles_per_region = max(1, self.max_region_pixels // (self.tile_size * self.tile_size))
+            boxes = tile_grid(width, height, self.tile_size * tiles_per_region, self.tile_size)
+            with TiledTIFFWriter(
+                output, width, height, self.tile_size, self.mode, dpi=dpi, compress_level=self.compress_level
+            ) as writer:
+                for encoded_tiles in self._render_boxes(pdf_source, page_num, dpi, boxes, self.tile_size):
+                    for data in encoded_tiles:
+                        writer.write_encoded_tile(data)
+        else:
+            # PNG는 행 단위로 기록하므로 페이지 너비의 띠로 나눔
+            band_pixels = min(self.max_region_pixels, self.tile_size * self.tile_size * _PNG_BAND_TILES)
+            band_height = max(1, band_pixels // width)
+            boxes = tile_grid(width, height, width, band_height)
+            with StreamingPNGWriter(output, width, height, self.mode, self.compress_level) as writer:
+                for box, band in zip(boxes, self._render_boxes(pdf_source, page_num, dpi, boxes, None)):
+                    if not isinstance(band, Image.Image):
+                        # 워커 프로세스에서 받은 픽셀 바이트
+                        band = Image.frombytes(self.mode, (box[2] - box[0], box[3] - box[1]), band)
+                    writer.write_image(band)
+                    # 다음 띠를 렌더링하는 동안 이전 띠가 메모리에 남지 않도록 함
+                    del band
+
+        return width, height
+
+    def _render_boxes(
+        self,
+        pdf_source: PDFSource,
+        page_num: int,
+        dpi: int,
+        boxes: List[Box],
+        tile_size: Optional[int]
+    ) -> Iterator[Union[Image.Image, bytes, List[bytes]]]:
+        """영역을 순서대로 렌더링하여 반환합니다. 병렬이면 실행 중인 작업 수를 제한합니다."""
+        if self.workers == 1 or len(boxes) == 1:
+            tiles = _PageTiles(pdf_source, page_num, dpi, self.mode)
+            try:
+                for box in boxes:
+                    yield _render_region(tiles, box, tile_size, self.compress_level)
+            finally:
+                tiles.close()
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(pdf_source, page_num, dpi, self.mode)
+        ) as executor:
+            pending = deque()
+            box_iter = iter(boxes)
+            for box in box_iter:
+                pending.append(executor.submit(_render_worker, box, tile_size, self.compress_level))
+                if len(pending) >= self.workers * 2:
+                    break
+            while pending:
+                data = pending.popleft().result()
+                box = next(box_iter, None)
+                if box is not None:
+                    pending.append(executor.submit(_render_worker, box, tile_size, self.compress_level))
+                yield data
+
+
+def tile_grid(width: int, height: int, tile_width: int, tile_height: int) -> List[Box]:
+    """이미지를 행 우선 순서의 타일 영역 목록으로 나눕니다. 가장자리 타일은 작을 수 있습니다."""
+    return [
+        (x, y, min(x + tile_width, width), min(y + tile_height, height))
+        for y in range(0, height, tile_height)
+        for x in range(0, width, tile_width)
+    ]